@@ -5,8 +5,8 @@ VNSTOCK AUTOMATED DASHBOARD
 Flask Web Application for Real-time Stock Analysis Dashboard
 """
 
-from flask import Flask, render_template, jsonify, request, send_from_directory
-from flask_socketio import SocketIO
+from flask import Flask, render_template, jsonify, request, send_file, Response
+from flask_socketio import SocketIO, join_room, leave_room, emit
 import json
 import os
 import glob
@@ -15,8 +15,15 @@ import threading
 import time
 import schedule
 from pathlib import Path
-import subprocess
 import logging
+from tick_store import TickStore
+from dashboard_snapshot import SnapshotCache
+from live_updates import DeltaPublisher
+from series_api import SeriesService, DEFAULT_MAX_POINTS
+from update_pipeline import update, update_symbol
+from chart_engine import render_charts
+from chart_engine.output import INTRADAY_PROFILES, RENDER_PROFILES, profile_path
+from static_assets import StaticAssets
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -35,6 +42,13 @@ class StockDataManager:
     def __init__(self):
         self.load_config()
         self.last_update = {}
+        self.tick_store = TickStore(STOCK_ANALYSIS_DIR)
+        self.snapshots = SnapshotCache(self.tick_store)
+        self.series = SeriesService(self.tick_store)
+        self.publisher = DeltaPublisher(
+            lambda event, payload, room: socketio.emit(event, payload, to=room),
+            self.snapshots
+        )
         
     def load_config(self):
         """Load stocks configuration"""
@@ -49,76 +63,50 @@ class StockDataManager:
         """Get list of active stocks"""
         return self.config.get('active_stocks', [])
     
+    def is_market_hours(self):
+        """Check if current time is within market hours"""
+        market_hours = self.config.get('market_hours', {})
+        now = datetime.now()
+        trading_days = market_hours.get('days', ['monday', 'tuesday', 'wednesday', 'thursday', 'friday'])
+        if now.strftime('%A').lower() not in trading_days:
+            return False
+        start = datetime.strptime(market_hours.get('start', '09:00'), '%H:%M').time()
+        end = datetime.strptime(market_hours.get('end', '15:00'), '%H:%M').time()
+        return start <= now.time() <= end
+    
     def get_stock_data(self, symbol):
-        """Get latest data for a stock"""
+        """Get latest data for a stock (served from the snapshot cache)"""
         try:
-            # Read intraday data
-            data_file = STOCK_ANALYSIS_DIR / symbol / "data" / f"{symbol}_intraday_data.json"
-            if data_file.exists():
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    intraday_data = json.load(f)
-                
-                # Calculate basic metrics
-                if intraday_data.get('data'):
-                    prices = [item['price'] for item in intraday_data['data'][:100]]  # Latest 100 points
-                    volumes = [item['volume'] for item in intraday_data['data'][:100]]
-                    buy_volumes = sum([item['volume'] for item in intraday_data['data'][:100] if item['match_type'] == 'Buy'])
-                    sell_volumes = sum([item['volume'] for item in intraday_data['data'][:100] if item['match_type'] == 'Sell'])
-                    total_volume = buy_volumes + sell_volumes
-                    
-                    return {
-                        'symbol': symbol,
-                        'current_price': prices[0] if prices else 0,
-                        'high_price': max(prices) if prices else 0,
-                        'low_price': min(prices) if prices else 0,
-                        'total_volume': total_volume,
-                        'buy_ratio': (buy_volumes / total_volume * 100) if total_volume > 0 else 0,
-                        'sell_ratio': (sell_volumes / total_volume * 100) if total_volume > 0 else 0,
-                        'data_points': intraday_data.get('data_points', 0),
-                        'last_updated': intraday_data.get('timestamp', 'N/A')
-                    }
-            return None
+            return self.snapshots.get(symbol)
         except Exception as e:
             logger.error(f"Error getting stock data for {symbol}: {e}")
             return None
     
-    def get_stock_charts(self, symbol):
-        """Get available charts for a stock"""
+    def get_stock_charts(self, symbol, profile="preview"):
+        """Get available charts for a stock in a render profile (print, preview, svg)"""
         charts = {}
         charts_dir = STOCK_ANALYSIS_DIR / symbol / "charts"
+        extension = RENDER_PROFILES[profile]["format"]
         
-        if charts_dir.exists():
-            # Key charts
-            key_charts_dir = charts_dir / "key_charts"
-            if key_charts_dir.exists():
-                charts['key_charts'] = [f.name for f in key_charts_dir.glob("*.png")]
-            
-            # Technical analysis
-            tech_charts_dir = charts_dir / "technical_analysis"  
-            if tech_charts_dir.exists():
-                charts['technical_analysis'] = [f.name for f in tech_charts_dir.glob("*.png")]
-            
-            # Financial analysis
-            fin_charts_dir = charts_dir / "financial_analysis"
-            if fin_charts_dir.exists():
-                charts['financial_analysis'] = [f.name for f in fin_charts_dir.glob("*.png")]
+        for group in ("key_charts", "technical_analysis", "financial_analysis"):
+            group_dir = profile_path(charts_dir / group / "_.png", profile).parent
+            if group_dir.exists():
+                charts[group] = [f.name for f in group_dir.glob(f"*.{extension}")]
                 
         return charts
     
     def update_stock_data(self, symbol):
         """Update data for a specific stock"""
         try:
-            # Run quick_update.py
-            result = subprocess.run([
-                'python', 'quick_update.py', symbol
-            ], cwd=BASE_DIR, capture_output=True, text=True, timeout=60)
+            result = update_symbol(symbol, mode="quick", store=self.tick_store,
+                                   on_result=self.publisher.publish)
             
-            if result.returncode == 0:
-                logger.info(f"Successfully updated {symbol}")
+            if result['status'] == 'success':
+                logger.info(f"Successfully updated {symbol} (+{result['appended']} ticks)")
                 self.last_update[symbol] = datetime.now()
                 return True
             else:
-                logger.error(f"Error updating {symbol}: {result.stderr}")
+                logger.error(f"Error updating {symbol}: {result.get('error')}")
                 return False
         except Exception as e:
             logger.error(f"Exception updating {symbol}: {e}")
@@ -127,23 +115,11 @@ class StockDataManager:
     def update_stock_charts(self, symbol):
         """Update charts for a specific stock"""
         try:
-            commands = [
-                f'python stock_analysis/{symbol}/analysis/create_{symbol.lower()}_charts.py',
-                f'python stock_analysis/{symbol}/analysis/create_enhanced_{symbol.lower()}_charts.py',
-                f'python stock_analysis/{symbol}/analysis/create_financial_charts.py',
-                f'python stock_analysis/{symbol}/analysis/create_additional_charts.py'
-            ]
-            
-            success_count = 0
-            for cmd in commands:
-                try:
-                    result = subprocess.run(cmd.split(), cwd=BASE_DIR, capture_output=True, text=True, timeout=120)
-                    if result.returncode == 0:
-                        success_count += 1
-                except:
-                    continue
+            # The dashboard only needs preview images; 300 dpi print charts are rendered by the report/PDF builds
+            result = render_charts(symbol, profiles=INTRADAY_PROFILES)
+            success_count = sum(1 for group in result["groups"].values() if group["status"] == "success")
             
-            logger.info(f"Updated {success_count}/{len(commands)} chart groups for {symbol}")
+            logger.info(f"Updated {success_count}/{len(result['groups'])} chart groups for {symbol}")
             return success_count > 0
         except Exception as e:
             logger.error(f"Exception updating charts for {symbol}: {e}")
@@ -151,6 +127,7 @@ class StockDataManager:
 
 # Initialize data manager
 data_manager = StockDataManager()
+static_assets = StaticAssets(STOCK_ANALYSIS_DIR)
 
 @app.route('/')
 def index():
@@ -179,10 +156,43 @@ def get_stock(symbol):
 
 @app.route('/api/stock/<symbol>/charts')
 def get_stock_charts(symbol):
-    """API endpoint to get stock charts"""
-    charts = data_manager.get_stock_charts(symbol.upper())
+    """API endpoint to get stock charts (?profile=print for the 300 dpi report assets)"""
+    profile = request.args.get('profile', 'preview')
+    if profile not in RENDER_PROFILES:
+        return jsonify({'error': f'Unknown profile: {profile}'}), 400
+    charts = data_manager.get_stock_charts(symbol.upper(), profile)
     return jsonify(charts)
 
+@app.route('/api/stock/<symbol>/series')
+def get_stock_series(symbol):
+    """API endpoint for compact chart series (?fields=price,volume&max_points=2000&format=json|bin&method=lttb|minmax&day=)"""
+    symbol = symbol.upper()
+    fields = request.args.get('fields')
+    fmt = request.args.get('format', 'json')
+    try:
+        body, meta = data_manager.series.get(
+            symbol,
+            fields=fields.split(',') if fields else None,
+            max_points=request.args.get('max_points', DEFAULT_MAX_POINTS, type=int),
+            fmt=fmt,
+            day=request.args.get('day'),
+            method=request.args.get('method', 'lttb'),
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FileNotFoundError:
+        return jsonify({'error': 'Stock not found'}), 404
+    except Exception as e:
+        logger.error(f"Error building series for {symbol}: {e}")
+        return jsonify({'error': 'Failed to build series'}), 500
+    
+    mimetype = 'application/octet-stream' if fmt == 'bin' else 'application/json'
+    response = Response(body, mimetype=mimetype)
+    if meta['version'] is not None:
+        response.set_etag(f"{symbol}-{meta['day']}-{meta['version']}-{meta['points']}-{fmt}-{meta['method']}-{','.join(meta['fields'])}")
+        response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
 @app.route('/api/stock/<symbol>/reports')
 def get_stock_reports(symbol):
     """API endpoint to get available reports for a stock"""
@@ -217,10 +227,7 @@ def update_stock(symbol):
     success = data_manager.update_stock_data(symbol)
     
     if success:
-        # Emit update to all connected clients
-        stock_data = data_manager.get_stock_data(symbol)
-        if stock_data:
-            socketio.emit('stock_updated', stock_data)
+        # New ticks are pushed to subscribed clients by the delta publisher
         return jsonify({'success': True, 'message': f'{symbol} updated successfully'})
     
     return jsonify({'success': False, 'message': f'Failed to update {symbol}'}), 500
@@ -237,10 +244,6 @@ def update_stock_full(symbol):
     charts_success = data_manager.update_stock_charts(symbol)
     
     if data_success or charts_success:
-        # Emit update to all connected clients
-        stock_data = data_manager.get_stock_data(symbol)
-        if stock_data:
-            socketio.emit('stock_updated', stock_data)
         return jsonify({
             'success': True, 
             'message': f'{symbol} full analysis completed',
@@ -265,6 +268,14 @@ def stock_detail(symbol):
                          charts=charts,
                          symbol=symbol)
 
+@app.route('/stock/<symbol>/interactive')
+def stock_interactive(symbol):
+    """Interactive chart page fed by the series API and live deltas"""
+    symbol = symbol.upper()
+    return render_template('interactive_chart.html',
+                         symbol=symbol,
+                         max_points=DEFAULT_MAX_POINTS)
+
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
@@ -274,30 +285,42 @@ def handle_connect():
 def handle_disconnect():
     logger.info('Client disconnected')
 
+def _requested_symbols(data):
+    """Symbols from a subscribe/unsubscribe message: {'symbols': [...]} or {'symbol': ...}"""
+    data = data or {}
+    symbols = data.get('symbols') or [data.get('symbol')]
+    return [str(symbol).upper() for symbol in symbols if symbol]
+
+@socketio.on('subscribe')
+def handle_subscribe(data):
+    """Join the rooms of the requested symbols and send their current snapshot"""
+    for symbol in _requested_symbols(data):
+        join_room(symbol)
+        stock_data = data_manager.publisher.snapshot(symbol)
+        if stock_data:
+            emit('stock_snapshot', stock_data)
+
+@socketio.on('unsubscribe')
+def handle_unsubscribe(data):
+    """Leave the rooms of the given symbols"""
+    for symbol in _requested_symbols(data):
+        leave_room(symbol)
+
 @app.route('/stock_analysis/<path:filename>')
 def serve_stock_analysis(filename):
-    """Serve files from stock_analysis directory"""
-    try:
-        logger.info(f"Serving file: {filename}")
-        
-        # Use absolute path for send_from_directory
-        stock_analysis_dir = BASE_DIR / 'stock_analysis'
-        full_path = stock_analysis_dir / filename
-        
-        logger.info(f"Stock analysis dir: {stock_analysis_dir}")
-        logger.info(f"Full path: {full_path}")
-        logger.info(f"File exists: {full_path.exists()}")
-        
-        if not full_path.exists():
-            logger.error(f"File does not exist: {full_path}")
-            return f"File not found: {filename}", 404
-            
-        # Use absolute path string for send_from_directory
-        return send_from_directory(str(stock_analysis_dir), filename)
-        
-    except Exception as e:
-        logger.error(f"Error serving file {filename}: {e}")
-        return f"File not found: {filename} - {str(e)}", 404
+    """Serve reports and charts with strong ETags, precompressed variants and byte ranges"""
+    asset = static_assets.resolve(filename, request.headers.get('Accept-Encoding'))
+    if asset is None:
+        return f"File not found: {filename}", 404
+    
+    # conditional=True answers If-None-Match/If-Modified-Since with 304 and Range with 206
+    response = send_file(asset.path, mimetype=asset.mimetype, etag=asset.etag,
+                         conditional=True, max_age=None)
+    response.headers['Cache-Control'] = asset.cache_control
+    response.headers['Vary'] = 'Accept-Encoding'
+    if asset.encoding:
+        response.headers['Content-Encoding'] = asset.encoding
+    return response
 
 @app.route('/debug/files')
 def debug_files():
@@ -323,30 +346,41 @@ def debug_files():
         return jsonify({'error': str(e)})
 
 def auto_update_stocks():
-    """Automated stock updates"""
+    """Automated stock updates: all symbols in parallel, deltas pushed as each symbol completes"""
     logger.info("Starting automated stock updates")
-    for symbol in data_manager.get_active_stocks():
-        try:
-            success = data_manager.update_stock_data(symbol)
-            if success:
-                stock_data = data_manager.get_stock_data(symbol)
-                if stock_data:
-                    socketio.emit('stock_updated', stock_data)
-            time.sleep(10)  # Wait 10 seconds between updates
-        except Exception as e:
-            logger.error(f"Error in auto update for {symbol}: {e}")
+    try:
+        results = update(
+            data_manager.get_active_stocks(),
+            mode="quick",
+            max_workers=data_manager.config.get('parallel_workers', 3),
+            store=data_manager.tick_store,
+            on_result=data_manager.publisher.publish
+        )
+        for result in results:
+            if result['status'] == 'success':
+                data_manager.last_update[result['symbol']] = datetime.now()
+            else:
+                logger.error(f"Error in auto update for {result['symbol']}: {result.get('error')}")
+    except Exception as e:
+        logger.error(f"Error in auto update: {e}")
+
+def live_update_stocks():
+    """Incremental updates during market hours"""
+    if data_manager.is_market_hours():
+        auto_update_stocks()
 
 def schedule_updates():
     """Schedule automated updates"""
-    # Schedule updates every 5 minutes during market hours
-    schedule.every(5).minutes.do(auto_update_stocks)
+    # Incremental fetches only download new ticks, so poll every few seconds during market hours
+    interval = data_manager.config.get('update_frequency', {}).get('live_update', 15)
+    schedule.every(interval).seconds.do(live_update_stocks)
     
     # Full analysis at market close (15:30)
     schedule.every().day.at("15:30").do(lambda: auto_update_stocks())
     
     while True:
         schedule.run_pending()
-        time.sleep(60)  # Check every minute
+        time.sleep(1)
 
 def start_scheduler():
     """Start the background scheduler"""
@@ -4,155 +4,212 @@
 DOMINUS AGENT - Comprehensive Stock Analysis
 Workflow tối ưu: MỘT LỆNH DUY NHẤT cho phân tích hoàn chỉnh
 
-Usage: python automation/comprehensive_stock_analysis.py [SYMBOL]
+Các bước được dựng theo đồ thị phụ thuộc (build_graph.BuildGraph):
+
+    data -> metrics -> charts:key / charts:technical / charts:additional -> report -> pdf
+    data -> charts:financial ----------------------------------------------^
+
+Mỗi bước chỉ chạy lại khi nội dung đầu vào (tick, file tài chính, mã nguồn)
+thay đổi so với lần dựng thành công trước; các nhóm biểu đồ chạy song song.
+Một lần làm mới intraday vì vậy chỉ vẽ lại các nhóm biểu đồ dùng tick và báo cáo.
+
+Usage: python automation/comprehensive_stock_analysis.py [SYMBOL] [--pdf] [--no-fetch] [--force]
 Output: stock_analysis/[SYMBOL]/reports/[SYMBOL]_comprehensive_report.html
 """
 
-import shutil
+import argparse
 import sys
-import os
-import subprocess
 import time
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent.parent))
+from build_graph import BuildGraph
+from chart_engine import ChartRenderPool
+from chart_engine.engine import CHART_MODULES
+from chart_engine.financial import FINANCIAL_DATA_FILES, SCRIPT_NAME
+from enhanced_report_generator import EnhancedReportGenerator
+from get_data_for_stock import get_data_and_save
+from indicators import INDICATOR_VERSION, IndicatorCache
+from integrate_charts_to_report import integrate_charts_to_report
+from panel import active_symbols
+from pdf_pool import write_pdf
+from report_environment import TEMPLATE_DIR
+from static_assets import precompress
+from tick_store import TickStore
+from update_pipeline import update_symbol
+
+BUILD_STATE_NAME = ".build_state.json"
+
+# Thư mục ảnh của từng nhóm biểu đồ (đầu ra của nút charts:<nhóm>)
+CHART_GROUP_DIRS = {
+    "key": "key_charts",
+    "technical": "technical_analysis",
+    "financial": "financial_analysis",
+    "additional": "additional_analysis",
+}
+
 def log_step(step, message):
     """Log tiến trình"""
     timestamp = time.strftime("%H:%M:%S")
     print(f"[{timestamp}] STEP {step}: {message}")
 
-def run_command(command, description):
-    """Chạy lệnh với error handling"""
-    try:
-        log_step("CMD", f"{description}")
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, encoding='utf-8')
-        
-        # Always print stdout for debugging purposes
-        if result.stdout:
-            print("--- Child Script STDOUT ---")
-            print(result.stdout.strip())
-            print("--- End Child Script STDOUT ---")
-
-        if result.returncode == 0:
-            print(f"SUCCESS: {description}")
-            return True
-        else:
-            print(f"FAILED: {description}")
-            if result.stderr:
-                print("--- Child Script STDERR ---")
-                print(result.stderr.strip())
-                print("--- End Child Script STDERR ---")
-            return False
-    except Exception as e:
-        print(f"ERROR: {description} - {str(e)}")
-        return False
-
 def check_and_create_structure(symbol):
     """Kiểm tra và tạo cấu trúc thư mục cho symbol"""
     base_path = Path(f"stock_analysis/{symbol}")
-    
+
     # Tạo các thư mục cần thiết
     directories = [
         "data",
         "charts/key_charts",
-        "charts/technical_analysis", 
+        "charts/technical_analysis",
         "charts/financial_analysis",
         "charts/additional_analysis",
         "analysis",
         "reports"
     ]
-    
+
     for dir_path in directories:
         (base_path / dir_path).mkdir(parents=True, exist_ok=True)
-    
+
     return base_path.exists()
 
-def comprehensive_analysis(symbol):
-    """Workflow phân tích comprehensive hoàn chỉnh"""
-    
+def analysis_graph(symbol, pool, fetch=True, workers=4):
+    """
+    Đồ thị các bước phân tích của một mã
+
+    Args:
+        symbol: Mã cổ phiếu
+        pool: ChartRenderPool dùng cho các nút biểu đồ
+        fetch: Tải dữ liệu mới trước khi dựng (False: dùng dữ liệu đã có)
+        workers: Số bước được chạy đồng thời
+
+    Returns:
+        BuildGraph với các nút data, metrics, charts:<nhóm>, report, pdf
+    """
+    base_path = Path("stock_analysis") / symbol
+    data_dir = base_path / "data"
+    store = TickStore()
+
+    final_report = base_path / "reports" / f"{symbol}_comprehensive_report.html"
+    final_pdf = final_report.with_suffix(".pdf")
+
+    def intraday():
+        # meta.json của ngày gần nhất đổi phiên bản mỗi lần có tick mới
+        day = store.latest_day(symbol)
+        return store.day_dir(symbol, day) / "meta.json" if day else store.legacy_json_path(symbol)
+
+    financial = [data_dir / f"{symbol}_{name}.json" for name in FINANCIAL_DATA_FILES]
+    # Tỷ số tài chính của các mã đồng nghiệp (phần so sánh đồng nghiệp trong báo cáo)
+    peer_ratios = [Path("stock_analysis") / peer / "data" / f"{peer}_financial_ratios.json"
+                   for peer in active_symbols() if peer != symbol]
+    automation_dir = Path(__file__).parent
+
+    def fetch_data():
+        if store.latest_day(symbol) is None and not store.legacy_json_path(symbol).exists():
+            get_data_and_save(symbol)
+            return store.latest_day(symbol) is not None
+        result = update_symbol(symbol, store=store)
+        if result["status"] != "success":
+            # Dữ liệu đã có vẫn dùng được; các bước sau dựng theo nội dung hiện tại
+            print(f"WARNING: Khong cap nhat duoc {symbol}: {result.get('error')}")
+        return True
+
+    def compute_metrics():
+        try:
+            IndicatorCache(store=store).load(symbol)
+        except FileNotFoundError:
+            print(f"WARNING: {symbol} chua co du lieu intraday")
+        return True
+
+    def build_report():
+        generator = EnhancedReportGenerator()
+        generator.load_peer_panel(symbol)
+        generator.create_enhanced_html_report(symbol)
+        # Ghi thẳng vào vị trí cuối cùng để đường dẫn ảnh tính theo thư mục reports/
+        if not integrate_charts_to_report(symbol, output_path=final_report):
+            return False
+        precompress(final_report)
+        return True
+
+    def build_pdf():
+        write_pdf(final_report, final_pdf)
+        return True
+
+    # Nút data không có đầu vào riêng: các nút phía sau tự hash phần dữ liệu chúng dùng,
+    # nên tick mới không làm nhóm biểu đồ tài chính bị vẽ lại
+    graph = BuildGraph(base_path / BUILD_STATE_NAME, max_workers=workers)
+    graph.add("data", fetch_data if fetch else (lambda: True), always=fetch)
+    graph.add("metrics", compute_metrics, deps=["data"],
+              inputs=[intraday, f"indicators=v{INDICATOR_VERSION}"])
+
+    for group, module in CHART_MODULES.items():
+        if group == "financial":
+            deps = ["data"]
+            inputs = [*financial, base_path / "analysis" / SCRIPT_NAME]
+        else:
+            deps = ["metrics"]
+            inputs = [intraday, *financial]
+        graph.add(f"charts:{group}", lambda group=group: pool.render([symbol], [group])[0],
+                  deps=deps, inputs=[*inputs, Path(module.__file__)],
+                  outputs=[base_path / "charts" / CHART_GROUP_DIRS[group]])
+
+    graph.add("report", build_report, deps=[f"charts:{group}" for group in CHART_MODULES],
+              inputs=[intraday, *financial, *peer_ratios,
+                      automation_dir / "enhanced_report_generator.py",
+                      automation_dir / "integrate_charts_to_report.py",
+                      automation_dir / "report_environment.py",
+                      TEMPLATE_DIR / "enhanced_report.html"],
+              outputs=[final_report])
+    graph.add("pdf", build_pdf, deps=["report"], outputs=[final_pdf])
+    return graph
+
+def comprehensive_analysis(symbol, pdf=False, fetch=True, force=False, workers=4):
+    """
+    Workflow phân tích comprehensive hoàn chỉnh
+
+    Args:
+        symbol: Mã cổ phiếu
+        pdf: Tạo thêm bản PDF của báo cáo
+        fetch: Tải dữ liệu mới trước khi dựng
+        force: Chạy lại mọi bước kể cả khi đầu vào không đổi
+        workers: Số bước được chạy đồng thời
+
+    Returns:
+        True nếu báo cáo cuối cùng đã được dựng
+    """
+
     print("="*60)
     print(f"DOMINUS COMPREHENSIVE ANALYSIS: {symbol}")
     print("="*60)
-    
+
     # BUOC 1: Kiem tra va tao cau truc
     log_step(1, "Kiem tra cau truc thu muc")
     if not check_and_create_structure(symbol):
         print("Khong the tao cau truc thu muc")
         return False
-    
-    # BUOC 2: Lay du lieu (neu chua co)
-    data_file = f"stock_analysis/{symbol}/data/{symbol}_intraday_data.json"
-    if not os.path.exists(data_file):
-        log_step(2, "Lay du lieu ban dau")
-        if not run_command(f"python get_data_for_stock.py {symbol}", 
-                          f"Lay du lieu cho {symbol}"):
-            return False
-    else:
-        log_step(2, "Cap nhat du lieu intraday")
-        run_command(f"python quick_update.py {symbol}", 
-                   f"Cap nhat {symbol}")
-    
-    # BUOC 3: Tao cac script analysis (neu chua co)
-    analysis_path = f"stock_analysis/{symbol}/analysis"
-    scripts = [
-        f"analyze_{symbol.lower()}_data.py",
-        f"create_{symbol.lower()}_charts.py",
-        f"create_enhanced_{symbol.lower()}_charts.py", 
-        f"create_financial_charts.py",
-        f"create_additional_charts.py"
-    ]
-    
-    log_step(3, "Kiem tra analysis scripts")
-    for script in scripts:
-        if not os.path.exists(f"{analysis_path}/{script}"):
-            print(f"WARNING: Missing script: {script}")
-    
-    # BUOC 4: Tao tat ca bieu do
-    log_step(4, "Tao bieu do comprehensive")
-    
-    chart_commands = [
-        (f"python stock_analysis/{symbol}/analysis/create_{symbol.lower()}_charts.py", 
-         "3 Key Charts"),
-        (f"python stock_analysis/{symbol}/analysis/create_enhanced_{symbol.lower()}_charts.py",
-         "5 Technical Charts"),
-        (f"python stock_analysis/{symbol}/analysis/create_financial_charts.py",
-         "5 Financial Charts"), 
-        (f"python stock_analysis/{symbol}/analysis/create_additional_charts.py",
-         "5 Additional Charts")
-    ]
-    
-    success_count = 0
-    for cmd, desc in chart_commands:
-        if run_command(cmd, desc):
-            success_count += 1
-    
-    print(f"Bieu do hoan thanh: {success_count}/4 nhom")
-    
-    # BUOC 5: Tao bao cao comprehensive
-    log_step(5, "Tao bao cao comprehensive")
-    
-    # Tạo enhanced report trước
-    run_command(f"python automation/enhanced_report_generator.py {symbol}",
-               "Tao enhanced report")
-    
-    # Tích hợp biểu đồ vào báo cáo
-    run_command(f"python automation/integrate_charts_to_report.py {symbol}",
-               "Tich hop bieu do")
-    
-    # BUOC 6: Copy bao cao vao vi tri chuan
-    log_step(6, "To chuc bao cao cuoi cung")
-    
-    # Copy từ enhanced_reports về stock_analysis
-    enhanced_report = f"enhanced_reports/{symbol}_enhanced_investment_report.html"
-    final_report = f"stock_analysis/{symbol}/reports/{symbol}_comprehensive_report.html"
-    
-    if os.path.exists(enhanced_report):
-        log_step("CMD", "Copy bao cao chinh")
-        shutil.copy(enhanced_report, final_report)
-    else:
-        print(f"ERROR: Intermediate report file not found at {enhanced_report}")
-    
+
+    # BUOC 2: Dung do thi phan tich (chi cac buoc co dau vao thay doi)
+    log_step(2, "Dung du lieu, bieu do va bao cao")
+
+    def on_result(result):
+        if result["status"] == "fresh":
+            print(f"UNCHANGED: {result['name']}")
+        elif result["status"] == "built":
+            print(f"SUCCESS: {result['name']} ({result['duration']:.1f}s)")
+        else:
+            print(f"FAILED: {result['name']} - {result.get('error')}")
+
+    with ChartRenderPool(max_workers=workers) as pool:
+        graph = analysis_graph(symbol, pool, fetch=fetch, workers=workers)
+        results = graph.build(["pdf" if pdf else "report"], force=force, on_result=on_result)
+
+    built = sum(1 for result in results.values() if result["status"] == "built")
+    fresh = sum(1 for result in results.values() if result["status"] == "fresh")
+    print(f"Cac buoc: {built} chay lai, {fresh} khong doi, {len(results) - built - fresh} loi")
+
     # Kiểm tra kết quả cuối cùng
-    if os.path.exists(final_report):
+    final_report = f"stock_analysis/{symbol}/reports/{symbol}_comprehensive_report.html"
+    if results["report"]["status"] != "failed" and Path(final_report).exists():
         print("="*60)
         print("COMPREHENSIVE ANALYSIS HOÀN THÀNH!")
         print(f"Bao cao: {final_report}")
@@ -165,20 +222,24 @@ def comprehensive_analysis(symbol):
 
 def main():
     """Main function"""
-    if len(sys.argv) != 2:
-        print("Usage: python automation/comprehensive_stock_analysis.py [SYMBOL]")
-        print("Example: python automation/comprehensive_stock_analysis.py VHM")
-        sys.exit(1)
-    
-    symbol = sys.argv[1].upper()
-    
+    parser = argparse.ArgumentParser(description="Comprehensive Stock Analysis")
+    parser.add_argument("symbol", help="Ma co phieu (vd. VHM)")
+    parser.add_argument("--pdf", action="store_true", help="Tao them ban PDF cua bao cao")
+    parser.add_argument("--no-fetch", action="store_true", help="Khong tai du lieu moi")
+    parser.add_argument("--force", action="store_true", help="Chay lai moi buoc")
+    parser.add_argument("--workers", type=int, default=4, help="So buoc chay dong thoi")
+
+    args = parser.parse_args()
+    symbol = args.symbol.upper()
+
     start_time = time.time()
-    success = comprehensive_analysis(symbol)
+    success = comprehensive_analysis(symbol, pdf=args.pdf, fetch=not args.no_fetch,
+                                     force=args.force, workers=args.workers)
     end_time = time.time()
-    
+
     duration = end_time - start_time
     print(f"\nThoi gian thuc hien: {duration:.1f} giay")
-    
+
     if success:
         print(f"{symbol} COMPREHENSIVE ANALYSIS THANH CONG!")
     else:
@@ -186,4 +247,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -69,7 +69,8 @@ def comprehensive_analysis(symbol):
     
     # BUOC 2: Lay du lieu (neu chua co)
     data_file = f"stock_analysis/{symbol}/data/{symbol}_intraday_data.json"
-    if not os.path.exists(data_file):
+    ticks_dir = f"stock_analysis/{symbol}/data/ticks"
+    if not os.path.exists(ticks_dir) and not os.path.exists(data_file):
         log_step(2, "Lay du lieu ban dau")
         if not run_command(f"python get_data_for_stock.py {symbol}", 
                           f"Lay du lieu cho {symbol}"):
@@ -122,20 +123,12 @@ def comprehensive_analysis(symbol):
     run_command(f"python automation/enhanced_report_generator.py {symbol}",
                "Tao enhanced report")
     
-    # Tich hop bieu do vao bao cao
-    run_command(f"python automation/integrate_charts_to_report.py {symbol}",
-               "Tich hop bieu do")
-    
-    # BUOC 6: Copy bao cao vao vi tri chuan
+    # BUOC 6: Tich hop bieu do, ghi thang vao vi tri chuan
+    # (duong dan anh duoc tinh theo thu muc stock_analysis/<SYMBOL>/reports/)
     log_step(6, "To chuc bao cao cuoi cung")
-    
-    # Copy tu enhanced_reports ve stock_analysis
-    enhanced_report = f"enhanced_reports/{symbol}_enhanced_investment_report.html"
     final_report = f"stock_analysis/{symbol}/reports/{symbol}_comprehensive_report.html"
-    
-    if os.path.exists(enhanced_report):
-        run_command(f"cp '{enhanced_report}' '{final_report}'",
-                   "Copy bao cao chinh")
+    run_command(f"python automation/integrate_charts_to_report.py {symbol} --output '{final_report}'",
+               "Tich hop bieu do")
     
     # Kiem tra ket qua cuoi cung
     if os.path.exists(final_report):
@@ -6,18 +6,67 @@ Sử dụng: python automation/enhanced_report_generator.py [SYMBOL]
 
 import sys
 import json
+import time
+import shutil
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
-import base64
-from jinja2 import Template
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+from panel import Panel, active_symbols
+from report_environment import render_template
+from static_assets import precompress
+from tick_store import TickStore
 
 class EnhancedReportGenerator:
     def __init__(self):
         self.base_dir = Path("stock_analysis")
         self.reports_dir = Path("enhanced_reports")
         self.reports_dir.mkdir(exist_ok=True)
+        self.tick_store = TickStore(self.base_dir)
+        self.panel = None
+        
+    def load_panel(self, symbols):
+        """Load one multi-symbol panel used for peer comparison in every report"""
+        self.panel = Panel.load(symbols, base_dir=self.base_dir)
+        self.panel_summary = self.panel.summary()
+        self.panel_correlation = self.panel.correlation()
+        self.panel_ranks = self.panel.peer_ranks()
+        
+    def load_peer_panel(self, symbol):
+        """Load the panel of active symbols (plus symbol) for a single-symbol report"""
+        try:
+            self.load_panel([*active_symbols(), symbol])
+        except Exception as e:
+            print(f"Warning: could not load peer panel: {e}")
+    
+    def load_peer_data(self, symbol, data):
+        """Peer comparison and relative strength from the shared panel"""
+        if self.panel is None or symbol not in self.panel.symbols or len(self.panel.symbols) < 2:
+            return
+        
+        table = self.panel.peer_comparison(symbol)
+        data['peer_comparison'] = [
+            {'name': name, 'highlight': name == symbol,
+             **{key: (None if pd.isna(value) else float(value)) for key, value in row.items()}}
+            for name, row in table.iterrows()
+        ]
+        data['peer_ranks'] = {key: (None if pd.isna(value) else float(value))
+                              for key, value in self.panel_ranks.loc[symbol].items()}
+        
+        summary = self.panel_summary.loc[symbol]
+        if not pd.isna(summary['relative_strength']):
+            data['relative_strength'] = float(summary['relative_strength'])
+            data['beta'] = float(summary['beta'])
+        
+        correlation = self.panel_correlation[symbol].drop(symbol).dropna()
+        data['top_correlations'] = [
+            {'symbol': peer, 'value': float(value)}
+            for peer, value in correlation.sort_values(ascending=False).head(3).items()
+        ]
         
     def load_stock_data(self, symbol):
         """Load comprehensive stock data"""
@@ -40,64 +89,61 @@ class EnhancedReportGenerator:
         }
         
         # Load intraday data
-        intraday_file = self.base_dir / symbol / "data" / f"{symbol}_intraday_data.json"
-        if intraday_file.exists():
-            with open(intraday_file, 'r', encoding='utf-8') as f:
-                intraday_data = json.load(f)
-                data['intraday_data'] = intraday_data
+        if self.tick_store.has_ticks(symbol):
+            df = self.tick_store.load_ticks(symbol)
+            data['intraday_meta'] = self.tick_store.load_meta(symbol)
+            
+            if not df.empty:
+                # Basic metrics
+                data['total_data_points'] = len(df)
+                data['current_price'] = df['price'].iloc[-1]
+                data['opening_price'] = df['price'].iloc[0]
+                data['highest_price'] = df['price'].max()
+                data['lowest_price'] = df['price'].min()
+                data['average_price'] = df['price'].mean()
+                data['total_volume'] = df['volume'].sum()
                 
-                if 'data' in intraday_data and intraday_data['data']:
-                    df = pd.DataFrame(intraday_data['data'])
-                    
-                    # Basic metrics
-                    data['total_data_points'] = len(df)
-                    data['current_price'] = df['price'].iloc[-1]
-                    data['opening_price'] = df['price'].iloc[0]
-                    data['highest_price'] = df['price'].max()
-                    data['lowest_price'] = df['price'].min()
-                    data['average_price'] = df['price'].mean()
-                    data['total_volume'] = df['volume'].sum()
-                    
-                    # Price change calculation
-                    price_change = data['current_price'] - data['opening_price']
-                    price_change_percent = (price_change / data['opening_price']) * 100
-                    data['price_change'] = price_change
-                    data['price_change_percent'] = price_change_percent
-                    
-                    # Volume analysis
-                    df['time'] = pd.to_datetime(df['time'])
-                    df['hour'] = df['time'].dt.hour
-                    volume_by_hour = df.groupby('hour')['volume'].sum()
-                    data['peak_hour'] = volume_by_hour.idxmax()
-                    data['peak_volume'] = volume_by_hour.max()
-                    
-                    # Buy/Sell analysis
-                    buy_volume = df[df['match_type'] == 'Buy']['volume'].sum()
-                    sell_volume = df[df['match_type'] == 'Sell']['volume'].sum()
-                    data['buy_volume'] = buy_volume
-                    data['sell_volume'] = sell_volume
-                    data['buy_sell_ratio'] = buy_volume / sell_volume if sell_volume > 0 else float('inf')
-                    
-                    # Volatility
-                    data['volatility'] = df['price'].std()
-                    data['price_range'] = data['highest_price'] - data['lowest_price']
-                    
-                    # Market sentiment
-                    if data['buy_sell_ratio'] > 1.5:
-                        data['market_sentiment'] = 'Rất tích cực'
-                        data['sentiment_color'] = '#28a745'
-                    elif data['buy_sell_ratio'] > 1.1:
-                        data['market_sentiment'] = 'Tích cực'
-                        data['sentiment_color'] = '#17a2b8'
-                    elif data['buy_sell_ratio'] > 0.9:
-                        data['market_sentiment'] = 'Trung tính'
-                        data['sentiment_color'] = '#ffc107'
-                    else:
-                        data['market_sentiment'] = 'Tiêu cực'
-                        data['sentiment_color'] = '#dc3545'
-        
+                # Price change calculation
+                price_change = data['current_price'] - data['opening_price']
+                price_change_percent = (price_change / data['opening_price']) * 100
+                data['price_change'] = price_change
+                data['price_change_percent'] = price_change_percent
+                
+                # Volume analysis
+                df['time'] = pd.to_datetime(df['time'])
+                df['hour'] = df['time'].dt.hour
+                volume_by_hour = df.groupby('hour')['volume'].sum()
+                data['peak_hour'] = volume_by_hour.idxmax()
+                data['peak_volume'] = volume_by_hour.max()
+                
+                # Buy/Sell analysis
+                buy_volume = df[df['match_type'] == 'Buy']['volume'].sum()
+                sell_volume = df[df['match_type'] == 'Sell']['volume'].sum()
+                data['buy_volume'] = buy_volume
+                data['sell_volume'] = sell_volume
+                data['buy_sell_ratio'] = buy_volume / sell_volume if sell_volume > 0 else float('inf')
+                
+                # Volatility
+                data['volatility'] = df['price'].std()
+                data['price_range'] = data['highest_price'] - data['lowest_price']
+                
+                # Market sentiment
+                if data['buy_sell_ratio'] > 1.5:
+                    data['market_sentiment'] = 'Rất tích cực'
+                    data['sentiment_color'] = '#28a745'
+                elif data['buy_sell_ratio'] > 1.1:
+                    data['market_sentiment'] = 'Tích cực'
+                    data['sentiment_color'] = '#17a2b8'
+                elif data['buy_sell_ratio'] > 0.9:
+                    data['market_sentiment'] = 'Trung tính'
+                    data['sentiment_color'] = '#ffc107'
+                else:
+                    data['market_sentiment'] = 'Tiêu cực'
+                    data['sentiment_color'] = '#dc3545'
+    
         # Load financial data
         self.load_financial_data(symbol, data)
+        self.load_peer_data(symbol, data)
         
         # Generate investment recommendation
         self.generate_investment_recommendation(data)
@@ -375,397 +421,72 @@ class EnhancedReportGenerator:
         data = self.load_stock_data(symbol)
         charts = self.get_chart_paths(symbol)
         
-        # HTML template
-        html_template = """<!DOCTYPE html>
-<html lang="vi">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{{data.symbol}} - Báo cáo Phân tích Comprehensive</title>
-    <style>
-        body {
-            font-family: 'Arial', sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: #333;
-        }
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }
-        .header {
-            background: linear-gradient(135deg, #2196F3 0%, #1976D2 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }
-        .header h1 {
-            margin: 0;
-            font-size: 2.5em;
-            font-weight: bold;
-        }
-        .header p {
-            margin: 10px 0 0 0;
-            font-size: 1.2em;
-            opacity: 0.9;
-        }
-        .summary-cards {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            padding: 30px;
-            background: #f8f9fa;
-        }
-        .card {
-            background: white;
-            padding: 25px;
-            border-radius: 10px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-            text-align: center;
-            border-left: 5px solid #2196F3;
-        }
-        .card h3 {
-            margin: 0 0 10px 0;
-            color: #2196F3;
-            font-size: 1.1em;
-        }
-        .card .value {
-            font-size: 1.8em;
-            font-weight: bold;
-            color: #333;
-            margin: 10px 0;
-        }
-        .card .change {
-            font-size: 1em;
-            margin: 5px 0;
-        }
-        .positive { color: #4CAF50; }
-        .negative { color: #f44336; }
-        .neutral { color: #FF9800; }
-        
-        .recommendation {
-            background: linear-gradient(135deg, #4CAF50 0%, #45a049 100%);
-            color: white;
-            padding: 30px;
-            margin: 20px 30px;
-            border-radius: 10px;
-            text-align: center;
-        }
-        .recommendation.sell, .recommendation.weak.sell {
-            background: linear-gradient(135deg, #f44336 0%, #d32f2f 100%);
-        }
-        .recommendation.hold {
-            background: linear-gradient(135deg, #FF9800 0%, #F57C00 100%);
-        }
-        
-        .charts-section {
-            padding: 30px;
-        }
-        .charts-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
-            gap: 30px;
-            margin: 20px 0;
-        }
-        .chart-container {
-            background: white;
-            border-radius: 10px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }
-        .chart-container img {
-            width: 100%;
-            height: auto;
-            display: block;
-        }
-        .chart-title {
-            background: #f8f9fa;
-            padding: 15px;
-            font-weight: bold;
-            color: #333;
-            border-bottom: 1px solid #e9ecef;
-        }
-        
-        .analysis-section {
-            padding: 30px;
-            background: #f8f9fa;
-        }
-        .analysis-grid {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 30px;
-        }
-        .analysis-box {
-            background: white;
-            padding: 25px;
-            border-radius: 10px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-        }
-        .analysis-box h3 {
-            color: #2196F3;
-            margin-top: 0;
-            border-bottom: 2px solid #2196F3;
-            padding-bottom: 10px;
-        }
-        
-        .footer {
-            background: #333;
-            color: white;
-            text-align: center;
-            padding: 20px;
-            font-size: 0.9em;
-        }
-        
-        .metric-row {
-            display: flex;
-            justify-content: space-between;
-            padding: 8px 0;
-            border-bottom: 1px solid #eee;
-        }
-        .metric-row:last-child {
-            border-bottom: none;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <!-- Header -->
-        <div class="header">
-            <h1>{{data.symbol}} COMPREHENSIVE ANALYSIS</h1>
-            <p>Báo cáo Phân tích Chi tiết - {{data.timestamp}}</p>
-        </div>
-
-        <!-- Summary Cards -->
-        <div class="summary-cards">
-            <div class="card">
-                <h3>Giá Hiện tại</h3>
-                <div class="value">{{'{:,.2f}'.format(data.current_price)}} VND</div>
-                <div class="change {% if data.price_change > 0 %}positive{% elif data.price_change < 0 %}negative{% else %}neutral{% endif %}">
-                    {{'{:+.2f}'.format(data.price_change)}} VND ({{'{:+.2f}'.format(data.price_change_percent)}}%)
-                </div>
-            </div>
-            
-            <div class="card">
-                <h3>Khối lượng GD</h3>
-                <div class="value">{{'{:,}'.format(data.total_volume)}}</div>
-                <div class="change">Tỷ lệ Mua/Bán: {{'{:.2f}'.format(data.buy_sell_ratio)}}</div>
-            </div>
-            
-            <div class="card">
-                <h3>Tổng Tài sản</h3>
-                <div class="value">{{'{:,.1f}'.format(data.total_assets/1e12) if data.total_assets != 'N/A' else '--'}}T VND</div>
-                <div class="change">Debt Ratio: {{'{:.1f}'.format(data.debt_ratio) if data.debt_ratio != 'N/A' else '--'}}%</div>
-            </div>
-            
-            <div class="card">
-                <h3>ROE</h3>
-                <div class="value">{{'{:.1f}'.format(data.roe) if data.roe != 'N/A' else '--'}}%</div>
-                <div class="change">P/E: {{'{:.1f}'.format(data.pe_ratio) if data.pe_ratio != 'N/A' else '--'}}</div>
-            </div>
-        </div>
-
-        <!-- Investment Recommendation -->
-        <div class="recommendation {{data.recommendation.lower().replace(' ', '-')}}">
-            <h2>KHUYẾN NGHỊ ĐẦU TƯ: {{data.recommendation}}</h2>
-            <p><strong>Target Price:</strong> {{'{:,.2f}'.format(data.target_price)}} VND ({{'{:+.1f}'.format((data.target_price/data.current_price - 1)*100)}}%)</p>
-            <p><strong>Timeframe:</strong> {{data.time_horizon}} | <strong>Risk Level:</strong> {{data.risk_level}} | <strong>Confidence:</strong> {{data.confidence_level}}%</p>
-            <p><strong>Xu hướng:</strong> {{'Tăng' if data.price_change > 0 else 'Giảm' if data.price_change < 0 else 'Đi ngang'}} | <strong>Score:</strong> {{'{:.0f}'.format(data.overall_score)}}/100</p>
-        </div>
-
-        <!-- Charts Section -->
-        <div class="charts-section">
-            <h2>Biểu đồ Phân tích (18 Charts - Comprehensive Analysis)</h2>
-            
-            <!-- Key Charts -->
-            <h3>Key Performance Charts (3/18)</h3>
-            <div class="charts-grid">
-                {% for chart in charts.key_charts %}
-                <div class="chart-container">
-                    <div class="chart-title">{{chart.name}}</div>
-                    <img src="../charts/key_charts/{{chart.filename}}" alt="{{chart.name}}">
-                </div>
-                {% endfor %}
-            </div>
-            
-            <!-- Technical Analysis Charts -->
-            <h3>Technical Analysis Charts (5/18)</h3>
-            <div class="charts-grid">
-                {% for chart in charts.technical_analysis %}
-                <div class="chart-container">
-                    <div class="chart-title">{{chart.name}}</div>
-                    <img src="../charts/technical_analysis/{{chart.filename}}" alt="{{chart.name}}">
-                </div>
-                {% endfor %}
-            </div>
-            
-            <!-- Financial Analysis Charts -->
-            <h3>Financial Analysis Charts (5/18)</h3>
-            <div class="charts-grid">
-                {% for chart in charts.financial_analysis %}
-                <div class="chart-container">
-                    <div class="chart-title">{{chart.name}}</div>
-                    <img src="../charts/financial_analysis/{{chart.filename}}" alt="{{chart.name}}">
-                </div>
-                {% endfor %}
-            </div>
-            
-            <!-- Additional Analysis Charts -->
-            <h3>Additional Analysis Charts (5/18)</h3>
-            <div class="charts-grid">
-                {% for chart in charts.additional_analysis %}
-                <div class="chart-container">
-                    <div class="chart-title">{{chart.name}}</div>
-                    <img src="../charts/additional_analysis/{{chart.filename}}" alt="{{chart.name}}">
-                </div>
-                {% endfor %}
-            </div>
-        </div>
-
-        <!-- Detailed Analysis -->
-        <div class="analysis-section">
-            <h2>Phân tích Chi tiết</h2>
-            
-            <div class="analysis-grid">
-                <div class="analysis-box">
-                    <h3>Technical Analysis</h3>
-                    <div class="metric-row">
-                        <span>Volatility (Std Dev):</span>
-                        <span>{{'{:.3f}'.format(data.volatility)}}</span>
-                    </div>
-                    <div class="metric-row">
-                        <span>Price Range:</span>
-                        <span>{{'{:,.2f}'.format(data.lowest_price)}} - {{'{:,.2f}'.format(data.highest_price)}}</span>
-                    </div>
-                    <div class="metric-row">
-                        <span>Volume Weighted Avg:</span>
-                        <span>{{'{:,.2f}'.format(data.average_price)}} VND</span>
-                    </div>
-                    <div class="metric-row">
-                        <span>Data Points:</span>
-                        <span>{{'{:,}'.format(data.total_data_points)}}</span>
-                    </div>
-                </div>
-                
-                <div class="analysis-box">
-                    <h3>Financial Health</h3>
-                    <div class="metric-row">
-                        <span>Total Assets:</span>
-                        <span>{{'{:,.2f}T'.format(data.total_assets/1e12) if data.total_assets != 'N/A' else '--'}} VND</span>
-                    </div>
-                    <div class="metric-row">
-                        <span>Total Liabilities:</span>
-                        <span>{{'{:,.2f}T'.format(data.total_debt/1e12) if data.total_debt != 'N/A' else '--'}} VND</span>
-                    </div>
-                    <div class="metric-row">
-                        <span>Equity:</span>
-                        <span>{{'{:,.2f}T'.format(data.total_equity/1e12) if data.total_equity != 'N/A' else '--'}} VND</span>
-                    </div>
-                    <div class="metric-row">
-                        <span>Debt/Asset Ratio:</span>
-                        <span>{{'{:.1f}'.format(data.debt_ratio) if data.debt_ratio != 'N/A' else '--'}}%</span>
-                    </div>
-                </div>
-                
-                <div class="analysis-box">
-                    <h3>Profitability Ratios</h3>
-                    <div class="metric-row">
-                        <span>ROE (Return on Equity):</span>
-                        <span>{{'{:.2f}'.format(data.roe) if data.roe != 'N/A' else '--'}}%</span>
-                    </div>
-                    <div class="metric-row">
-                        <span>ROA (Return on Assets):</span>
-                        <span>{{'{:.2f}'.format(data.roa) if data.roa != 'N/A' else '--'}}%</span>
-                    </div>
-                    <div class="metric-row">
-                        <span>P/E Ratio:</span>
-                        <span>{{'{:.2f}'.format(data.pe_ratio) if data.pe_ratio != 'N/A' else '--'}}</span>
-                    </div>
-                    <div class="metric-row">
-                        <span>P/B Ratio:</span>
-                        <span>{{'{:.2f}'.format(data.pb_ratio) if data.pb_ratio != 'N/A' else '--'}}</span>
-                    </div>
-                </div>
-                
-                <div class="analysis-box">
-                    <h3>Risk Assessment</h3>
-                    <div class="metric-row">
-                        <span>Price Volatility:</span>
-                        <span>{{'Cao' if data.volatility > 2 else 'Trung bình' if data.volatility > 1 else 'Thấp'}}</span>
-                    </div>
-                    <div class="metric-row">
-                        <span>Liquidity:</span>
-                        <span>{{'Tốt' if data.total_volume > 1000000 else 'Trung bình' if data.total_volume > 500000 else 'Thấp'}}</span>
-                    </div>
-                    <div class="metric-row">
-                        <span>Financial Leverage:</span>
-                        <span>{{data.financial_leverage}}</span>
-                    </div>
-                    <div class="metric-row">
-                        <span>Overall Risk:</span>
-                        <span>{{data.risk_level}}</span>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="analysis-box" style="margin-top: 30px;">
-                <h3>Key Insights & Summary</h3>
-                <p><strong>Điểm mạnh:</strong></p>
-                <ul>
-                    {% for reason in data.strengths %}
-                    <li>{{reason}}</li>
-                    {% endfor %}
-                </ul>
-                
-                <p><strong>Điểm cần lưu ý:</strong></p>
-                <ul>
-                    {% for risk in data.risk_factors %}
-                    <li>{{risk}}</li>
-                    {% endfor %}
-                </ul>
-                
-                <p><strong>Kết luận:</strong> {{data.symbol}} hiện tại được khuyến nghị {{data.recommendation}} với giá mục tiêu {{'{:,.2f}'.format(data.target_price)}} VND. 
-                Mức độ tin cậy {{data.confidence_level}}% dựa trên phân tích kỹ thuật và cơ bản.</p>
-            </div>
-        </div>
-
-        <!-- Footer -->
-        <div class="footer">
-            <p>Báo cáo được tạo tự động bởi DOMINUS AGENT | VNStock Analysis System v6.0</p>
-            <p>Dữ liệu cập nhật: {{data.timestamp}} | Chỉ mang tính chất tham khảo</p>
-        </div>
-    </div>
-</body>
-</html>"""
-        
-        # Render template
-        template = Template(html_template)
-        rendered_html = template.render(data=data, charts=charts)
+        # Render template (biên dịch một lần cho mỗi tiến trình, xem report_environment.py)
+        rendered_html = render_template("enhanced_report.html", data=data, charts=charts)
         
         # Save report
-        print(f"DEBUG: Rendering template for {symbol}...")
         report_file = self.reports_dir / f"{symbol}_enhanced_investment_report.html"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(rendered_html)
-        print(f"DEBUG: Report file {report_file} should have been created.")
+        report_file.write_text(rendered_html, encoding='utf-8')
         
-        # Also save in original location for compatibility
+        # Also save in original location for compatibility (copy file, không encode lại)
         original_report_file = self.base_dir / symbol / "reports" / f"{symbol}_enhanced_analysis_report.html"
         original_report_file.parent.mkdir(exist_ok=True)
-        with open(original_report_file, 'w', encoding='utf-8') as f:
-            f.write(rendered_html)
+        shutil.copyfile(report_file, original_report_file)
+        precompress(original_report_file)
         
         return report_file, data
 
+def render_reports(symbols=None, max_workers=4, generator=None):
+    """
+    Tạo báo cáo Enhanced cho nhiều mã trong một lượt
+    
+    Panel so sánh đồng nghiệp được nạp một lần cho cả lô, các báo cáo được
+    render song song trên một thread pool với cùng template đã biên dịch.
+    
+    Args:
+        symbols: Danh sách mã (mặc định mọi mã có thư mục data/)
+        max_workers: Số báo cáo được tạo đồng thời
+        generator: EnhancedReportGenerator dùng chung (mặc định tạo mới)
+    
+    Returns:
+        Danh sách dict theo thứ tự các mã gồm symbol, status ('success' hoặc
+        'error'), report_file, recommendation, confidence_level, duration,
+        error nếu có lỗi
+    """
+    generator = generator or EnhancedReportGenerator()
+    if symbols is None:
+        symbols = [d.name for d in generator.base_dir.iterdir() if d.is_dir() and (d / "data").exists()]
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    if not symbols:
+        return []
+    
+    # Một panel cho cả lô: so sánh đồng nghiệp không phải đọc lại file của từng mã
+    try:
+        generator.load_panel(symbols)
+    except Exception as e:
+        print(f"Warning: could not load peer panel: {e}")
+    
+    def render(symbol):
+        start_time = time.time()
+        result = {'symbol': symbol, 'status': 'success'}
+        try:
+            report_file, data = generator.create_enhanced_html_report(symbol)
+            result.update(report_file=str(report_file), recommendation=data['recommendation'],
+                          confidence_level=data['confidence_level'])
+        except Exception as e:
+            result.update(status='error', error=str(e))
+        result['duration'] = time.time() - start_time
+        return result
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as executor:
+        return list(executor.map(render, symbols))
+
 def main():
     parser = argparse.ArgumentParser(description='Enhanced Report Generator for Stock Analysis')
     parser.add_argument('symbol', nargs='?', help='Stock symbol to generate report for')
     parser.add_argument('--batch', action='store_true', help='Generate reports for all stocks')
     parser.add_argument('--list', action='store_true', help='List available reports')
+    parser.add_argument('--workers', type=int, default=4, help='Reports rendered concurrently in --batch mode')
     
     args = parser.parse_args()
     generator = EnhancedReportGenerator()
@@ -789,17 +510,15 @@ def main():
         
         print(f"🔄 Tạo báo cáo Enhanced cho {len(stocks)} cổ phiếu...")
         
-        success_count = 0
-        for symbol in stocks:
-            try:
-                print(f"\n📊 Đang tạo báo cáo cho {symbol}...")
-                report_file, data = generator.create_enhanced_html_report(symbol)
-                print(f"✅ Báo cáo tạo thành công: {report_file}")
-                print(f"🎯 Khuyến nghị: {data['recommendation']} ({data['confidence_level']}%)")
-                success_count += 1
-            except Exception as e:
-                print(f"❌ Lỗi tạo báo cáo cho {symbol}: {e}")
+        results = render_reports(stocks, max_workers=args.workers, generator=generator)
+        for result in results:
+            if result['status'] == 'success':
+                print(f"✅ {result['symbol']}: {result['report_file']} "
+                      f"({result['recommendation']}, {result['confidence_level']}%)")
+            else:
+                print(f"❌ Lỗi tạo báo cáo cho {result['symbol']}: {result['error']}")
         
+        success_count = sum(1 for result in results if result['status'] == 'success')
         print(f"\n🎯 Kết quả: {success_count}/{len(stocks)} báo cáo được tạo thành công")
     
     elif args.symbol:
@@ -807,6 +526,7 @@ def main():
         print(f"Tao bao cao Enhanced cho {symbol}...")
         
         try:
+            generator.load_peer_panel(symbol)
             report_file, data = generator.create_enhanced_html_report(symbol)
             print(f"Bao cao duoc tao: {report_file}")
             print(f"\nKet qua phan tich:")
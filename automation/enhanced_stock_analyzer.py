@@ -23,6 +23,12 @@ import warnings
 import codecs
 warnings.filterwarnings('ignore')
 
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+from tick_store import TickStore
+from indicators import load_indicators
+from chart_engine.output import save_figure
+
 # Fix encoding for Windows
 sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer)
 
@@ -53,10 +59,9 @@ class EnhancedStockAnalyzer:
         data = {}
         
         # Load intraday data
-        intraday_file = self.data_path / f"{self.symbol}_intraday_data.json"
-        if intraday_file.exists():
-            with open(intraday_file, 'r', encoding='utf-8') as f:
-                data['intraday'] = json.load(f)
+        store = TickStore()
+        if store.has_ticks(self.symbol):
+            data['intraday'] = store.load_intraday_payload(self.symbol)
         
         # Load financial data
         for file_type in ['balance_sheet', 'income_statement', 'financial_ratios']:
@@ -207,7 +212,7 @@ class EnhancedStockAnalyzer:
         plt.tight_layout()
         
         chart_path = self.charts_path / "key_charts" / "price_trend.png"
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+        save_figure(chart_path)
         plt.close()
         charts.append(str(chart_path))
         
@@ -232,7 +237,7 @@ class EnhancedStockAnalyzer:
         plt.tight_layout()
         
         chart_path = self.charts_path / "key_charts" / "volume_by_hour.png"
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+        save_figure(chart_path)
         plt.close()
         charts.append(str(chart_path))
         
@@ -255,7 +260,7 @@ class EnhancedStockAnalyzer:
                      fontsize=16, fontweight='bold', pad=20)
             
             chart_path = self.charts_path / "key_charts" / "buy_vs_sell.png"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+            save_figure(chart_path)
             plt.close()
             charts.append(str(chart_path))
         
@@ -264,17 +269,13 @@ class EnhancedStockAnalyzer:
     def _create_technical_charts(self):
         """Tạo biểu đồ phân tích kỹ thuật"""
         charts = []
-        intraday_data = self.data['intraday']
-        df = pd.DataFrame(intraday_data['data'])
-        df['time'] = pd.to_datetime(df['time'])
-        df = df.sort_values('time')
+        # Tick kèm MA5/MA10... đã tính sẵn trong cache chỉ số
+        df = load_indicators(self.symbol)
         
         # Technical Indicators Chart
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
         
         # Moving Averages
-        df['MA5'] = df['price'].rolling(window=5).mean()
-        df['MA10'] = df['price'].rolling(window=10).mean()
         
         ax1.plot(df['time'], df['price'], label='Giá', linewidth=2, color='blue')
         ax1.plot(df['time'], df['MA5'], label='MA5', color='orange', alpha=0.8)
@@ -308,7 +309,7 @@ class EnhancedStockAnalyzer:
         plt.tight_layout()
         
         chart_path = self.charts_path / "technical_analysis" / "technical_indicators.png"
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+        save_figure(chart_path)
         plt.close()
         charts.append(str(chart_path))
         
@@ -381,7 +382,7 @@ class EnhancedStockAnalyzer:
                 plt.tight_layout()
                 
                 chart_path = self.charts_path / "financial_analysis" / "financial_ratios.png"
-                plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+                save_figure(chart_path)
                 plt.close()
                 charts.append(str(chart_path))
         
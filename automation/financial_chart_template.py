@@ -1,6 +1,12 @@
+import sys
+from pathlib import Path
+
 import pandas as pd
 import matplotlib.pyplot as plt
 
+sys.path.append(str(Path(__file__).parent.parent))
+from chart_engine.output import save_figure
+
 def create_real_financial_chart(data, symbol, output_path):
     """
     Tạo một biểu đồ tài chính đơn giản.
@@ -23,7 +29,7 @@ def create_real_financial_chart(data, symbol, output_path):
         plt.xlabel('Năm')
         plt.ylabel('Tổng tài sản (đồng)')
         plt.grid(True)
-        plt.savefig(output_path)
+        save_figure(output_path)
         plt.close()
         print(f"Created financial chart for {symbol} at {output_path}")
         return True
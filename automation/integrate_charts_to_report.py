@@ -5,15 +5,28 @@ Integrate charts into HTML report
 """
 
 import os
-import base64
 import sys
+import argparse
 from pathlib import Path
 
-def integrate_charts_to_report(symbol):
-    """Tích hợp 18 biểu đồ vào báo cáo HTML"""
+sys.path.append(str(Path(__file__).parent.parent))
+from report_assets import ASSET_MODES, ChartAssets
+
+def integrate_charts_to_report(symbol, asset_mode=None, output_path=None):
+    """
+    Tích hợp 18 biểu đồ vào báo cáo HTML
+    
+    Args:
+        symbol: Mã cổ phiếu
+        asset_mode: 'reference' (ảnh có hash, tải lười - mặc định) hoặc
+            'inline' (nhúng base64 để xuất một file HTML duy nhất)
+        output_path: File báo cáo đã tích hợp (mặc định ghi đè báo cáo Enhanced);
+            đường dẫn ảnh được tính theo thư mục của file này
+    """
     
     # Đường dẫn đến báo cáo HTML
     report_path = f"enhanced_reports/{symbol}_enhanced_investment_report.html"
+    output_path = Path(output_path or report_path)
     charts_base_path = f"stock_analysis/{symbol}/charts"
     
     if not os.path.exists(report_path):
@@ -53,20 +66,21 @@ def integrate_charts_to_report(symbol):
         ("additional_analysis/performance_dashboard.png", "Performance Dashboard"),
     ]
     
+    assets = ChartAssets(symbol, mode=asset_mode)
+    
     # Tích hợp từng biểu đồ
     integrated_charts = []
     for chart_path, chart_title in charts_to_integrate:
         full_path = os.path.join(charts_base_path, chart_path)
         if os.path.exists(full_path):
-            # Chuyển đổi ảnh thành base64
-            with open(full_path, "rb") as img_file:
-                img_data = base64.b64encode(img_file.read()).decode()
+            img_tag = assets.img_tag(full_path, chart_title, "width: 100%; max-width: 800px; height: auto;",
+                                     report_dir=output_path.parent)
             
             # Tạo HTML cho biểu đồ
             chart_html = f"""
             <div class="chart-container">
                 <h3>{chart_title}</h3>
-                <img src="data:image/png;base64,{img_data}" alt="{chart_title}" style="width: 100%; max-width: 800px; height: auto;">
+                {img_tag}
             </div>
             """
             integrated_charts.append(chart_html)
@@ -74,6 +88,8 @@ def integrate_charts_to_report(symbol):
         else:
             print(f"Not found: {full_path}")
     
+    assets.save()
+    
     # Tạo section chứa tất cả biểu đồ
     charts_section = f"""
     <div class="charts-section">
@@ -130,16 +146,19 @@ def integrate_charts_to_report(symbol):
     html_content = html_content[:insert_position] + analysis_update + html_content[insert_position:]
     
     # Lưu báo cáo đã cập nhật
-    with open(report_path, 'w', encoding='utf-8') as f:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
         f.write(html_content)
     
     print(f"Integrated {len(integrated_charts)} charts into report")
-    print(f"Updated report: {report_path}")
+    print(f"Updated report: {output_path}")
     return True
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        symbol = sys.argv[1].upper()
-        integrate_charts_to_report(symbol)
-    else:
-        print("Usage: python integrate_charts_to_report.py [SYMBOL]")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Integrate charts into HTML report")
+    parser.add_argument("symbol", help="Stock symbol")
+    parser.add_argument("--asset-mode", choices=ASSET_MODES,
+                        help="reference: hashed chart files (default), inline: base64 single-file export")
+    parser.add_argument("--output", help="Write the integrated report here instead of overwriting the enhanced report")
+    args = parser.parse_args()
+    integrate_charts_to_report(args.symbol.upper(), args.asset_mode, args.output)
@@ -15,6 +15,10 @@ import time
 import json
 from pathlib import Path
 
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+from tick_store import TickStore
+
 def log_step(step, message):
     """Log tien trinh"""
     timestamp = time.strftime("%H:%M:%S")
@@ -39,15 +43,14 @@ def create_intraday_report(symbol):
     """Tao bao cao intraday HTML"""
     
     # Doc du lieu intraday
-    data_file = f"stock_analysis/{symbol}/data/{symbol}_intraday_data.json"
+    store = TickStore()
     
-    if not os.path.exists(data_file):
-        print(f"Khong tim thay du lieu: {data_file}")
+    if not store.has_ticks(symbol):
+        print(f"Khong tim thay du lieu: {store.ticks_dir(symbol)}")
         return False
     
     try:
-        with open(data_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = store.load_meta(symbol) or store.load_intraday_payload(symbol)
         
         # Tao noi dung HTML don gian
         html_content = f"""
@@ -14,6 +14,11 @@ from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+sys.path.append(str(Path(__file__).parent.parent))
+from update_pipeline import update_symbol
+from chart_engine import render_many
+from chart_engine.output import INTRADAY_PROFILES
+
 try:
     import schedule
     SCHEDULE_AVAILABLE = True
@@ -83,14 +88,9 @@ class MultiStockUpdater:
                 print(f"[{datetime.now().strftime('%H:%M:%S')}] Updating {symbol} (attempt {attempt + 1})")
                 
                 # Quick update
-                result = subprocess.run(
-                    ["python", "quick_update.py", symbol],
-                    capture_output=True,
-                    text=True,
-                    timeout=120
-                )
+                result = update_symbol(symbol, mode="quick")
                 
-                if result.returncode == 0:
+                if result["status"] == "success":
                     # Run analysis
                     analysis_result = subprocess.run(
                         ["python", f"stock_analysis/{symbol}/analysis/analyze_{symbol.lower()}_data.py"],
@@ -104,10 +104,11 @@ class MultiStockUpdater:
                         "status": "success",
                         "timestamp": datetime.now().isoformat(),
                         "attempt": attempt + 1,
-                        "output": result.stdout.strip()
+                        "appended": result["appended"],
+                        "duration": result["duration"]
                     }
                 else:
-                    raise Exception(f"Update failed: {result.stderr}")
+                    raise Exception(f"Update failed: {result['error']}")
                     
             except Exception as e:
                 if attempt == self.config["retry_attempts"]:
@@ -143,36 +144,36 @@ class MultiStockUpdater:
         
         return results
     
-    def generate_full_analysis(self, symbols=None):
-        """Generate full analysis with charts for specified symbols"""
+    def generate_full_analysis(self, symbols=None, profiles=None):
+        """Generate full analysis with charts for specified symbols (profiles: render profiles to write)"""
         symbols = symbols or self.config["active_stocks"]
-        results = []
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] Full analysis for {', '.join(symbols)}")
         
-        for symbol in symbols:
-            try:
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] Full analysis for {symbol}")
-                
-                # Create charts
-                chart_result = subprocess.run(
-                    ["python", f"stock_analysis/{symbol}/analysis/create_{symbol.lower()}_charts.py"],
-                    capture_output=True,
-                    text=True,
-                    timeout=180
+        try:
+            # Charts of all symbols are rendered in parallel by a process pool
+            chart_results = render_many(symbols, ["key"], max_workers=self.config.get("chart_workers"),
+                                        profiles=profiles)
+        except Exception as e:
+            return [{
+                "symbol": symbol,
+                "charts_status": "error",
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            } for symbol in symbols]
+        
+        results = []
+        for chart_result in chart_results:
+            result = {
+                "symbol": chart_result["symbol"],
+                "charts_status": chart_result["status"],
+                "charts": len(chart_result["charts"]),
+                "timestamp": chart_result["timestamp"]
+            }
+            if chart_result["status"] != "success":
+                result["error"] = "; ".join(
+                    group["error"] for group in chart_result["groups"].values() if group["status"] == "error"
                 )
-                
-                results.append({
-                    "symbol": symbol,
-                    "charts_status": "success" if chart_result.returncode == 0 else "error",
-                    "timestamp": datetime.now().isoformat()
-                })
-                
-            except Exception as e:
-                results.append({
-                    "symbol": symbol,
-                    "charts_status": "error",
-                    "error": str(e),
-                    "timestamp": datetime.now().isoformat()
-                })
+            results.append(result)
         
         return results
     
@@ -219,8 +220,8 @@ class MultiStockUpdater:
         update_results = self.update_all_stocks(parallel=True)
         self.print_summary(update_results, "Data Update")
         
-        # Then generate charts
-        analysis_results = self.generate_full_analysis()
+        # Then generate charts (dashboard previews only during the session)
+        analysis_results = self.generate_full_analysis(profiles=INTRADAY_PROFILES)
         self.print_summary(analysis_results, "Chart Generation")
     
     def daily_report_job(self):
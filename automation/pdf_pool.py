@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+PDF Pool - Dựng PDF từ báo cáo HTML trên các tiến trình WeasyPrint sống lâu
+
+Mỗi worker nạp WeasyPrint, cấu hình font (FontConfiguration) và stylesheet mặc
+định một lần khi khởi động rồi dùng lại cho mọi báo cáo; ảnh đã giải mã được
+cache trong worker suốt một lượt dựng. Các mã được dựng song song.
+
+Báo cáo có HTML và các file mà HTML tham chiếu (ảnh biểu đồ, CSS) không đổi so
+với lần dựng trước được bỏ qua: khóa nội dung của từng mã được lưu trong
+pdf_reports/.pdf_manifest.json cùng đường dẫn PDF đã tạo.
+
+Sử dụng:
+    from pdf_pool import PDFBuildPool
+    with PDFBuildPool(max_workers=4) as pool:
+        results = pool.build({"VIC": Path("stock_analysis/VIC/reports/VIC_enhanced_analysis_report.html")})
+"""
+
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import unquote, urlparse
+
+MANIFEST_NAME = ".pdf_manifest.json"
+
+# Tăng khi cách dựng PDF thay đổi để mọi báo cáo được dựng lại
+PDF_BUILD_VERSION = 1
+
+_RESOURCE_REF = re.compile(r"""(?:src|href)\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+
+# Trạng thái WeasyPrint trong tiến trình: font, tùy chọn write_pdf, cache ảnh của lượt dựng hiện tại
+_renderer: Dict[str, Any] = {}
+
+
+def _init_renderer() -> None:
+    """Nạp WeasyPrint, font và stylesheet mặc định (một lần cho mỗi tiến trình)"""
+    if _renderer:
+        return
+    import weasyprint
+    from weasyprint.text.fonts import FontConfiguration
+
+    font_config = FontConfiguration()
+    # Tên tham số cache ảnh khác nhau giữa các phiên bản WeasyPrint
+    parameters = inspect.signature(weasyprint.HTML.write_pdf).parameters
+    cache_option = "image_cache" if "image_cache" in parameters else "cache"
+
+    # Render thử một trang để fontconfig/pango và stylesheet mặc định được nạp sẵn
+    weasyprint.HTML(string="<p>warm up</p>").render(font_config=font_config)
+
+    _renderer.update(weasyprint=weasyprint, font_config=font_config, cache_option=cache_option,
+                     image_cache={}, batch=None)
+
+
+def html_digest(html_file: Union[str, Path]) -> str:
+    """
+    Khóa nội dung của một báo cáo: HTML cùng mọi file cục bộ mà nó tham chiếu
+
+    Args:
+        html_file: File HTML
+
+    Returns:
+        Chuỗi hex của hash
+    """
+    html_file = Path(html_file)
+    content = html_file.read_bytes()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{PDF_BUILD_VERSION}".encode())
+    digest.update(content)
+
+    seen = set()
+    for ref in _RESOURCE_REF.findall(content.decode("utf-8", errors="ignore")):
+        url = urlparse(ref)
+        if url.scheme or url.netloc or not url.path or ref.startswith("#"):
+            continue  # data:, http(s): và liên kết trong trang không phải file cục bộ
+        path = (html_file.parent / unquote(url.path)).resolve()
+        if path in seen:
+            continue
+        seen.add(path)
+        digest.update(str(path).encode("utf-8"))
+        if path.is_file():
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+def write_pdf(html_file: Union[str, Path], pdf_file: Union[str, Path], batch: Optional[str] = None) -> Path:
+    """
+    Dựng PDF từ file HTML bằng WeasyPrint đã nạp sẵn (ghi tạm rồi đổi tên)
+
+    Args:
+        html_file: File HTML (đường dẫn tương đối trong HTML tính theo thư mục của file)
+        pdf_file: File PDF cần ghi
+        batch: Mã lượt dựng; cache ảnh được dùng lại trong cùng một lượt
+
+    Returns:
+        Đường dẫn PDF
+    """
+    _init_renderer()
+    if batch is None or batch != _renderer["batch"]:
+        # Ảnh không có hash trong tên có thể đã được vẽ lại giữa hai lượt
+        _renderer.update(image_cache={}, batch=batch)
+
+    html_file = Path(html_file)
+    pdf_file = Path(pdf_file)
+    pdf_file.parent.mkdir(parents=True, exist_ok=True)
+    options = {"font_config": _renderer["font_config"], _renderer["cache_option"]: _renderer["image_cache"]}
+
+    fd, tmp_path = tempfile.mkstemp(dir=pdf_file.parent, prefix=pdf_file.name, suffix=".tmp")
+    os.close(fd)
+    try:
+        _renderer["weasyprint"].HTML(filename=str(html_file), base_url=str(html_file.parent)).write_pdf(
+            tmp_path, **options)
+        os.replace(tmp_path, pdf_file)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return pdf_file
+
+
+def _build_task(symbol: str, html_file: str, pdf_file: str, batch: str) -> Dict[str, Any]:
+    """Dựng PDF của một mã trong worker"""
+    start_time = time.time()
+    result = {"symbol": symbol, "status": "success", "pdf_file": pdf_file}
+    try:
+        write_pdf(html_file, pdf_file, batch)
+    except Exception as e:
+        result.update(status="error", error=str(e))
+    result["duration"] = time.time() - start_time
+    return result
+
+
+class PDFManifest:
+    """
+    Khóa nội dung và PDF đã dựng của từng mã, đọc/ghi từ pdf_reports/.pdf_manifest.json
+    """
+
+    def __init__(self, pdf_dir: Union[str, Path]):
+        self.pdf_dir = Path(pdf_dir)
+        self.path = self.pdf_dir / MANIFEST_NAME
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries: Dict[str, Dict[str, Any]] = json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def fresh_pdf(self, symbol: str, key: str) -> Optional[Path]:
+        """PDF đã dựng với cùng khóa nếu file vẫn còn"""
+        entry = self.entries.get(symbol)
+        if not entry or entry.get("key") != key:
+            return None
+        pdf_file = Path(entry["pdf"])
+        return pdf_file if pdf_file.exists() else None
+
+    def record(self, symbol: str, key: str, pdf_file: Union[str, Path]) -> None:
+        self.entries[symbol] = {"key": key, "pdf": str(pdf_file), "built_at": datetime.now().isoformat()}
+
+    def save(self) -> None:
+        """Ghi manifest (ghi tạm rồi đổi tên)"""
+        self.pdf_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.pdf_dir, prefix=MANIFEST_NAME, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"entries": self.entries}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def pdf_path(pdf_dir: Union[str, Path], symbol: str) -> Path:
+    """Tên file PDF mới của một mã (có dấu thời gian như các bản trước)"""
+    return Path(pdf_dir) / f"{symbol}_analysis_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+
+
+class PDFBuildPool:
+    """
+    Pool tiến trình WeasyPrint, dùng lại được cho nhiều lượt dựng
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, pdf_dir: Union[str, Path] = "pdf_reports"):
+        """
+        Khởi tạo pool (các worker được tạo khi có việc đầu tiên)
+
+        Args:
+            max_workers: Số tiến trình dựng PDF (mặc định số lõi CPU)
+            pdf_dir: Thư mục lưu PDF và manifest
+        """
+        self.pdf_dir = Path(pdf_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # spawn: worker không kế thừa trạng thái cairo/pango của tiến trình cha
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_renderer,
+        )
+
+    def build(self, reports: Dict[str, Union[str, Path]], force: bool = False) -> List[Dict[str, Any]]:
+        """
+        Dựng PDF cho nhiều mã, bỏ qua báo cáo không đổi
+
+        Args:
+            reports: Mã -> file HTML báo cáo
+            force: Dựng lại kể cả khi nội dung không đổi
+
+        Returns:
+            Danh sách dict theo thứ tự các mã gồm symbol, status ('success',
+            'skipped' hoặc 'error'), pdf_file, duration, error nếu có lỗi
+        """
+        manifest = PDFManifest(self.pdf_dir)
+        batch = f"{os.getpid()}-{time.time()}"
+        results: Dict[str, Dict[str, Any]] = {}
+        futures = {}
+
+        for symbol, html_file in reports.items():
+            html_file = Path(html_file)
+            if not html_file.exists():
+                results[symbol] = {"symbol": symbol, "status": "error", "duration": 0.0,
+                                   "error": f"HTML report not found: {html_file}"}
+                continue
+
+            key = html_digest(html_file)
+            existing = None if force else manifest.fresh_pdf(symbol, key)
+            if existing is not None:
+                results[symbol] = {"symbol": symbol, "status": "skipped", "pdf_file": str(existing),
+                                   "duration": 0.0}
+                continue
+
+            future = self._executor.submit(_build_task, symbol, str(html_file),
+                                           str(pdf_path(self.pdf_dir, symbol)), batch)
+            futures[future] = (symbol, key)
+
+        for future in as_completed(futures):
+            symbol, key = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker bị dừng đột ngột (vd. hết bộ nhớ)
+                result = {"symbol": symbol, "status": "error", "duration": 0.0, "error": str(e)}
+            if result["status"] == "success":
+                manifest.record(symbol, key, result["pdf_file"])
+            results[symbol] = result
+
+        if futures:
+            try:
+                manifest.save()
+            except OSError as e:
+                print(f"Warning: could not save PDF manifest: {e}")
+
+        return [results[symbol] for symbol in reports]
+
+    def close(self) -> None:
+        """Dừng các worker"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "PDFBuildPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -8,9 +8,15 @@ import sys
 import json
 import shutil
 import argparse
+import numpy as np
 from pathlib import Path
 from datetime import datetime
 
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+from panel import Panel
+from tick_store import TickStore
+
 class PortfolioManager:
     def __init__(self):
         self.base_dir = Path("stock_analysis")
@@ -79,6 +85,10 @@ import sys
 import codecs
 from datetime import datetime
 import numpy as np
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from tick_store import load_intraday_payload
 
 sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer)
 
@@ -92,8 +102,7 @@ def analyze_{symbol_lower}_data():
         balance_sheet_data = None
     
     try:
-        with open("stock_analysis/{symbol_upper}/data/{symbol_upper}_intraday_data.json", "r", encoding="utf-8") as f:
-            intraday_data = json.load(f)
+        intraday_data = load_intraday_payload("{symbol_upper}")
     except FileNotFoundError:
         intraday_data = None
 
@@ -167,131 +176,40 @@ if __name__ == "__main__":
         with open(stock_dir / f"analyze_{symbol_lower}_data.py", 'w', encoding='utf-8') as f:
             f.write(analyze_script)
         
-        # Create charts script
-        charts_script = f"""import json
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from pathlib import Path
-
-def create_{symbol_lower}_charts():
-    \"\"\"Tạo biểu đồ phân tích cho {symbol_upper}.\"\"\"
-    # Create directories
-    Path("stock_analysis/{symbol_upper}/charts/key_charts").mkdir(parents=True, exist_ok=True)
-    Path("stock_analysis/{symbol_upper}/charts/detailed_charts").mkdir(parents=True, exist_ok=True)
-
-    # Load data
-    try:
-        with open("stock_analysis/{symbol_upper}/data/{symbol_upper}_balance_sheet.json", "r", encoding="utf-8") as f:
-            balance_sheet_data = json.load(f)
-    except FileNotFoundError:
-        balance_sheet_data = None
-        
-    try:
-        with open("stock_analysis/{symbol_upper}/data/{symbol_upper}_intraday_data.json", "r", encoding="utf-8") as f:
-            intraday_data = json.load(f)
-    except FileNotFoundError:
-        intraday_data = None
-        
-    try:
-        with open("stock_analysis/{symbol_upper}/data/{symbol_upper}_income_statement.json", "r", encoding="utf-8") as f:
-            income_statement_data = json.load(f)
-    except FileNotFoundError:
-        income_statement_data = None
-        
-    try:
-        with open("stock_analysis/{symbol_upper}/data/{symbol_upper}_financial_ratios.json", "r", encoding="utf-8") as f:
-            financial_ratios_data = json.load(f)
-    except FileNotFoundError:
-        financial_ratios_data = None
-
-    # Create charts
-    if intraday_data:
-        create_price_chart(intraday_data)
-        create_volume_chart(intraday_data)
-        create_buy_sell_chart(intraday_data)
-    
-    if balance_sheet_data:
-        create_financial_charts(balance_sheet_data)
-    
-    print("✅ Charts created for {symbol_upper}")
-
-def create_price_chart(intraday_data):
-    \"\"\"Tạo biểu đồ giá trong ngày.\"\"\"
-    if not intraday_data or 'data' not in intraday_data or not intraday_data['data']:
-        return
-
-    df = pd.DataFrame(intraday_data['data'])
-    df['time'] = pd.to_datetime(df['time'])
-    df = df.sort_values('time')
-
-    plt.figure(figsize=(12, 6))
-    plt.plot(df['time'], df['price'], label='Giá')
-    plt.title('Biểu đồ giá trong ngày của {symbol_upper}')
-    plt.xlabel('Thời gian')
-    plt.ylabel('Giá')
-    plt.legend()
-    plt.grid(True)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig("stock_analysis/{symbol_upper}/charts/key_charts/price_trend.png")
-    plt.close()
+        # Create chart scripts (thin wrappers around chart_engine)
+        chart_scripts = {
+            f"create_{symbol_lower}_charts.py": ("key", f"create_{symbol_lower}_charts"),
+            f"create_enhanced_{symbol_lower}_charts.py": ("technical", f"create_enhanced_{symbol_lower}_charts"),
+            "create_additional_charts.py": ("additional", "create_additional_charts"),
+        }
+        
+        for filename, (group, function_name) in chart_scripts.items():
+            charts_script = f"""#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+\"\"\"
+{symbol_upper} Charts - biểu đồ được tạo bởi chart_engine (nhóm "{group}")
+\"\"\"
 
-def create_volume_chart(intraday_data):
-    \"\"\"Tạo biểu đồ khối lượng giao dịch.\"\"\"
-    if not intraday_data or 'data' not in intraday_data or not intraday_data['data']:
-        return
-
-    df = pd.DataFrame(intraday_data['data'])
-    df['time'] = pd.to_datetime(df['time'])
-    df['hour'] = df['time'].dt.hour
-    volume_by_hour = df.groupby('hour')['volume'].sum()
-
-    plt.figure(figsize=(12, 6))
-    volume_by_hour.plot(kind='bar', title='Khối lượng giao dịch theo giờ - {symbol_upper}')
-    plt.xlabel('Giờ')
-    plt.ylabel('Khối lượng')
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig("stock_analysis/{symbol_upper}/charts/key_charts/volume_by_hour.png")
-    plt.close()
+import os
+import sys
 
-def create_buy_sell_chart(intraday_data):
-    \"\"\"Tạo biểu đồ mua/bán.\"\"\"
-    if not intraday_data or 'data' not in intraday_data or not intraday_data['data']:
-        return
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from chart_engine import render_charts
 
-    df = pd.DataFrame(intraday_data['data'])
-    buy_volume = df[df['match_type'] == 'Buy']['volume'].sum()
-    sell_volume = df[df['match_type'] == 'Sell']['volume'].sum()
 
-    plt.figure(figsize=(8, 8))
-    plt.pie([buy_volume, sell_volume], labels=['Mua', 'Bán'], autopct='%1.1f%%', startangle=90)
-    plt.title('Tỷ lệ khối lượng Mua vs. Bán - {symbol_upper}')
-    plt.savefig("stock_analysis/{symbol_upper}/charts/key_charts/buy_vs_sell.png")
-    plt.close()
+def {function_name}():
+    \"\"\"Tạo biểu đồ nhóm {group} cho {symbol_upper}.\"\"\"
+    result = render_charts("{symbol_upper}", ["{group}"])
+    print(f"{symbol_upper} ({group}): {{result['status']}} - {{len(result['charts'])}} charts")
+    return result
 
-def create_financial_charts(balance_sheet_data):
-    \"\"\"Tạo biểu đồ tài chính thực sự cho {symbol_upper}.\"\"\"
-    # Import template function
-    import sys
-    import os
-    sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'chart_templates'))
-    from financial_chart_template import create_real_financial_chart
-    
-    # Use real financial chart template
-    output_path = "stock_analysis/{symbol_upper}/charts/detailed_charts/financial_analysis.png"
-    success = create_real_financial_chart(balance_sheet_data, "{symbol_upper}", output_path)
-    
-    if not success:
-        print("{symbol_upper}: No financial chart created - insufficient data")
 
 if __name__ == "__main__":
-    create_{symbol_lower}_charts()
+    {function_name}()
 """
-        
-        with open(stock_dir / f"create_{symbol_lower}_charts.py", 'w', encoding='utf-8') as f:
-            f.write(charts_script)
+            
+            with open(stock_dir / filename, 'w', encoding='utf-8') as f:
+                f.write(charts_script)
         
         print(f"Created analysis scripts for {symbol}")
     
@@ -370,13 +288,12 @@ if __name__ == "__main__":
             status = "ACTIVE" if stock in active else "Available"
             
             # Check data freshness
-            data_file = self.base_dir / stock / "data" / f"{stock}_intraday_data.json"
-            if data_file.exists():
+            store = TickStore(self.base_dir)
+            if store.has_ticks(stock):
                 try:
-                    with open(data_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        timestamp = data.get('timestamp', 'Unknown')
-                        data_points = data.get('data_points', 0)
+                    data = store.load_meta(stock) or store.load_intraday_payload(stock)
+                    timestamp = data.get('timestamp', 'Unknown')
+                    data_points = data.get('data_points', 0)
                     
                     print(f"{status} {stock} - {data_points:,} points (Updated: {timestamp})")
                 except:
@@ -386,6 +303,37 @@ if __name__ == "__main__":
         
         print(f"\nActive stocks: {len(active)}/{len(available)}")
     
+    def portfolio_report(self, source="daily"):
+        """Portfolio analytics for all active stocks, computed on one multi-symbol panel"""
+        symbols = self.get_active_stocks() or self.get_available_stocks()
+        panel = Panel.load(symbols, source=source, base_dir=self.base_dir)
+        report = panel.to_dict()
+        report["generated_at"] = datetime.now().isoformat()
+        
+        summary = panel.summary()
+        print(f"Portfolio Analytics ({len(symbols)} stocks, {source})")
+        print("=" * 60)
+        for symbol, row in summary.iterrows():
+            if row.isna().all():
+                print(f"{symbol:<6} No price data")
+                continue
+            print(f"{symbol:<6} {row['last_price']:>10,.2f}  {row['change_pct']:+7.2f}%  "
+                  f"vol {row['volatility_pct']:6.2f}%  RS {row['relative_strength']:.2f}  beta {row['beta']:.2f}")
+        
+        correlation = panel.correlation()
+        pairs = correlation.where(np.triu(np.ones(correlation.shape, dtype=bool), k=1)).stack()
+        if not pairs.empty:
+            print("\nMost correlated pairs:")
+            for (a, b), value in pairs.sort_values(ascending=False).head(5).items():
+                print(f"  {a}-{b}: {value:.2f}")
+        
+        report_file = Path("enhanced_reports") / "portfolio_analytics.json"
+        report_file.parent.mkdir(exist_ok=True)
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nPortfolio analytics saved: {report_file}")
+        return report
+    
     def create_report_template(self, symbol):
         """Create HTML report template for the stock"""
         symbol = symbol.upper()
@@ -503,6 +451,8 @@ def main():
     parser.add_argument('--list', action='store_true', help='List all stocks and status')
     parser.add_argument('--structure', metavar='SYMBOL', help='Create directory structure for stock')
     parser.add_argument('--config', action='store_true', help='Show current configuration')
+    parser.add_argument('--report', action='store_true', help='Portfolio analytics (correlation, relative strength, peers)')
+    parser.add_argument('--source', choices=['daily', 'intraday'], default='daily', help='Price source for --report')
     
     args = parser.parse_args()
     manager = PortfolioManager()
@@ -537,6 +487,9 @@ def main():
     elif args.list:
         manager.list_stocks()
         
+    elif args.report:
+        manager.portfolio_report(args.source)
+        
     elif args.config:
         if manager.config_file.exists():
             with open(manager.config_file, 'r', encoding='utf-8') as f:
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Report Environment - Jinja Environment dùng chung cho các báo cáo HTML/PDF
+
+Template nằm trong automation/report_templates/ và được biên dịch một lần cho
+mỗi tiến trình; bytecode đã biên dịch được lưu trong
+automation/report_templates/__pycache__/ nên các tiến trình sau (vd. lần tạo
+báo cáo 15:30) không phải parse lại template.
+
+Sử dụng:
+    from report_environment import render_template
+    html = render_template("enhanced_report.html", data=data, charts=charts)
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+TEMPLATE_DIR = Path(__file__).parent / "report_templates"
+
+BYTECODE_CACHE_DIR = TEMPLATE_DIR / "__pycache__"
+
+_environment: Optional[Environment] = None
+_environment_lock = threading.Lock()
+
+
+def get_environment() -> Environment:
+    """Environment dùng chung (tạo khi gọi lần đầu, an toàn khi gọi từ nhiều thread)"""
+    global _environment
+    if _environment is None:
+        with _environment_lock:
+            if _environment is None:
+                BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                _environment = Environment(
+                    loader=FileSystemLoader(str(TEMPLATE_DIR), encoding="utf-8"),
+                    bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR)),
+                    # Template chỉ đổi khi triển khai mã mới, không cần kiểm tra mtime mỗi lần render
+                    auto_reload=False,
+                )
+    return _environment
+
+
+def get_template(name: str) -> Template:
+    """Template đã biên dịch theo tên file trong TEMPLATE_DIR"""
+    return get_environment().get_template(name)
+
+
+def render_template(name: str, **context: Any) -> str:
+    """
+    Render một template báo cáo
+
+    Args:
+        name: Tên file template trong TEMPLATE_DIR
+        **context: Biến truyền vào template
+
+    Returns:
+        Chuỗi HTML
+    """
+    return get_template(name).render(**context)
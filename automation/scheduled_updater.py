@@ -22,6 +22,10 @@ from pathlib import Path
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+sys.path.append(str(Path(__file__).parent.parent))
+from update_pipeline import update_symbol
+from eod_rollup import rollup
+
 class ScheduledStockUpdater:
     def __init__(self):
         self.base_dir = Path(__file__).parent.parent
@@ -77,8 +81,19 @@ class ScheduledStockUpdater:
             start_time = time.time()
             
             if mode == 'quick':
-                # Quick update - chỉ cập nhật dữ liệu
-                cmd = [sys.executable, 'quick_update.py', symbol]
+                # Quick update - chỉ cập nhật dữ liệu, chạy ngay trong tiến trình
+                result = update_symbol(symbol, mode='quick')
+                if result['status'] == 'success':
+                    self.logger.info(f"SUCCESS {symbol} updated successfully ({mode}) - {result['duration']:.1f}s")
+                else:
+                    self.logger.error(f"ERROR {symbol} failed ({mode}): {result.get('error')}")
+                return {
+                    'symbol': symbol,
+                    'status': 'success' if result['status'] == 'success' else 'failed',
+                    'duration': result['duration'],
+                    'appended': result['appended'],
+                    'error': result.get('error')
+                }
             elif mode == 'smart':
                 # Smart analysis - 3 biểu đồ cốt lõi
                 cmd = [sys.executable, 'automation/smart_analysis.py', symbol]
@@ -190,12 +205,24 @@ class ScheduledStockUpdater:
         
         results = self.run_parallel_updates(mode='smart')
         
+        # Gộp tick trong ngày vào giá lịch sử
+        self.run_eod_rollup([r['symbol'] for r in results if r['status'] == 'success'])
+        
         # Tạo báo cáo cuối ngày
         if self.config['notification']['success_summary']:
             self.generate_daily_summary(results)
         
         self.logger.info("✅ 15:00 PM Update Completed")
     
+    def run_eod_rollup(self, symbols):
+        """Gộp tick của ngày vào giá lịch sử và nén tick các ngày cũ"""
+        for result in rollup(symbols):
+            if result['status'] == 'success':
+                self.logger.info(f"📦 EOD rollup {result['symbol']}: {', '.join(result['days']) or 'no closed days'}"
+                                 f", archived {len(result['archived'])} days")
+            else:
+                self.logger.error(f"❌ EOD rollup failed for {result['symbol']}: {result['error']}")
+    
     def generate_daily_summary(self, results):
         """Tạo báo cáo tóm tắt cuối ngày"""
         try:
@@ -18,6 +18,12 @@ import sys
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
+from update_pipeline import update, update_symbol
+from eod_rollup import rollup
+from chart_engine import ChartRenderPool, render_charts
+from chart_engine.output import INTRADAY_PROFILES
+from enhanced_report_generator import render_reports
+from static_assets import precompress_tree
 
 # Setup logging
 logging.basicConfig(
@@ -36,6 +42,7 @@ class VNStockScheduler:
         self.base_dir = Path(__file__).parent.parent
         self.load_config()
         self.running = False
+        self.chart_pool = None
         
     def load_config(self):
         """Load configuration from JSON file"""
@@ -116,27 +123,38 @@ class VNStockScheduler:
     
     def update_single_stock(self, symbol):
         """Update data for a single stock"""
-        command = f"python quick_update.py {symbol}"
-        return self.run_command(command, timeout=90)
+        result = update_symbol(symbol, mode="quick")
+        if result['status'] == 'success':
+            logger.info(f"Updated {symbol}: +{result['appended']} ticks in {result['duration']:.1f}s")
+            return True
+        logger.error(f"Update failed for {symbol}: {result.get('error')}")
+        return False
     
     def full_analysis_single_stock(self, symbol):
         """Run full analysis for a single stock"""
-        commands = [
-            f"python quick_update.py {symbol}",
-            f"python stock_analysis/{symbol}/analysis/create_{symbol.lower()}_charts.py",
-            f"python stock_analysis/{symbol}/analysis/create_enhanced_{symbol.lower()}_charts.py",
-            f"python stock_analysis/{symbol}/analysis/create_financial_charts.py",
-            f"python stock_analysis/{symbol}/analysis/create_additional_charts.py"
-        ]
-        
-        success_count = 0
-        for command in commands:
-            if self.run_command(command, timeout=180):
+        data_success = self.update_single_stock(symbol)
+        return self.log_analysis_result(render_charts(symbol), data_success)
+    
+    def log_analysis_result(self, result, data_success):
+        """Log chart results of a full analysis, return True if more than half of the steps succeeded"""
+        symbol = result['symbol']
+        success_count = 1 if data_success else 0
+        for group, status in result['groups'].items():
+            if status['status'] == 'success':
                 success_count += 1
-            time.sleep(5)  # Wait between commands
+            else:
+                logger.error(f"Chart group {group} failed for {symbol}: {status.get('error')}")
         
-        logger.info(f"Full analysis for {symbol}: {success_count}/{len(commands)} commands successful")
-        return success_count > len(commands) // 2  # Success if more than half succeed
+        total = len(result['groups']) + 1
+        logger.info(f"Full analysis for {symbol}: {success_count}/{total} steps successful "
+                    f"({len(result['charts'])} charts rendered, {len(result['skipped'])} unchanged)")
+        return success_count > total // 2  # Success if more than half succeed
+    
+    def get_chart_pool(self):
+        """Long-lived chart rendering pool (workers keep matplotlib loaded between runs)"""
+        if self.chart_pool is None:
+            self.chart_pool = ChartRenderPool(max_workers=self.config.get('chart_workers'))
+        return self.chart_pool
     
     def quick_update_all(self):
         """Quick update for all active stocks"""
@@ -147,14 +165,14 @@ class VNStockScheduler:
         logger.info("Starting quick update for all stocks")
         active_stocks = self.config.get('active_stocks', [])
         
+        results = update(active_stocks, mode="quick", max_workers=self.config.get('parallel_workers', 3))
+        
         success_count = 0
-        for symbol in active_stocks:
-            try:
-                if self.update_single_stock(symbol):
-                    success_count += 1
-                time.sleep(10)  # Wait 10 seconds between updates
-            except Exception as e:
-                logger.error(f"Error updating {symbol}: {e}")
+        for result in results:
+            if result['status'] == 'success':
+                success_count += 1
+            else:
+                logger.error(f"Error updating {result['symbol']}: {result.get('error')}")
         
         logger.info(f"Quick update completed: {success_count}/{len(active_stocks)} successful")
     
@@ -163,21 +181,26 @@ class VNStockScheduler:
         logger.info("Starting full analysis for all stocks")
         active_stocks = self.config.get('active_stocks', [])
         
+        try:
+            update_results = update(active_stocks, mode="quick", max_workers=self.config.get('parallel_workers', 3))
+            data_success = {result['symbol']: result['status'] == 'success' for result in update_results}
+            for result in update_results:
+                if result['status'] != 'success':
+                    logger.error(f"Update failed for {result['symbol']}: {result.get('error')}")
+            
+            # Every (symbol, chart) pair is rendered in parallel across the pool; intraday runs
+            # only refresh the small preview assets, print-quality charts are made for reports
+            chart_results = self.get_chart_pool().render(active_stocks, profiles=INTRADAY_PROFILES)
+        except Exception as e:
+            logger.error(f"Error in full analysis: {e}")
+            return
+        
         success_count = 0
-        for symbol in active_stocks:
-            try:
-                logger.info(f"Starting full analysis for {symbol}")
-                if self.full_analysis_single_stock(symbol):
-                    success_count += 1
-                    logger.info(f"Full analysis completed for {symbol}")
-                else:
-                    logger.warning(f"Full analysis partially failed for {symbol}")
-                
-                # Wait between stocks to prevent system overload
-                time.sleep(30)
-                
-            except Exception as e:
-                logger.error(f"Error in full analysis for {symbol}: {e}")
+        for result in chart_results:
+            if self.log_analysis_result(result, data_success.get(result['symbol'], False)):
+                success_count += 1
+            else:
+                logger.warning(f"Full analysis partially failed for {result['symbol']}")
         
         logger.info(f"Full analysis completed: {success_count}/{len(active_stocks)} successful")
     
@@ -185,8 +208,30 @@ class VNStockScheduler:
         """Generate daily reports"""
         logger.info("Generating daily reports")
         try:
-            # Run comprehensive analysis
-            self.run_command("python automation/comprehensive_stock_analysis.py", timeout=300)
+            # Gộp tick trong ngày vào giá lịch sử trước khi tạo báo cáo
+            for result in rollup(self.config.get('active_stocks', [])):
+                if result['status'] == 'success':
+                    logger.info(f"EOD rollup {result['symbol']}: {', '.join(result['days']) or 'no closed days'}"
+                                f", archived {len(result['archived'])} days")
+                else:
+                    logger.error(f"EOD rollup failed for {result['symbol']}: {result['error']}")
+            
+            # Print-quality charts for the reports (unchanged charts are skipped by the render cache)
+            active_stocks = self.config.get('active_stocks', [])
+            for result in self.get_chart_pool().render(active_stocks):
+                if result['status'] != 'success':
+                    logger.warning(f"Chart rendering partially failed for {result['symbol']}")
+            
+            # Every report in one pass: shared peer panel, pre-compiled template, parallel rendering
+            for result in render_reports(active_stocks, max_workers=self.config.get('parallel_workers', 3)):
+                if result['status'] == 'success':
+                    logger.info(f"Report {result['symbol']}: {result['recommendation']} "
+                                f"({result['duration']:.1f}s)")
+                else:
+                    logger.error(f"Report failed for {result['symbol']}: {result['error']}")
+            
+            # .br/.gz siblings of */reports and */charts for the dashboard's static file route
+            logger.info(f"Precompressed {len(precompress_tree())} static files")
             
             # Generate portfolio report if available
             if Path("automation/portfolio_manager.py").exists():
@@ -239,9 +284,7 @@ class VNStockScheduler:
             # Update all stock data regardless of market hours
             logger.info("Weekend data refresh")
             active_stocks = self.config.get('active_stocks', [])
-            for symbol in active_stocks:
-                self.update_single_stock(symbol)
-                time.sleep(5)
+            update(active_stocks, mode="quick", max_workers=self.config.get('parallel_workers', 3))
             
             logger.info("Weekend maintenance completed")
             
@@ -270,6 +313,9 @@ class VNStockScheduler:
             logger.error(f"Scheduler error: {e}")
         finally:
             self.running = False
+            if self.chart_pool is not None:
+                self.chart_pool.close()
+                self.chart_pool = None
             logger.info("VNStock Scheduler Service stopped")
     
     def stop(self):
@@ -4,18 +4,28 @@ VHM Comprehensive Report Generator with 18 Charts
 Tạo báo cáo HTML hoàn chỉnh cho VHM với tất cả 18 biểu đồ
 """
 
-import json
+import argparse
 import pandas as pd
-import base64
 from pathlib import Path
 from datetime import datetime
+import sys
 
-def create_vhm_comprehensive_report():
-    """Tạo báo cáo HTML hoàn chỉnh cho VHM"""
+sys.path.append(str(Path(__file__).parent.parent))
+from report_assets import ASSET_MODES, ChartAssets
+from static_assets import precompress
+from tick_store import load_intraday_payload
+
+def create_vhm_comprehensive_report(asset_mode=None):
+    """
+    Tạo báo cáo HTML hoàn chỉnh cho VHM
+    
+    Args:
+        asset_mode: 'reference' (ảnh có hash, tải lười - mặc định) hoặc
+            'inline' (nhúng base64 để xuất một file HTML duy nhất)
+    """
     
     # Load data
-    with open("stock_analysis/VHM/data/VHM_intraday_data.json", "r", encoding="utf-8") as f:
-        intraday_data = json.load(f)
+    intraday_data = load_intraday_payload("VHM")
     
     df = pd.DataFrame(intraday_data['data'])
     
@@ -32,11 +42,13 @@ def create_vhm_comprehensive_report():
     sell_volume = df[df['match_type'] == 'Sell']['volume'].sum()
     buy_sell_ratio = buy_volume / sell_volume if sell_volume > 0 else 0
     
-    # Convert charts to base64
+    # Ảnh biểu đồ: file có hash nội dung (hoặc base64 khi xuất một file)
+    assets = ChartAssets("VHM", mode=asset_mode)
+    lazy = assets.img_attrs()
+    
     def encode_chart(chart_path):
         if Path(chart_path).exists():
-            with open(chart_path, "rb") as f:
-                return base64.b64encode(f.read()).decode()
+            return assets.src(chart_path)
         return ""
     
     # Chart paths
@@ -253,7 +265,7 @@ def create_vhm_comprehensive_report():
             
             <div class="chart-container">
                 <h3>1. Biến động giá VHM trong ngày</h3>
-                <img src="data:image/png;base64,{charts['price_trend']}" alt="Price Trend">
+                <img src="{charts['price_trend']}"{lazy} alt="Price Trend">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Giá VHM dao động từ {lowest_price:.2f} - {highest_price:.2f} VND. Cổ phiếu có xu hướng tăng mạnh từ đầu phiên, đạt đỉnh vào giữa ngày và có sự điều chỉnh nhẹ về cuối phiên.</p>
                 </div>
@@ -261,7 +273,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>2. Khối lượng giao dịch theo giờ</h3>
-                <img src="data:image/png;base64,{charts['volume_by_hour']}" alt="Volume by Hour">
+                <img src="{charts['volume_by_hour']}"{lazy} alt="Volume by Hour">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Khối lượng giao dịch tập trung mạnh vào giờ 13h (2.49 triệu cổ phiếu) và 11h (2.28 triệu cổ phiếu). Điều này cho thấy sự quan tâm cao của nhà đầu tư trong khung thời gian này.</p>
                 </div>
@@ -269,7 +281,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>3. Tỷ lệ mua/bán</h3>
-                <img src="data:image/png;base64,{charts['buy_vs_sell']}" alt="Buy vs Sell">
+                <img src="{charts['buy_vs_sell']}"{lazy} alt="Buy vs Sell">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Tỷ lệ mua chiếm 56.3% ({buy_volume:,.0f} cổ phiếu) so với bán 43.7% ({sell_volume:,.0f} cổ phiếu). Tỷ lệ mua/bán {buy_sell_ratio:.2f} cho thấy tâm lý thị trường tích cực nhưng không quá mạnh.</p>
                 </div>
@@ -282,7 +294,7 @@ def create_vhm_comprehensive_report():
             
             <div class="chart-container">
                 <h3>4. Phân tích giá toàn diện với các chỉ báo</h3>
-                <img src="data:image/png;base64,{charts['comprehensive_price_analysis']}" alt="Comprehensive Price Analysis">
+                <img src="{charts['comprehensive_price_analysis']}"{lazy} alt="Comprehensive Price Analysis">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Giá VHM duy trì xu hướng tăng với MA5, MA10, MA20 đều hỗ trợ. Bollinger Bands cho thấy giá chạm mức upper band, cần chú ý tới khả năng điều chỉnh. RSI trong vùng quá mua (~70) cảnh báo áp lực bán.</p>
                 </div>
@@ -290,7 +302,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>5. Phân tích khối lượng chi tiết</h3>
-                <img src="data:image/png;base64,{charts['volume_analysis']}" alt="Volume Analysis">
+                <img src="{charts['volume_analysis']}"{lazy} alt="Volume Analysis">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Khối lượng giao dịch phân bố không đều trong ngày. Tương quan giá-khối lượng yếu (0.006) cho thấy thiếu sự đồng thuận mạnh mẽ từ thị trường.</p>
                 </div>
@@ -298,7 +310,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>6. Chỉ báo kỹ thuật</h3>
-                <img src="data:image/png;base64,{charts['technical_indicators']}" alt="Technical Indicators">
+                <img src="{charts['technical_indicators']}"{lazy} alt="Technical Indicators">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Bollinger Bands cho thấy giá di chuyển gần mức trên, RSI dao động mạnh trong ngày từ 30-100, hiện tại khoảng 70. Các đường MA hỗ trợ tốt cho xu hướng tăng.</p>
                 </div>
@@ -306,7 +318,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>7. Tâm lý thị trường</h3>
-                <img src="data:image/png;base64,{charts['market_sentiment']}" alt="Market Sentiment">
+                <img src="{charts['market_sentiment']}"{lazy} alt="Market Sentiment">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Bản đồ nhiệt giao dịch cho thấy hoạt động tập trung vào khung 11h-13h. Áp lực mua tích lũy mạnh hơn áp lực bán trong phiên.</p>
                 </div>
@@ -314,7 +326,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>8. Tóm tắt giao dịch</h3>
-                <img src="data:image/png;base64,{charts['trading_summary']}" alt="Trading Summary">
+                <img src="{charts['trading_summary']}"{lazy} alt="Trading Summary">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Tổng kết phiên giao dịch cho thấy VHM có hiệu suất tốt với xu hướng tăng, thanh khoản cao và tâm lý thị trường tích cực.</p>
                 </div>
@@ -327,7 +339,7 @@ def create_vhm_comprehensive_report():
             
             <div class="chart-container">
                 <h3>9. Dashboard sức khỏe tài chính</h3>
-                <img src="data:image/png;base64,{charts['financial_health_dashboard']}" alt="Financial Health Dashboard">
+                <img src="{charts['financial_health_dashboard']}"{lazy} alt="Financial Health Dashboard">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> VHM thể hiện sức khỏe tài chính vững mạnh với ROE 19.1%, ROA 12.1%, và tỷ lệ nợ/vốn chủ sở hữu 0.8. Các chỉ số đều ở mức tốt cho ngành bất động sản.</p>
                 </div>
@@ -335,7 +347,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>10. Phân tích khả năng sinh lời</h3>
-                <img src="data:image/png;base64,{charts['profitability_analysis']}" alt="Profitability Analysis">
+                <img src="{charts['profitability_analysis']}"{lazy} alt="Profitability Analysis">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Khả năng sinh lời của VHM cải thiện đáng kể qua các năm. ROE và ROA đều tăng trưởng ổn định, phản ánh hiệu quả quản lý vốn tốt.</p>
                 </div>
@@ -343,7 +355,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>11. Chỉ số đặc thù bất động sản</h3>
-                <img src="data:image/png;base64,{charts['real_estate_specific_metrics']}" alt="Real Estate Specific Metrics">
+                <img src="{charts['real_estate_specific_metrics']}"{lazy} alt="Real Estate Specific Metrics">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Doanh thu tăng trưởng 18.5%, hiệu suất tài sản và vòng quay tồn kho ổn định. Tỷ lệ nợ/vốn chủ sở hữu được kiểm soát tốt.</p>
                 </div>
@@ -351,7 +363,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>12. So sánh với đối thủ cạnh tranh</h3>
-                <img src="data:image/png;base64,{charts['peer_comparison']}" alt="Peer Comparison">
+                <img src="{charts['peer_comparison']}"{lazy} alt="Peer Comparison">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> VHM dẫn đầu ngành với ROE 19.1%, ROA 12.1%, vượt trội so với các đối thủ khác. Công ty thể hiện vị thế số 1 trong ngành bất động sản.</p>
                 </div>
@@ -359,7 +371,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>13. Xu hướng tài chính</h3>
-                <img src="data:image/png;base64,{charts['financial_trends']}" alt="Financial Trends">
+                <img src="{charts['financial_trends']}"{lazy} alt="Financial Trends">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Xu hướng tài chính tích cực với doanh thu và lợi nhuận tăng trưởng đều. Tài sản tăng trưởng ổn định, hiệu quả hoạt động cải thiện.</p>
                 </div>
@@ -372,7 +384,7 @@ def create_vhm_comprehensive_report():
             
             <div class="chart-container">
                 <h3>14. Phân tích price action</h3>
-                <img src="data:image/png;base64,{charts['price_action_analysis']}" alt="Price Action Analysis">
+                <img src="{charts['price_action_analysis']}"{lazy} alt="Price Action Analysis">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Mức hỗ trợ và kháng cự được xác định rõ ràng. Momentum giá tích cực, volatility kiểm soát tốt. Patterns cho thấy xu hướng tăng trung hạn.</p>
                 </div>
@@ -380,7 +392,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>15. Phân tích thanh khoản</h3>
-                <img src="data:image/png;base64,{charts['liquidity_analysis']}" alt="Liquidity Analysis">
+                <img src="{charts['liquidity_analysis']}"{lazy} alt="Liquidity Analysis">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Thanh khoản tốt với volume profile đều, VWAP hỗ trợ xu hướng giá. Bid-ask spread hẹp cho thấy tính thanh khoản cao.</p>
                 </div>
@@ -388,7 +400,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>16. Đánh giá rủi ro</h3>
-                <img src="data:image/png;base64,{charts['risk_assessment']}" alt="Risk Assessment">
+                <img src="{charts['risk_assessment']}"{lazy} alt="Risk Assessment">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> VaR 95% (-0.11%) và VaR 99% (-0.32%) cho thấy rủi ro thấp. Maximum drawdown -3.9% kiểm soát tốt. Sharpe ratio 0.04 cần cải thiện.</p>
                 </div>
@@ -396,7 +408,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>17. Phân tích vùng giao dịch</h3>
-                <img src="data:image/png;base64,{charts['trading_zones']}" alt="Trading Zones">
+                <img src="{charts['trading_zones']}"{lazy} alt="Trading Zones">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Vùng giao dịch tập trung vào khung 11h-13h. Tương quan giá-khối lượng yếu nhưng xu hướng tăng rõ ràng.</p>
                 </div>
@@ -404,7 +416,7 @@ def create_vhm_comprehensive_report():
 
             <div class="chart-container">
                 <h3>18. Dashboard hiệu suất tổng thể</h3>
-                <img src="data:image/png;base64,{charts['performance_dashboard']}" alt="Performance Dashboard">
+                <img src="{charts['performance_dashboard']}"{lazy} alt="Performance Dashboard">
                 <div class="chart-analysis">
                     <p><strong>Phân tích:</strong> Performance Score 58.4/100, Liquidity Score 51.2/100, Stability Score 90.1/100. Tổng thể VHM thể hiện độ ổn định cao nhưng cần cải thiện hiệu suất.</p>
                 </div>
@@ -468,12 +480,15 @@ def create_vhm_comprehensive_report():
 </html>
 """
 
+    assets.save()
+    
     # Save report
     report_path = "stock_analysis/VHM/reports/VHM_comprehensive_analysis_report.html"
     Path(report_path).parent.mkdir(parents=True, exist_ok=True)
     
     with open(report_path, "w", encoding="utf-8") as f:
         f.write(html_content)
+    precompress(report_path)
     
     print(f"Bao cao toan dien VHM da duoc tao: {report_path}")
     print(f"Tich hop thanh cong 18 bieu do phan tich")
@@ -482,4 +497,8 @@ def create_vhm_comprehensive_report():
     return report_path
 
 if __name__ == "__main__":
-    create_vhm_comprehensive_report()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="VHM Comprehensive Report Generator")
+    parser.add_argument("--asset-mode", choices=ASSET_MODES,
+                        help="reference: hashed chart files (default), inline: base64 single-file export")
+    args = parser.parse_args()
+    create_vhm_comprehensive_report(args.asset_mode)
\ No newline at end of file
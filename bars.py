@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Bars - Gộp tick thành nến OHLCV nhiều khung thời gian (1m/5m/15m/1h)
+
+Mỗi nến gồm open, high, low, close, volume, buy_volume, sell_volume, trades
+và value (tổng giá * khối lượng, dùng để tính VWAP). Mọi khung được tính trong
+một lượt vector hóa trên mảng tick và lưu cạnh dữ liệu tick:
+
+    stock_analysis/<SYMBOL>/data/bars/<YYYY-MM-DD>/<interval>.npz
+
+Mỗi file ghi kèm version và số tick của ngày mà nó được tính từ đó. Khi tick
+mới được nối vào store, chỉ các tick mới được gộp rồi ghép vào nến cuối cùng
+thay vì tính lại cả ngày.
+
+Sử dụng:
+    from bars import load_bars
+    df = load_bars("VIX", "5m")               # Ngày giao dịch gần nhất
+    df = load_bars("VIX", "1h", "2025-07-25")
+
+    python bars.py VIX VHM                    # Tính lại và ghi nến cho ngày gần nhất
+"""
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from tick_store import STOCK_ANALYSIS_DIR, TickStore
+
+# Tên khung -> độ dài (giây)
+BAR_INTERVALS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600}
+
+BAR_COLUMNS = ("time", "open", "high", "low", "close",
+               "volume", "buy_volume", "sell_volume", "trades", "value")
+
+# Tăng khi cách gộp thay đổi để tính lại các file đã lưu
+BAR_VERSION = 1
+
+
+def compute_bars(ticks: pd.DataFrame, interval: str = "5m") -> Dict[str, np.ndarray]:
+    """
+    Gộp tick thành nến của một khung thời gian
+
+    Args:
+        ticks: DataFrame tick (time, price, volume, match_type) sắp xếp theo thời gian
+        interval: Khung thời gian (một trong BAR_INTERVALS)
+
+    Returns:
+        Dict tên cột (BAR_COLUMNS) -> mảng, time là thời điểm bắt đầu nến (datetime64[s])
+    """
+    seconds = BAR_INTERVALS[interval]
+    times = ticks["time"].to_numpy(dtype="datetime64[s]").astype(np.int64)
+    price = ticks["price"].to_numpy(dtype=np.float64)
+    volume = ticks["volume"].to_numpy(dtype=np.int64)
+    match_type = ticks["match_type"].astype(str).to_numpy()
+
+    if len(times) == 0:
+        empty = {name: np.array([], dtype=np.float64) for name in BAR_COLUMNS}
+        empty["time"] = np.array([], dtype="datetime64[s]")
+        return empty
+
+    buckets = times // seconds * seconds
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(times)] - 1
+
+    return {
+        "time": buckets[starts].astype("datetime64[s]"),
+        "open": price[starts],
+        "high": np.maximum.reduceat(price, starts),
+        "low": np.minimum.reduceat(price, starts),
+        "close": price[ends],
+        "volume": np.add.reduceat(volume, starts),
+        "buy_volume": np.add.reduceat(np.where(match_type == "Buy", volume, 0), starts),
+        "sell_volume": np.add.reduceat(np.where(match_type == "Sell", volume, 0), starts),
+        "trades": np.diff(np.r_[starts, len(times)]),
+        "value": np.add.reduceat(price * volume, starts),
+    }
+
+
+def merge_bars(old: Dict[str, np.ndarray], new: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Ghép nến của các tick mới vào sau nến đã có
+
+    Nếu nến đầu tiên của phần mới trùng thời điểm với nến cuối của phần cũ
+    thì hai nến được gộp lại.
+
+    Args:
+        old: Nến đã có
+        new: Nến của các tick mới (bắt đầu không sớm hơn nến cuối của old)
+
+    Returns:
+        Dict cột nến sau khi ghép
+    """
+    if len(old["time"]) == 0:
+        return new
+    if len(new["time"]) == 0:
+        return old
+
+    if new["time"][0] != old["time"][-1]:
+        return {name: np.concatenate([old[name], new[name]]) for name in BAR_COLUMNS}
+
+    head = {name: old[name][:-1] for name in BAR_COLUMNS}
+    joined = {name: new[name].copy() for name in BAR_COLUMNS}
+    joined["open"][0] = old["open"][-1]
+    joined["high"][0] = max(old["high"][-1], new["high"][0])
+    joined["low"][0] = min(old["low"][-1], new["low"][0])
+    for name in ("volume", "buy_volume", "sell_volume", "trades", "value"):
+        joined[name][0] = old[name][-1] + new[name][0]
+    return {name: np.concatenate([head[name], joined[name]]) for name in BAR_COLUMNS}
+
+
+def bars_frame(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """DataFrame nến từ các cột, thêm cột vwap"""
+    df = pd.DataFrame({name: columns[name] for name in BAR_COLUMNS})
+    df["time"] = df["time"].astype("datetime64[ns]")
+    volume = df["volume"].to_numpy(dtype=np.float64)
+    df["vwap"] = np.divide(df["value"].to_numpy(dtype=np.float64), volume,
+                           out=df["close"].to_numpy(dtype=np.float64).copy(), where=volume > 0)
+    return df
+
+
+def bars_from_ticks(ticks: pd.DataFrame, interval: str = "5m") -> pd.DataFrame:
+    """Gộp DataFrame tick thành DataFrame nến (không đọc/ghi file)"""
+    return bars_frame(compute_bars(ticks, interval))
+
+
+class BarStore:
+    """
+    Nến OHLCV theo ngày giao dịch, lưu cạnh tick store và cập nhật dần theo tick mới
+    """
+
+    def __init__(self, base_dir: Union[str, Path] = STOCK_ANALYSIS_DIR,
+                 store: Optional[TickStore] = None):
+        """
+        Khởi tạo bar store
+
+        Args:
+            base_dir: Thư mục gốc stock_analysis/
+            store: Tick store để đọc dữ liệu (mặc định theo base_dir)
+        """
+        self.base_dir = Path(base_dir)
+        self.store = store or TickStore(self.base_dir)
+
+    def bars_dir(self, symbol: str, day: str) -> Path:
+        """Thư mục chứa nến của một ngày giao dịch"""
+        return self.base_dir / symbol.upper() / "data" / "bars" / day
+
+    def bars_path(self, symbol: str, day: str, interval: str) -> Path:
+        """File nến của một khung thời gian"""
+        return self.bars_dir(symbol, day) / f"{interval}.npz"
+
+    def _read(self, path: Path) -> Optional[Dict]:
+        """Đọc file nến kèm tick_version/tick_count, None nếu không đọc được"""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["bar_version"]) != BAR_VERSION:
+                    return None
+                columns = {name: data[name] for name in BAR_COLUMNS}
+                return {
+                    "columns": columns,
+                    "tick_version": int(data["tick_version"]),
+                    "tick_count": int(data["tick_count"]),
+                    "last_time": data["last_time"],
+                }
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _write(self, path: Path, columns: Dict[str, np.ndarray], meta: Dict) -> None:
+        """Ghi file tạm rồi thay thế"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.tmp-", suffix=".npz")
+        os.close(fd)
+        try:
+            np.savez(tmp_path, bar_version=BAR_VERSION,
+                     tick_version=int(meta.get("version", 0)),
+                     tick_count=int(meta.get("data_points", 0)),
+                     last_time=np.datetime64(meta.get("last_time") or "NaT", "s"), **columns)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def build(self, symbol: str, day: Optional[str] = None,
+              intervals: Iterable[str] = BAR_INTERVALS) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Tính lại toàn bộ nến của một ngày từ tick và ghi ra đĩa
+
+        Args:
+            symbol: Mã cổ phiếu
+            day: Ngày giao dịch YYYY-MM-DD (mặc định ngày gần nhất)
+            intervals: Các khung thời gian cần tính
+
+        Returns:
+            Dict khung -> cột nến
+
+        Raises:
+            FileNotFoundError: nếu mã/ngày chưa có dữ liệu
+        """
+        symbol = symbol.upper()
+        day = day or self.store.latest_day(symbol)
+        if day is None:
+            raise FileNotFoundError(f"Không có dữ liệu tick cho {symbol}")
+        meta = self.store.load_meta(symbol, day)
+        ticks = self.store.load_ticks(symbol, day)
+
+        result = {}
+        for interval in intervals:
+            columns = compute_bars(ticks, interval)
+            self._write(self.bars_path(symbol, day, interval), columns, meta)
+            result[interval] = columns
+        return result
+
+    def update(self, symbol: str, new_ticks: pd.DataFrame,
+               intervals: Iterable[str] = BAR_INTERVALS) -> Dict[str, int]:
+        """
+        Cập nhật nến sau khi tick mới được nối vào store (TickStore.append_ticks)
+
+        Nến đã lưu chỉ được ghép thêm khi chúng khớp đúng với dữ liệu trước lần
+        nối (version liền trước, đủ số tick) và tick mới không sớm hơn tick cuối
+        đã gộp; nếu không, nến của ngày được tính lại từ đầu.
+
+        Args:
+            symbol: Mã cổ phiếu
+            new_ticks: DataFrame các tick vừa được nối (cột 'ticks' của append_ticks)
+            intervals: Các khung thời gian cần cập nhật
+
+        Returns:
+            Dict ngày -> số khung đã ghép thêm (không tính các khung phải tính lại)
+        """
+        symbol = symbol.upper()
+        if new_ticks is None or new_ticks.empty:
+            return {}
+
+        merged_counts = {}
+        day_keys = new_ticks["time"].dt.strftime("%Y-%m-%d")
+        for day, day_ticks in new_ticks.groupby(day_keys, sort=True):
+            meta = self.store.load_meta(symbol, day)
+            if not meta:
+                continue
+            merged = 0
+            rebuild = []
+            first_time = day_ticks["time"].min().to_datetime64().astype("datetime64[s]")
+            for interval in intervals:
+                path = self.bars_path(symbol, day, interval)
+                stored = self._read(path) if path.exists() else None
+                if (stored is None
+                        or stored["tick_version"] != meta["version"] - 1
+                        or stored["tick_count"] + len(day_ticks) != meta["data_points"]
+                        or first_time < stored["last_time"]):
+                    rebuild.append(interval)
+                    continue
+                new = compute_bars(day_ticks, interval)
+                self._write(path, merge_bars(stored["columns"], new), meta)
+                merged += 1
+            if rebuild:
+                self.build(symbol, day, rebuild)
+            merged_counts[day] = merged
+        return merged_counts
+
+    def load(self, symbol: str, interval: str = "5m", day: Optional[str] = None) -> pd.DataFrame:
+        """
+        Đọc nến của một ngày, tính lại nếu chưa có hoặc đã cũ so với tick
+
+        Args:
+            symbol: Mã cổ phiếu
+            interval: Khung thời gian (một trong BAR_INTERVALS)
+            day: Ngày giao dịch YYYY-MM-DD (mặc định ngày gần nhất)
+
+        Returns:
+            DataFrame nến (BAR_COLUMNS + vwap)
+
+        Raises:
+            FileNotFoundError: nếu mã/ngày chưa có dữ liệu
+        """
+        if interval not in BAR_INTERVALS:
+            raise ValueError(f"Unknown bar interval: {interval}")
+        symbol = symbol.upper()
+        day = day or self.store.latest_day(symbol)
+        if day is None:
+            # Chưa migrate sang tick store: gộp trực tiếp từ file JSON cũ
+            return bars_from_ticks(self.store.load_ticks(symbol), interval)
+
+        meta = self.store.load_meta(symbol, day)
+        path = self.bars_path(symbol, day, interval)
+        stored = self._read(path) if path.exists() else None
+        if (stored is None or stored["tick_version"] != meta.get("version")
+                or stored["tick_count"] != meta.get("data_points")):
+            try:
+                columns = self.build(symbol, day, [interval])[interval]
+            except OSError as e:
+                print(f"Không ghi được nến {path}: {e}")
+                columns = compute_bars(self.store.load_ticks(symbol, day), interval)
+        else:
+            columns = stored["columns"]
+        return bars_frame(columns)
+
+
+_default_store = None
+
+
+def _get_store() -> BarStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = BarStore()
+    return _default_store
+
+
+def load_bars(symbol: str, interval: str = "5m", day: Optional[str] = None) -> pd.DataFrame:
+    """Đọc nến OHLCV từ stock_analysis/ (xem BarStore.load)"""
+    return _get_store().load(symbol, interval, day)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bars - gộp tick thành nến OHLCV")
+    parser.add_argument("symbols", nargs="+", help="Mã cổ phiếu")
+    parser.add_argument("--day", help="Ngày giao dịch YYYY-MM-DD (mặc định ngày gần nhất)")
+
+    args = parser.parse_args()
+    bar_store = BarStore()
+    for symbol in args.symbols:
+        try:
+            result = bar_store.build(symbol, args.day)
+            counts = ", ".join(f"{interval}: {len(columns['time'])}" for interval, columns in result.items())
+            print(f"Success {symbol.upper()}: {counts}")
+        except FileNotFoundError as e:
+            print(f"Error {symbol.upper()}: {e}")
+
+
+if __name__ == "__main__":
+    main()
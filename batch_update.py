@@ -3,16 +3,17 @@
 Batch update script cho tất cả dữ liệu intraday và tạo lại biểu đồ
 """
 
-import json
 import time
-import subprocess
 from pathlib import Path
 from datetime import datetime
 from stock_data_collector import StockDataCollector
+from tick_store import TickStore
+from chart_engine import render_charts
 
 class BatchUpdater:
     def __init__(self):
         self.collector = StockDataCollector()
+        self.store = TickStore()
         self.updated_symbols = []
         self.failed_symbols = []
     
@@ -35,23 +36,21 @@ class BatchUpdater:
             file_path = data_dir / f"{symbol}_intraday_data.json"
             
             print(f"  📊 Fetching intraday data...")
-            data = self.collector.get_intraday_data(symbol)
+            cursor = self.store.get_cursor(symbol)
+            data = self.collector.get_intraday_updates(symbol, last_time=cursor.get('last_time'))
             
             if "error" in data:
                 print(f"  ❌ Error: {data['error']}")
                 return False
             
-            # Backup file cũ
+            # File JSON cũ được chuyển vào tick store (và archive) thay vì đổi tên thành backup
             if file_path.exists():
-                backup_path = data_dir / f"{symbol}_intraday_backup_{int(time.time())}.json"
-                file_path.rename(backup_path)
+                self.store.migrate_json(symbol, remove_json=True)
             
-            # Lưu dữ liệu mới
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+            # Nối dữ liệu mới vào tick store (mỗi lần ghi được lưu vào archive nén)
+            result = self.store.append_intraday_payload(symbol, data)
             
-            data_points = data.get('data_points', 0)
-            print(f"  ✅ Updated: {data_points} data points")
+            print(f"  ✅ Updated: +{result['appended']} new data points")
             return True
             
         except Exception as e:
@@ -61,21 +60,15 @@ class BatchUpdater:
     def regenerate_charts(self, symbol):
         """Tạo lại biểu đồ cho một mã"""
         try:
-            chart_script = f"stock_analysis/{symbol}/analysis/create_{symbol.lower()}_charts.py"
-            
-            if not Path(chart_script).exists():
-                print(f"  ⚠️  Chart script not found: {chart_script}")
-                return False
-            
             print(f"  📈 Regenerating charts...")
-            result = subprocess.run(['python', chart_script], 
-                                  capture_output=True, text=True, cwd=".")
+            result = render_charts(symbol, ["key"])
             
-            if result.returncode == 0:
-                print(f"  ✅ Charts updated successfully")
+            if result["status"] == "success":
+                print(f"  ✅ Charts updated successfully ({len(result['charts'])} charts)")
                 return True
             else:
-                print(f"  ❌ Chart generation failed: {result.stderr}")
+                errors = [group.get("error") for group in result["groups"].values() if group["status"] == "error"]
+                print(f"  ❌ Chart generation failed: {'; '.join(errors) or result.get('error')}")
                 return False
                 
         except Exception as e:
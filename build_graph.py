@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Build Graph - Chạy các bước xử lý theo đồ thị phụ thuộc, kiểu make
+
+Mỗi nút khai báo các nút phụ thuộc, đầu vào (file được hash theo nội dung,
+chuỗi cố định hoặc hàm trả về chuỗi) và các file đầu ra. Khóa của một nút là
+hash của đầu vào cùng khóa các nút phụ thuộc; nút chỉ chạy lại khi khóa khác
+lần chạy thành công trước hoặc đầu ra đã mất. Các nút không phụ thuộc nhau
+được chạy song song trên một thread pool.
+
+Khóa của các nút đã chạy thành công được lưu trong một file trạng thái JSON
+(vd. stock_analysis/<SYMBOL>/.build_state.json).
+
+Sử dụng:
+    graph = BuildGraph("stock_analysis/VIX/.build_state.json")
+    graph.add("data", fetch, always=True, inputs=[data_file])
+    graph.add("charts", draw, deps=["data"], inputs=[data_file, Path("charts.py")])
+    results = graph.build(["charts"])
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+# Tăng khi cách tính khóa thay đổi để mọi nút được chạy lại
+BUILD_STATE_VERSION = 1
+
+# Trạng thái kết quả của một nút
+#   built    đã chạy thành công, khóa được lưu
+#   fresh    bỏ qua vì khóa và đầu ra không đổi
+#   partial  đã chạy nhưng có nút phụ thuộc lỗi, khóa không được lưu để lần sau chạy lại
+#   failed   lỗi
+BUILD_STATUSES = ("built", "fresh", "partial", "failed")
+
+BuildInput = Union[str, Path, Callable[[], Union[str, Path, None]]]
+
+
+def _hash_bytes(*parts: bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def input_digest(item: BuildInput) -> str:
+    """
+    Hash một đầu vào của nút
+
+    Args:
+        item: Path (hash nội dung file, file không tồn tại được tính là rỗng),
+            chuỗi (dùng nguyên giá trị) hoặc hàm trả về một trong hai loại trên
+
+    Returns:
+        Chuỗi hex của hash
+    """
+    if callable(item):
+        item = item()
+    if isinstance(item, Path):
+        content = item.read_bytes() if item.is_file() else b""
+        return _hash_bytes(item.as_posix().encode("utf-8"), b"\0", content)
+    return _hash_bytes(str(item).encode("utf-8"))
+
+
+class BuildNode:
+    """
+    Một bước trong đồ thị
+    """
+
+    def __init__(self, name: str, action: Callable[[], Any], deps: Iterable[str] = (),
+                 inputs: Iterable[BuildInput] = (), outputs: Iterable[Union[str, Path]] = (),
+                 always: bool = False):
+        """
+        Khởi tạo nút
+
+        Args:
+            name: Tên nút
+            action: Hàm thực hiện bước; trả về False hoặc dict có status 'error'
+                (hoặc ném exception) nghĩa là lỗi
+            deps: Tên các nút phải xong trước
+            inputs: Đầu vào được hash vào khóa (xem input_digest)
+            outputs: Các file/thư mục phải tồn tại để nút được coi là còn mới
+            always: Luôn chạy (nguồn bên ngoài, vd. tải dữ liệu); khóa được tính
+                sau khi chạy để các nút phía sau thấy dữ liệu mới
+        """
+        self.name = name
+        self.action = action
+        self.deps = list(deps)
+        self.inputs = list(inputs)
+        self.outputs = [Path(output) for output in outputs]
+        self.always = always
+
+
+class BuildGraph:
+    """
+    Đồ thị các bước xử lý với trạng thái lưu giữa các lần chạy
+    """
+
+    def __init__(self, state_path: Union[str, Path], max_workers: int = 4):
+        """
+        Khởi tạo đồ thị
+
+        Args:
+            state_path: File JSON lưu khóa của các nút đã chạy thành công
+            max_workers: Số nút được chạy đồng thời
+        """
+        self.state_path = Path(state_path)
+        self.max_workers = max(1, max_workers)
+        self.nodes: Dict[str, BuildNode] = {}
+        self._state = self._load_state()
+        self._lock = threading.Lock()
+
+    def add(self, name: str, action: Callable[[], Any], deps: Iterable[str] = (),
+            inputs: Iterable[BuildInput] = (), outputs: Iterable[Union[str, Path]] = (),
+            always: bool = False) -> BuildNode:
+        """Thêm một nút (xem BuildNode)"""
+        if name in self.nodes:
+            raise ValueError(f"Duplicate build node: {name}")
+        node = BuildNode(name, action, deps, inputs, outputs, always)
+        self.nodes[name] = node
+        return node
+
+    # ------------------------------------------------------------------
+    # Trạng thái
+    # ------------------------------------------------------------------
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if state.get("version") != BUILD_STATE_VERSION:
+            return {}
+        return state.get("nodes", {})
+
+    def _save_state(self) -> None:
+        """Ghi trạng thái (ghi tạm rồi đổi tên)"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_path.parent, prefix=self.state_path.name,
+                                        suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": BUILD_STATE_VERSION, "nodes": self._state}, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # ------------------------------------------------------------------
+    # Lập kế hoạch
+    # ------------------------------------------------------------------
+    def plan(self, targets: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Các nút cần xét để dựng targets, theo thứ tự phụ thuộc
+
+        Args:
+            targets: Các nút đích (mặc định mọi nút)
+
+        Returns:
+            Danh sách tên nút, nút phụ thuộc đứng trước
+
+        Raises:
+            ValueError: nếu có nút không tồn tại hoặc phụ thuộc vòng
+        """
+        order: List[str] = []
+        visiting = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name not in self.nodes:
+                raise ValueError(f"Unknown build node: {name}")
+            if name in visiting:
+                raise ValueError(f"Dependency cycle at build node: {name}")
+            visiting.add(name)
+            for dep in self.nodes[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for target in (targets or self.nodes):
+            visit(target)
+        return order
+
+    def node_key(self, node: BuildNode, dep_keys: Dict[str, str]) -> str:
+        """Khóa của một nút: hash đầu vào và khóa các nút phụ thuộc"""
+        parts = [f"v{BUILD_STATE_VERSION}", node.name]
+        parts.extend(input_digest(item) for item in node.inputs)
+        parts.extend(f"{dep}={dep_keys[dep]}" for dep in node.deps)
+        return _hash_bytes("|".join(parts).encode("utf-8"))
+
+    def is_fresh(self, node: BuildNode, key: str) -> bool:
+        """Nút đã chạy thành công với cùng khóa và các đầu ra vẫn còn"""
+        cached = self._state.get(node.name)
+        if not cached or cached.get("key") != key:
+            return False
+        return all(output.exists() for output in node.outputs)
+
+    # ------------------------------------------------------------------
+    # Thực thi
+    # ------------------------------------------------------------------
+    def _run_node(self, node: BuildNode, done: Dict[str, Dict[str, Any]], force: bool) -> Dict[str, Any]:
+        start_time = time.time()
+        result = {"name": node.name, "status": "built"}
+        dep_keys = {dep: done[dep]["key"] for dep in node.deps}
+        upstream_failed = [dep for dep in node.deps if done[dep]["status"] in ("failed", "partial")]
+
+        try:
+            if not node.always:
+                result["key"] = self.node_key(node, dep_keys)
+                if not force and self.is_fresh(node, result["key"]):
+                    result.update(status="fresh", duration=0.0)
+                    return result
+
+            outcome = node.action()
+            if outcome is False:
+                raise RuntimeError("step reported failure")
+            if isinstance(outcome, dict) and outcome.get("status") == "error":
+                raise RuntimeError(outcome.get("error", "step reported failure"))
+
+            if node.always:
+                result["key"] = self.node_key(node, dep_keys)
+        except Exception as e:
+            result.update(status="failed", error=str(e))
+            # Khóa riêng cho lần lỗi để các nút phía sau không bị coi là còn mới
+            result["key"] = _hash_bytes(f"failed|{node.name}|{time.time()}".encode("utf-8"))
+
+        if result["status"] == "built" and upstream_failed:
+            result["status"] = "partial"
+            result["error"] = f"upstream failed: {', '.join(upstream_failed)}"
+
+        if result["status"] == "built":
+            with self._lock:
+                self._state[node.name] = {"key": result["key"], "built_at": datetime.now().isoformat()}
+
+        result["duration"] = time.time() - start_time
+        return result
+
+    def build(self, targets: Optional[Iterable[str]] = None, force: bool = False,
+              on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Dựng các nút đích: chỉ chạy các nút có khóa thay đổi, song song khi có thể
+
+        Nút có nút phụ thuộc bị lỗi vẫn được chạy (kết quả 'partial') nhưng
+        khóa không được lưu, nên lần chạy sau sẽ thử lại.
+
+        Args:
+            targets: Các nút đích (mặc định mọi nút)
+            force: Chạy lại mọi nút bất kể khóa
+            on_result: Hàm được gọi với kết quả của từng nút ngay khi nút đó xong
+
+        Returns:
+            Dict tên nút -> kết quả gồm name, status (BUILD_STATUSES), key,
+            duration, error nếu có
+        """
+        pending = self.plan(targets)
+        done: Dict[str, Dict[str, Any]] = {}
+        running = {}
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while pending or running:
+                    for name in [n for n in pending if all(dep in done for dep in self.nodes[n].deps)]:
+                        pending.remove(name)
+                        running[executor.submit(self._run_node, self.nodes[name], done, force)] = name
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        result = future.result()
+                        done[running.pop(future)] = result
+                        if on_result is not None:
+                            on_result(result)
+        finally:
+            try:
+                self._save_state()
+            except OSError as e:
+                print(f"Warning: could not save build state {self.state_path}: {e}")
+
+        return done
@@ -0,0 +1,26 @@
+"""
+Chart Engine - Tạo biểu đồ phân tích cho mọi mã cổ phiếu từ một bộ mã nguồn
+
+Thay cho các bản sao create_<sym>_charts.py, create_enhanced_<sym>_charts.py,
+create_additional_charts.py trong từng thư mục stock_analysis/<SYMBOL>/analysis/.
+
+Sử dụng:
+    from chart_engine import render_charts
+    result = render_charts("VIC")                         # Tất cả các nhóm
+    result = render_charts("VIC", ["key", "technical"])   # Một số nhóm
+
+    python -m chart_engine VIC VHM --groups key technical [--force] [--workers 8]
+
+Nhiều mã cùng lúc: ChartRenderPool chia việc theo từng biểu đồ cho một
+pool tiến trình đã nạp sẵn matplotlib (xem pool.py).
+
+Biểu đồ có dữ liệu đầu vào không đổi so với lần vẽ trước được bỏ qua
+(xem render_cache.py); result["skipped"] liệt kê các file đó.
+"""
+
+from .context import ChartContext, load_chart_context
+from .engine import CHART_GROUPS, render_charts
+from .pool import ChartRenderPool, render_many
+
+__all__ = ["CHART_GROUPS", "ChartContext", "ChartRenderPool", "load_chart_context",
+           "render_charts", "render_many"]
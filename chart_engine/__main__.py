@@ -0,0 +1,40 @@
+import argparse
+
+from .engine import CHART_GROUPS, render_charts
+from .output import RENDER_PROFILES
+from .pool import render_many
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chart Engine - tạo biểu đồ phân tích")
+    parser.add_argument("symbols", nargs="+", help="Mã cổ phiếu cần tạo biểu đồ")
+    parser.add_argument("--groups", nargs="+", choices=list(CHART_GROUPS),
+                        help="Nhóm biểu đồ (mặc định tất cả)")
+    parser.add_argument("--force", action="store_true",
+                        help="Vẽ lại kể cả các biểu đồ có dữ liệu đầu vào không đổi")
+    parser.add_argument("--profiles", nargs="+", choices=list(RENDER_PROFILES),
+                        help="Render profile cần ghi (mặc định CHART_PROFILES hoặc print preview)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Số tiến trình vẽ song song (1: vẽ tuần tự trong tiến trình hiện tại)")
+
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        results = render_many(args.symbols, args.groups, max_workers=args.workers,
+                              force=args.force, profiles=args.profiles)
+    else:
+        results = [render_charts(symbol, args.groups, force=args.force, profiles=args.profiles)
+                   for symbol in args.symbols]
+
+    for result in results:
+        if result["status"] == "success":
+            print(f"Success {result['symbol']}: {len(result['charts'])} charts, "
+                  f"{len(result['skipped'])} unchanged ({result['duration']:.1f}s)")
+        else:
+            errors = [f"{name}: {group['error']}" for name, group in result["groups"].items()
+                      if group["status"] == "error"]
+            print(f"Error {result['symbol']}: {'; '.join(errors) or result.get('error')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Dữ liệu đầu vào của một lần vẽ biểu đồ: được đọc một lần và dùng chung cho
+mọi nhóm biểu đồ của cùng một mã
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from bars import BarStore, bars_from_ticks
+from indicators import IndicatorCache
+from tick_store import STOCK_ANALYSIS_DIR, TickStore
+
+from .output import resolve_profiles
+from .symbol_profiles import get_symbol_info
+from .render_cache import RenderCache
+
+
+class ChartContext:
+    """
+    Dữ liệu và thông tin của một mã dùng cho việc vẽ biểu đồ
+    """
+
+    def __init__(self, symbol: str, ticks: Optional[pd.DataFrame] = None,
+                 intraday_meta: Optional[Dict[str, Any]] = None,
+                 financial_data: Optional[Dict[str, Any]] = None,
+                 balance_sheet: Optional[Any] = None,
+                 base_dir: Union[str, Path] = STOCK_ANALYSIS_DIR,
+                 profiles: Optional[Iterable[str]] = None):
+        """
+        Khởi tạo context
+
+        Args:
+            symbol: Mã cổ phiếu
+            ticks: DataFrame tick kèm các cột chỉ số kỹ thuật (indicators.INDICATOR_COLUMNS)
+            intraday_meta: Thông tin phiên (timestamp, data_source)
+            financial_data: Nội dung <SYMBOL>_financial_data.json
+            balance_sheet: Dữ liệu bảng cân đối kế toán
+            base_dir: Thư mục gốc stock_analysis/
+            profiles: Các render profile cần ghi (mặc định output.resolve_profiles())
+        """
+        self.symbol = symbol.upper()
+        self.base_dir = Path(base_dir)
+        self.symbol_info = get_symbol_info(self.symbol)
+        self.ticks = ticks
+        self.intraday_meta = intraday_meta or {}
+        self.financial_data = financial_data
+        self.balance_sheet = balance_sheet
+        self.profiles = resolve_profiles(profiles)
+        self.rendered: List[str] = []
+        self.skipped: List[str] = []
+        self.digests: Dict[str, str] = {}
+        self.render_cache = RenderCache(self.charts_dir)
+        self._bars: Dict[str, pd.DataFrame] = {}
+
+    @property
+    def has_ticks(self) -> bool:
+        return self.ticks is not None and not self.ticks.empty
+
+    @property
+    def charts_dir(self) -> Path:
+        return self.base_dir / self.symbol / "charts"
+
+    @property
+    def data_dir(self) -> Path:
+        return self.base_dir / self.symbol / "data"
+
+    def provides(self, requirement: Optional[str]) -> bool:
+        """Kiểm tra context có dữ liệu mà một biểu đồ yêu cầu (ticks, balance_sheet, financial_data)"""
+        if requirement is None:
+            return True
+        if requirement == "ticks":
+            return self.has_ticks
+        return bool(getattr(self, requirement))
+
+    def frame(self) -> pd.DataFrame:
+        """Bản sao DataFrame tick để một biểu đồ thêm cột tạm mà không ảnh hưởng biểu đồ khác"""
+        return self.ticks.copy()
+
+    def bars(self, interval: str = "1h") -> pd.DataFrame:
+        """
+        Nến OHLCV của phiên (bars.BAR_INTERVALS), đọc từ bar store nếu tick đến từ store
+
+        Args:
+            interval: Khung thời gian (1m, 5m, 15m, 1h)
+
+        Returns:
+            DataFrame nến (không được sửa tại chỗ, dùng chung giữa các biểu đồ)
+        """
+        bars = self._bars.get(interval)
+        if bars is None:
+            day = self.intraday_meta.get("day")
+            try:
+                bars = BarStore(self.base_dir).load(self.symbol, interval, day) if day else None
+            except (FileNotFoundError, OSError):
+                bars = None
+            if bars is None:
+                bars = bars_from_ticks(self.ticks, interval)
+            self._bars[interval] = bars
+        return bars
+
+
+def run_charts(ctx: ChartContext, charts: Dict[str, Tuple[Callable, Optional[str]]],
+               selected: Optional[Iterable[str]] = None) -> None:
+    """
+    Vẽ các biểu đồ của một nhóm theo thứ tự khai báo
+
+    Args:
+        ctx: ChartContext của mã đang vẽ
+        charts: Tên biểu đồ -> (hàm vẽ, dữ liệu bắt buộc hoặc None)
+        selected: Chỉ vẽ các biểu đồ có tên trong danh sách này (mặc định tất cả)
+    """
+    selected = set(selected) if selected is not None else None
+    for name, (func, requirement) in charts.items():
+        if (selected is None or name in selected) and ctx.provides(requirement):
+            func(ctx)
+
+
+def _load_json(path: Path) -> Optional[Any]:
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_chart_context(symbol: str, base_dir: Union[str, Path] = STOCK_ANALYSIS_DIR,
+                       store: Optional[TickStore] = None) -> ChartContext:
+    """
+    Đọc dữ liệu tick (kèm chỉ số kỹ thuật đã cache) và dữ liệu tài chính của một mã
+
+    Args:
+        symbol: Mã cổ phiếu
+        base_dir: Thư mục gốc stock_analysis/
+        store: Tick store để đọc dữ liệu (mặc định theo base_dir)
+
+    Returns:
+        ChartContext; ticks là None nếu mã chưa có dữ liệu intraday
+    """
+    symbol = symbol.upper()
+    store = store or TickStore(base_dir)
+
+    ticks = None
+    intraday_meta = {}
+    try:
+        ticks = IndicatorCache(base_dir, store).load(symbol)
+        ticks['match_type'] = ticks['match_type'].astype(str)
+        intraday_meta = store.load_meta(symbol)
+    except FileNotFoundError:
+        pass
+
+    data_dir = Path(base_dir) / symbol / "data"
+    financial_data = _load_json(data_dir / f"{symbol}_financial_data.json")
+
+    # Bảng cân đối: ưu tiên trong <SYMBOL>_financial_data.json, sau đó file riêng
+    balance_sheet = (financial_data or {}).get("balance_sheet")
+    if not balance_sheet:
+        balance_sheet = _load_json(data_dir / f"{symbol}_balance_sheet.json")
+
+    return ChartContext(
+        symbol,
+        ticks=ticks,
+        intraday_meta=intraday_meta,
+        financial_data=financial_data,
+        balance_sheet=balance_sheet,
+        base_dir=base_dir,
+    )
@@ -0,0 +1,115 @@
+"""
+render_charts - vẽ các nhóm biểu đồ của một mã trong cùng tiến trình
+"""
+
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import matplotlib.pyplot as plt
+
+from tick_store import STOCK_ANALYSIS_DIR, TickStore
+
+from . import additional, financial, key_charts, technical
+from .context import ChartContext, load_chart_context
+from .output import resolve_profiles
+
+# Tên nhóm -> module vẽ (module.CHARTS liệt kê các biểu đồ của nhóm),
+# theo thứ tự các script create_*_charts.py trước đây
+CHART_MODULES = {
+    "key": key_charts,
+    "technical": technical,
+    "financial": financial,
+    "additional": additional,
+}
+
+# Tên nhóm -> hàm vẽ cả nhóm
+CHART_GROUPS = {name: module.render for name, module in CHART_MODULES.items()}
+
+
+def chart_tasks(groups: Optional[Iterable[str]] = None) -> List[Tuple[str, str]]:
+    """
+    Danh sách (nhóm, biểu đồ) của các nhóm cần vẽ
+
+    Args:
+        groups: Danh sách nhóm (mặc định tất cả CHART_GROUPS)
+
+    Returns:
+        Danh sách cặp (tên nhóm, tên biểu đồ)
+    """
+    return [(group, chart) for group in (groups or CHART_MODULES)
+            for chart in CHART_MODULES[group].CHARTS]
+
+
+def render_charts(symbol: str, groups: Optional[Iterable[str]] = None,
+                  base_dir: Union[str, Path] = STOCK_ANALYSIS_DIR,
+                  store: Optional[TickStore] = None,
+                  context: Optional[ChartContext] = None,
+                  force: bool = False,
+                  profiles: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Vẽ các nhóm biểu đồ cho một mã; dữ liệu được đọc và chỉ số được tính một lần
+
+    Args:
+        symbol: Mã cổ phiếu
+        groups: Danh sách nhóm cần vẽ (mặc định tất cả CHART_GROUPS)
+        base_dir: Thư mục gốc stock_analysis/
+        store: Tick store để đọc dữ liệu
+        context: ChartContext đã nạp sẵn (bỏ qua việc đọc dữ liệu)
+        force: Vẽ lại mọi biểu đồ kể cả khi dữ liệu đầu vào không đổi
+        profiles: Các render profile cần ghi (mặc định output.resolve_profiles())
+
+    Returns:
+        Dict gồm symbol, status ('success' hoặc 'error'), groups (trạng thái
+        từng nhóm), charts (các file đã vẽ lại), skipped (các file bỏ qua vì
+        dữ liệu đầu vào không đổi), duration, timestamp
+    """
+    symbol = symbol.upper()
+    groups = list(groups or CHART_GROUPS)
+    start_time = time.time()
+
+    result = {
+        "symbol": symbol,
+        "status": "success",
+        "groups": {},
+        "charts": [],
+        "skipped": [],
+    }
+
+    try:
+        ctx = context or load_chart_context(symbol, base_dir=base_dir, store=store)
+        if profiles is not None:
+            ctx.profiles = resolve_profiles(profiles)
+        if force:
+            ctx.render_cache.reset()
+    except Exception as e:
+        result.update(status="error", error=str(e))
+        ctx = None
+
+    for group in groups if ctx is not None else []:
+        renderer = CHART_GROUPS.get(group)
+        if renderer is None:
+            result["groups"][group] = {"status": "error", "error": f"Unknown chart group: {group}"}
+            result["status"] = "error"
+            continue
+
+        try:
+            renderer(ctx)
+            result["groups"][group] = {"status": "success"}
+        except Exception as e:
+            result["groups"][group] = {"status": "error", "error": str(e)}
+            result["status"] = "error"
+        finally:
+            plt.close("all")
+
+    if ctx is not None:
+        try:
+            ctx.render_cache.save()
+        except OSError as e:
+            print(f"Warning: could not save render cache for {symbol}: {e}")
+        result["charts"] = list(ctx.rendered)
+        result["skipped"] = list(ctx.skipped)
+    result["duration"] = time.time() - start_time
+    result["timestamp"] = datetime.now().isoformat()
+    return result
@@ -0,0 +1,63 @@
+"""
+Nhóm "financial": biểu đồ tài chính chuyên sâu theo ngành
+
+Số liệu và bố cục của nhóm này khác nhau theo ngành của từng mã nên vẫn nằm
+trong stock_analysis/<SYMBOL>/analysis/create_financial_charts.py; engine nạp
+module đó trong cùng tiến trình thay vì chạy một interpreter riêng.
+"""
+
+import importlib.util
+
+from .context import run_charts
+from .output import RENDER_PROFILES, current_profiles, profile_path
+from .render_cache import chart_key, files_digest, render_stale, source_digest
+
+SCRIPT_NAME = "create_financial_charts.py"
+
+# Các file dữ liệu mà script tài chính của mỗi mã đọc (data/<SYMBOL>_<name>.json)
+FINANCIAL_DATA_FILES = ("balance_sheet", "income_statement", "financial_ratios", "financial_data")
+
+OUTPUT_SUBDIR = "financial_analysis"
+
+CACHE_ENTRY = f"{OUTPUT_SUBDIR}/*"
+
+
+def create_financial_charts(ctx):
+    """Vẽ nhóm biểu đồ tài chính bằng script riêng của mã"""
+    script = ctx.base_dir / ctx.symbol / "analysis" / SCRIPT_NAME
+    if not script.exists():
+        print(f"{ctx.symbol}: Financial chart script not found ({script})")
+        return
+
+    # Số liệu tài chính chỉ đổi theo quý: bỏ qua cả nhóm nếu script và dữ liệu không đổi
+    data_files = [ctx.data_dir / f"{ctx.symbol}_{name}.json" for name in FINANCIAL_DATA_FILES]
+    key = chart_key(ctx, (), "financial", source_digest(str(script)), files_digest(data_files))
+
+    def draw():
+        spec = importlib.util.spec_from_file_location(
+            f"chart_engine_financial_{ctx.symbol.lower()}", script
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.create_financial_charts()
+
+        for profile in current_profiles():
+            ctx.rendered.extend(str(path) for path in outputs(profile))
+
+    def outputs(profile):
+        output_dir = profile_path(ctx.charts_dir / OUTPUT_SUBDIR / "_.png", profile).parent
+        extension = RENDER_PROFILES[profile]["format"]
+        return sorted(output_dir.glob(f"*.{extension}")) if output_dir.exists() else []
+
+    render_stale(ctx, CACHE_ENTRY, key, draw, outputs)
+
+
+# Script của mỗi mã vẽ mọi biểu đồ tài chính trong một lần gọi
+CHARTS = {
+    "financial_charts": (create_financial_charts, None),
+}
+
+
+def render(ctx, charts=None):
+    """Vẽ nhóm biểu đồ tài chính"""
+    run_charts(ctx, CHARTS, charts)
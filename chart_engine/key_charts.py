@@ -0,0 +1,81 @@
+"""
+Nhóm "key": biểu đồ chính (xu hướng giá, khối lượng theo giờ, mua/bán)
+và biểu đồ tài chính thực từ bảng cân đối kế toán
+"""
+
+import matplotlib.pyplot as plt
+
+from automation.financial_chart_template import create_real_financial_chart
+from downsample import axes_points, downsample_frame
+
+from .context import run_charts
+from .output import current_profiles, profile_path, save_chart
+from .render_cache import cached_chart
+
+
+@cached_chart("key_charts", "price_trend.png")
+def create_price_chart(ctx):
+    """Tạo biểu đồ giá trong ngày."""
+    plt.figure(figsize=(12, 6))
+    df = downsample_frame(ctx.ticks, axes_points(plt.gca()))
+    plt.plot(df['time'], df['price'], linewidth=2, color='blue')
+    plt.title(f'Xu hướng giá trong ngày - {ctx.symbol}')
+    plt.xlabel('Thời gian')
+    plt.ylabel('Giá (VND)')
+    plt.grid(True)
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    save_chart(ctx, "key_charts", "price_trend.png")
+
+
+@cached_chart("key_charts", "volume_by_hour.png")
+def create_volume_chart(ctx):
+    """Tạo biểu đồ khối lượng theo giờ."""
+    bars = ctx.bars("1h")
+    volume_by_hour = bars.set_index(bars['time'].dt.hour)['volume']
+
+    plt.figure(figsize=(12, 6))
+    volume_by_hour.plot(kind='bar', title=f'Khối lượng giao dịch theo giờ - {ctx.symbol}')
+    plt.xlabel('Giờ')
+    plt.ylabel('Khối lượng')
+    plt.grid(True)
+    plt.tight_layout()
+    save_chart(ctx, "key_charts", "volume_by_hour.png")
+
+
+@cached_chart("key_charts", "buy_vs_sell.png")
+def create_buy_sell_chart(ctx):
+    """Tạo biểu đồ mua/bán."""
+    df = ctx.ticks
+    buy_volume = df[df['match_type'] == 'Buy']['volume'].sum()
+    sell_volume = df[df['match_type'] == 'Sell']['volume'].sum()
+
+    plt.figure(figsize=(8, 8))
+    plt.pie([buy_volume, sell_volume], labels=['Mua', 'Bán'], autopct='%1.1f%%', startangle=90)
+    plt.title(f'Tỷ lệ khối lượng Mua vs. Bán - {ctx.symbol}')
+    save_chart(ctx, "key_charts", "buy_vs_sell.png")
+
+
+@cached_chart("detailed_charts", "financial_analysis.png", inputs=("balance_sheet",),
+              sources=(create_real_financial_chart,))
+def create_financial_chart(ctx):
+    """Tạo biểu đồ tài chính thực từ bảng cân đối kế toán."""
+    output_path = ctx.charts_dir / "detailed_charts" / "financial_analysis.png"
+
+    if create_real_financial_chart(ctx.balance_sheet, ctx.symbol, str(output_path)):
+        ctx.rendered.extend(str(profile_path(output_path, profile)) for profile in current_profiles())
+    else:
+        print(f"{ctx.symbol}: No financial chart created - insufficient data")
+
+
+CHARTS = {
+    "price_trend": (create_price_chart, "ticks"),
+    "volume_by_hour": (create_volume_chart, "ticks"),
+    "buy_vs_sell": (create_buy_sell_chart, "ticks"),
+    "financial_analysis": (create_financial_chart, "balance_sheet"),
+}
+
+
+def render(ctx, charts=None):
+    """Vẽ nhóm biểu đồ chính"""
+    run_charts(ctx, CHARTS, charts)
@@ -0,0 +1,161 @@
+"""
+Ghi biểu đồ ra file - điểm ghi file duy nhất của chart engine
+
+Mỗi biểu đồ có thể được xuất theo nhiều profile (DPI/định dạng):
+    print    PNG 300 dpi tại charts/<subdir>/<name>.png (đường dẫn cũ, dùng cho báo cáo/PDF)
+    preview  WebP 72 dpi tại charts/preview/<subdir>/<name>.webp (dashboard, mobile)
+    svg      SVG tại charts/svg/<subdir>/<name>.svg
+
+Các profile được ghi mặc định lấy từ biến môi trường CHART_PROFILES
+(vd. "preview,print"), nếu không có thì là DEFAULT_PROFILES.
+"""
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+# Font hỗ trợ tiếng Việt
+plt.rcParams['font.family'] = ['DejaVu Sans', 'sans-serif']
+plt.rcParams['axes.unicode_minus'] = False
+
+# Tên profile -> dpi, định dạng file, thư mục con trong charts/ (None: đường dẫn gốc)
+RENDER_PROFILES: Dict[str, Dict] = {
+    "print": {"dpi": 300, "format": "png", "dir": None},
+    "preview": {"dpi": 72, "format": "webp", "dir": "preview", "pil_kwargs": {"quality": 80}},
+    "svg": {"dpi": 72, "format": "svg", "dir": "svg"},
+}
+
+DEFAULT_PROFILES = ("print", "preview")
+
+# Các lần làm mới trong phiên chỉ cần ảnh nhỏ cho dashboard
+INTRADAY_PROFILES = ("preview",)
+
+DEFAULT_DPI = RENDER_PROFILES["print"]["dpi"]
+
+# Profile của lần vẽ đang chạy, riêng cho từng thread: render_charts chạy đồng thời
+# trên các thread request của Flask và thread scheduler
+_current_profiles: ContextVar[Optional[Tuple[str, ...]]] = ContextVar("chart_profiles", default=None)
+
+
+def resolve_profiles(profiles: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+    """
+    Chuẩn hóa danh sách profile (mặc định từ CHART_PROFILES hoặc DEFAULT_PROFILES)
+
+    Args:
+        profiles: Danh sách tên profile
+
+    Returns:
+        Tuple tên profile hợp lệ, không trùng lặp
+    """
+    if profiles is None:
+        env = os.environ.get("CHART_PROFILES")
+        profiles = env.split(",") if env else DEFAULT_PROFILES
+    resolved = tuple(dict.fromkeys(name.strip() for name in profiles if name.strip()))
+    unknown = [name for name in resolved if name not in RENDER_PROFILES]
+    if unknown:
+        raise ValueError(f"Unknown render profile: {', '.join(unknown)}")
+    return resolved
+
+
+def current_profiles() -> Tuple[str, ...]:
+    """Các profile mà save_figure ghi khi không chỉ định"""
+    return _current_profiles.get() or resolve_profiles()
+
+
+@contextmanager
+def use_profiles(profiles: Iterable[str]) -> Iterator[None]:
+    """Tạm đặt các profile được ghi cho mọi lần save_figure trong khối with (chỉ trong thread hiện tại)"""
+    token = _current_profiles.set(resolve_profiles(profiles))
+    try:
+        yield
+    finally:
+        _current_profiles.reset(token)
+
+
+def profile_signature(profile: str) -> str:
+    """Tham số xuất ảnh của một profile, là một phần khóa của render cache"""
+    settings = RENDER_PROFILES[profile]
+    return f"{profile};dpi={settings['dpi']};format={settings['format']};bbox=tight"
+
+
+def profile_path(path: Union[str, Path], profile: str) -> Path:
+    """
+    Đường dẫn file của một profile, suy ra từ đường dẫn PNG gốc
+
+    charts/<subdir>/<name>.png -> charts/<profile dir>/<subdir>/<name>.<ext>;
+    nếu đường dẫn không nằm trong thư mục charts/ thì thư mục profile nằm cạnh file.
+
+    Args:
+        path: Đường dẫn ảnh gốc (profile print)
+        profile: Tên profile
+
+    Returns:
+        Đường dẫn file của profile
+    """
+    path = Path(path)
+    settings = RENDER_PROFILES[profile]
+    filename = f"{path.stem}.{settings['format']}"
+    if settings["dir"] is None:
+        return path.with_name(filename)
+
+    parts = path.parts[:-1]
+    for index in range(len(parts) - 1, -1, -1):
+        if parts[index] == "charts":
+            return Path(*parts[:index + 1], settings["dir"], *parts[index + 1:], filename)
+    return path.parent / settings["dir"] / filename
+
+
+def save_figure(path: Union[str, Path], fig=None,
+                profiles: Optional[Iterable[str]] = None) -> List[Path]:
+    """
+    Lưu figure theo các profile (không đóng figure)
+
+    Args:
+        path: Đường dẫn ảnh gốc (profile print), vd. charts/key_charts/price_trend.png
+        fig: Figure cần lưu (mặc định figure hiện tại)
+        profiles: Các profile cần ghi (mặc định current_profiles())
+
+    Returns:
+        Danh sách file đã ghi
+    """
+    fig = fig or plt.gcf()
+    written = []
+    for profile in (resolve_profiles(profiles) if profiles is not None else current_profiles()):
+        settings = RENDER_PROFILES[profile]
+        output_path = profile_path(path, profile)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        options = {"pil_kwargs": settings["pil_kwargs"]} if "pil_kwargs" in settings else {}
+        fig.savefig(output_path, dpi=settings["dpi"], format=settings["format"],
+                    bbox_inches='tight', **options)
+        written.append(output_path)
+    return written
+
+
+def save_chart(ctx, subdir: str, filename: str, fig=None) -> Path:
+    """
+    Lưu figure hiện tại vào stock_analysis/<SYMBOL>/charts/<subdir>/<filename>
+    (theo các profile đang dùng) và đóng figure
+
+    Args:
+        ctx: ChartContext của mã đang vẽ
+        subdir: Thư mục con trong charts/ (key_charts, technical_analysis, ...)
+        filename: Tên file ảnh
+        fig: Figure cần lưu (mặc định figure hiện tại)
+
+    Returns:
+        Đường dẫn ảnh gốc (profile print)
+    """
+    fig = fig or plt.gcf()
+    output_path = ctx.charts_dir / subdir / filename
+
+    written = save_figure(output_path, fig)
+    plt.close(fig)
+
+    ctx.rendered.extend(str(path) for path in written)
+    return output_path
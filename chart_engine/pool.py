@@ -0,0 +1,244 @@
+"""
+ChartRenderPool - vẽ biểu đồ của nhiều mã song song trên một pool tiến trình
+
+Mỗi worker là một tiến trình sống lâu: matplotlib (backend Agg), seaborn,
+pandas và font đã được nạp sẵn khi khởi động, nên mỗi việc chỉ tốn thời gian
+vẽ. Việc được chia theo từng cặp (mã, biểu đồ) để một lần làm mới toàn bộ
+danh mục dùng hết các lõi CPU. Worker giữ lại ChartContext của các mã đã vẽ
+và chỉ nạp lại khi dữ liệu của mã thay đổi.
+
+Sử dụng:
+    from chart_engine import ChartRenderPool
+    with ChartRenderPool(max_workers=8) as pool:
+        results = pool.render(["VIC", "VHM"], ["key", "technical"])
+
+    from chart_engine import render_many
+    results = render_many(["VIC", "VHM"])
+"""
+
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from tick_store import STOCK_ANALYSIS_DIR, TickStore
+
+from .context import ChartContext, load_chart_context
+from .engine import CHART_MODULES, chart_tasks
+from .output import resolve_profiles
+from .render_cache import RenderCache
+
+# ChartContext đã nạp trong worker: symbol -> (dấu phiên bản dữ liệu, context)
+_contexts: Dict[str, Tuple[Tuple, ChartContext]] = {}
+
+
+def _init_worker() -> None:
+    """Khởi động worker: nạp sẵn thư viện vẽ và font để việc đầu tiên không phải chờ"""
+    import matplotlib.font_manager
+    import matplotlib.pyplot as plt
+    import seaborn  # noqa: F401
+
+    matplotlib.font_manager.findfont(plt.rcParams['font.family'][0])
+
+
+def _context_stamp(symbol: str, base_dir: Path, store: TickStore) -> Tuple:
+    """Dấu phiên bản dữ liệu đầu vào của một mã: mtime của tick và các file tài chính"""
+    day = store.latest_day(symbol)
+    paths = [
+        store.day_dir(symbol, day) / "meta.json" if day else store.legacy_json_path(symbol),
+        base_dir / symbol / "data" / f"{symbol}_financial_data.json",
+        base_dir / symbol / "data" / f"{symbol}_balance_sheet.json",
+    ]
+    stamp = []
+    for path in paths:
+        try:
+            stamp.append(path.stat().st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return (day, *stamp)
+
+
+def _worker_context(symbol: str, base_dir: Path) -> ChartContext:
+    """ChartContext của một mã trong worker, nạp lại khi dữ liệu đã đổi"""
+    store = TickStore(base_dir)
+    stamp = _context_stamp(symbol, base_dir, store)
+    cached = _contexts.get(symbol)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    ctx = load_chart_context(symbol, base_dir=base_dir, store=store)
+    _contexts[symbol] = (stamp, ctx)
+    return ctx
+
+
+def _render_task(symbol: str, group: str, chart: str, base_dir: str, force: bool,
+                 profiles: Tuple[str, ...]) -> Dict[str, Any]:
+    """Vẽ một biểu đồ trong worker; khóa render cache được trả về để tiến trình chính ghi"""
+    import matplotlib.pyplot as plt
+
+    result = {
+        "symbol": symbol,
+        "group": group,
+        "chart": chart,
+        "status": "success",
+        "charts": [],
+        "skipped": [],
+        "records": {},
+    }
+
+    try:
+        ctx = _worker_context(symbol, Path(base_dir))
+        ctx.rendered = []
+        ctx.skipped = []
+        ctx.render_cache = RenderCache(ctx.charts_dir)
+        ctx.profiles = profiles
+        if force:
+            ctx.render_cache.reset()
+
+        CHART_MODULES[group].render(ctx, [chart])
+
+        result.update(charts=list(ctx.rendered), skipped=list(ctx.skipped),
+                      records=ctx.render_cache.recorded())
+    except Exception as e:
+        result.update(status="error", error=str(e))
+    finally:
+        plt.close("all")
+
+    return result
+
+
+class ChartRenderPool:
+    """
+    Pool tiến trình vẽ biểu đồ, dùng lại được cho nhiều lần làm mới
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 base_dir: Union[str, Path] = STOCK_ANALYSIS_DIR):
+        """
+        Khởi tạo pool (các worker được tạo khi có việc đầu tiên)
+
+        Args:
+            max_workers: Số tiến trình vẽ (mặc định số lõi CPU)
+            base_dir: Thư mục gốc stock_analysis/
+        """
+        self.base_dir = Path(base_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # spawn: không kế thừa các thread và trạng thái matplotlib của tiến trình cha
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def render(self, symbols: Iterable[str], groups: Optional[Iterable[str]] = None,
+               force: bool = False, profiles: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Vẽ các nhóm biểu đồ cho nhiều mã, chia việc theo từng biểu đồ
+
+        Args:
+            symbols: Danh sách mã cổ phiếu
+            groups: Danh sách nhóm cần vẽ (mặc định tất cả)
+            force: Vẽ lại mọi biểu đồ kể cả khi dữ liệu đầu vào không đổi
+            profiles: Các render profile cần ghi (mặc định output.resolve_profiles())
+
+        Returns:
+            Danh sách kết quả theo thứ tự các mã, cùng định dạng với render_charts
+        """
+        profiles = resolve_profiles(profiles)
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        groups = list(groups or CHART_MODULES)
+        start_time = time.time()
+
+        results = {
+            symbol: {"symbol": symbol, "status": "success", "groups": {}, "charts": [], "skipped": []}
+            for symbol in symbols
+        }
+        known_groups = [group for group in groups if group in CHART_MODULES]
+        group_errors = defaultdict(list)
+
+        for group in groups:
+            if group not in CHART_MODULES:
+                for symbol in symbols:
+                    group_errors[(symbol, group)].append(f"Unknown chart group: {group}")
+
+        futures = {
+            self._executor.submit(_render_task, symbol, group, chart, str(self.base_dir), force,
+                                  profiles):
+                (symbol, group, chart)
+            for symbol in symbols
+            for group, chart in chart_tasks(known_groups)
+        }
+
+        records = defaultdict(dict)
+        for future in as_completed(futures):
+            try:
+                task = future.result()
+            except Exception as e:
+                # Worker bị dừng đột ngột (vd. hết bộ nhớ)
+                symbol, group, chart = futures[future]
+                task = {"symbol": symbol, "group": group, "chart": chart, "status": "error",
+                        "error": str(e), "charts": [], "skipped": [], "records": {}}
+            result = results[task["symbol"]]
+            result["charts"].extend(task["charts"])
+            result["skipped"].extend(task["skipped"])
+            records[task["symbol"]].update(task["records"])
+            if task["status"] == "error":
+                group_errors[(task["symbol"], task["group"])].append(f"{task['chart']}: {task['error']}")
+
+        for symbol, result in results.items():
+            for group in groups:
+                errors = group_errors.get((symbol, group))
+                if errors:
+                    result["groups"][group] = {"status": "error", "error": "; ".join(errors)}
+                    result["status"] = "error"
+                else:
+                    result["groups"][group] = {"status": "success"}
+
+            if records[symbol]:
+                cache = RenderCache(self.base_dir / symbol / "charts")
+                cache.update(records[symbol])
+                try:
+                    cache.save()
+                except OSError as e:
+                    print(f"Warning: could not save render cache for {symbol}: {e}")
+
+            result["duration"] = time.time() - start_time
+            result["timestamp"] = datetime.now().isoformat()
+
+        return [results[symbol] for symbol in symbols]
+
+    def close(self) -> None:
+        """Dừng các worker"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ChartRenderPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def render_many(symbols: Iterable[str], groups: Optional[Iterable[str]] = None,
+                max_workers: Optional[int] = None, force: bool = False,
+                base_dir: Union[str, Path] = STOCK_ANALYSIS_DIR,
+                profiles: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Vẽ biểu đồ cho nhiều mã bằng một pool tạm thời
+
+    Args:
+        symbols: Danh sách mã cổ phiếu
+        groups: Danh sách nhóm cần vẽ (mặc định tất cả)
+        max_workers: Số tiến trình vẽ (mặc định số lõi CPU)
+        force: Vẽ lại mọi biểu đồ kể cả khi dữ liệu đầu vào không đổi
+        base_dir: Thư mục gốc stock_analysis/
+        profiles: Các render profile cần ghi (mặc định output.resolve_profiles())
+
+    Returns:
+        Danh sách kết quả theo thứ tự các mã, cùng định dạng với render_charts
+    """
+    with ChartRenderPool(max_workers=max_workers, base_dir=base_dir) as pool:
+        return pool.render(symbols, groups, force=force, profiles=profiles)
@@ -0,0 +1,310 @@
+"""
+Cache kết quả vẽ biểu đồ theo nội dung đầu vào
+
+Mỗi biểu đồ khai báo các phần dữ liệu nó dùng (ticks, financial_data, ...).
+Khóa cache là hash của các phần dữ liệu đó cùng mã nguồn của module vẽ, tham
+số rút gọn điểm (downsample) và tham số xuất ảnh của từng render profile; biểu đồ chỉ được vẽ lại cho các
+profile có khóa khác lần vẽ trước hoặc file ảnh đã mất. Khóa của mọi biểu đồ
+một mã được lưu trong stock_analysis/<SYMBOL>/charts/.render_cache.json.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+import pandas as pd
+
+from downsample import downsample_signature
+from indicators import INDICATOR_VERSION
+
+from .output import profile_path, profile_signature, use_profiles
+
+MANIFEST_NAME = ".render_cache.json"
+
+# Tăng khi cách tính khóa thay đổi để vô hiệu toàn bộ cache
+RENDER_CACHE_VERSION = 2
+
+# Các phần dữ liệu của ChartContext có thể dùng làm đầu vào của biểu đồ
+CHART_INPUTS = ("ticks", "meta", "financial_data", "balance_sheet", "symbol_info")
+
+_source_digests: Dict[str, str] = {}
+
+# Các lần render trong cùng tiến trình (vd. nhiều nhóm biểu đồ chạy song song) ghi manifest lần lượt
+_save_lock = threading.Lock()
+
+
+def _hash_bytes(*parts: bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def _hash_json(value: Any) -> str:
+    return _hash_bytes(json.dumps(value, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8"))
+
+
+def source_digest(path: str) -> str:
+    """Hash nội dung một file mã nguồn (nhớ theo tiến trình)"""
+    digest = _source_digests.get(path)
+    if digest is None:
+        digest = _hash_bytes(Path(path).read_bytes())
+        _source_digests[path] = digest
+    return digest
+
+
+def input_digest(ctx, name: str) -> str:
+    """
+    Hash một phần dữ liệu đầu vào của ChartContext (tính một lần cho mỗi context)
+
+    Args:
+        ctx: ChartContext
+        name: Tên phần dữ liệu (một trong CHART_INPUTS)
+
+    Returns:
+        Chuỗi hex của hash
+    """
+    cached = ctx.digests.get(name)
+    if cached is not None:
+        return cached
+
+    if name == "ticks":
+        if ctx.has_ticks:
+            # Các cột chỉ số được suy ra từ tick nên chỉ cần hash tick gốc và phiên bản chỉ số
+            base = ctx.ticks[["time", "price", "volume", "match_type", "id"]]
+            row_hashes = pd.util.hash_pandas_object(base, index=False).to_numpy()
+            digest = _hash_bytes(row_hashes.tobytes(), f"i{INDICATOR_VERSION}".encode())
+        else:
+            digest = _hash_bytes(b"")
+    elif name == "meta":
+        digest = _hash_json(ctx.intraday_meta)
+    elif name == "financial_data":
+        digest = _hash_json(ctx.financial_data)
+    elif name == "balance_sheet":
+        digest = _hash_json(ctx.balance_sheet)
+    elif name == "symbol_info":
+        digest = _hash_json(ctx.symbol_info)
+    else:
+        raise ValueError(f"Unknown chart input: {name}")
+
+    ctx.digests[name] = digest
+    return digest
+
+
+def files_digest(paths: Iterable[Path]) -> str:
+    """Hash nội dung nhiều file (file không tồn tại được tính là rỗng)"""
+    parts = []
+    for path in paths:
+        path = Path(path)
+        parts.append(path.name.encode("utf-8"))
+        parts.append(path.read_bytes() if path.exists() else b"")
+    return _hash_bytes(*parts)
+
+
+class RenderCache:
+    """
+    Khóa của các biểu đồ đã vẽ cho một mã, đọc/ghi từ charts/.render_cache.json
+    """
+
+    def __init__(self, charts_dir: Path):
+        """
+        Khởi tạo cache
+
+        Args:
+            charts_dir: Thư mục stock_analysis/<SYMBOL>/charts
+        """
+        self.charts_dir = Path(charts_dir)
+        self.path = self.charts_dir / MANIFEST_NAME
+        self._entries = self._load()
+        self._recorded: Dict[str, Dict[str, Any]] = {}
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != RENDER_CACHE_VERSION:
+            return {}
+        return manifest.get("entries", {})
+
+    def is_fresh(self, entry: str, key: str) -> bool:
+        """
+        Kiểm tra biểu đồ (hoặc nhóm biểu đồ) đã được vẽ với cùng khóa và các file vẫn còn
+
+        Args:
+            entry: Tên mục trong cache (vd. "key_charts/price_trend.png")
+            key: Khóa tính từ dữ liệu đầu vào
+
+        Returns:
+            True nếu có thể bỏ qua việc vẽ lại
+        """
+        cached = self._entries.get(entry)
+        if not cached or cached.get("key") != key or not cached.get("outputs"):
+            return False
+        return all((self.charts_dir / output).exists() for output in cached["outputs"])
+
+    def outputs(self, entry: str) -> List[Path]:
+        """Các file ảnh đã ghi nhận của một mục"""
+        return [self.charts_dir / output for output in self._entries.get(entry, {}).get("outputs", [])]
+
+    def record(self, entry: str, key: str, outputs: Iterable[Path]) -> None:
+        """
+        Ghi nhận khóa và các file ảnh của một mục vừa vẽ xong
+
+        Args:
+            entry: Tên mục trong cache
+            key: Khóa tính từ dữ liệu đầu vào
+            outputs: Các file ảnh đã tạo
+        """
+        self.update({
+            entry: {
+                "key": key,
+                "outputs": [Path(output).relative_to(self.charts_dir).as_posix() for output in outputs],
+            }
+        })
+
+    def recorded(self) -> Dict[str, Dict[str, Any]]:
+        """Các mục đã ghi nhận từ khi nạp cache (chưa ghi ra đĩa)"""
+        return dict(self._recorded)
+
+    def update(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Gộp các mục do tiến trình khác ghi nhận (xem recorded)"""
+        self._entries.update(entries)
+        self._recorded.update(entries)
+
+    def reset(self) -> None:
+        """Bỏ qua các khóa đã lưu để mọi biểu đồ được vẽ lại"""
+        self._entries = {}
+
+    def save(self) -> None:
+        """
+        Ghi các mục mới ra manifest (ghi tạm rồi đổi tên)
+
+        Manifest được đọc lại ngay trước khi ghi để không làm mất các mục mà
+        tiến trình khác vừa ghi cho các biểu đồ còn lại của cùng mã.
+        """
+        if not self._recorded:
+            return
+        with _save_lock:
+            entries = self._load()
+            entries.update(self._recorded)
+
+            self.charts_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.charts_dir, prefix=MANIFEST_NAME, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"version": RENDER_CACHE_VERSION, "entries": entries}, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        self._recorded = {}
+
+
+def chart_key(ctx, inputs: Iterable[str], *extra: str) -> str:
+    """
+    Khóa cache của một biểu đồ (chưa gồm tham số xuất ảnh của profile)
+
+    Args:
+        ctx: ChartContext
+        inputs: Các phần dữ liệu biểu đồ sử dụng
+        extra: Các thành phần bổ sung (hash mã nguồn, ...)
+
+    Returns:
+        Chuỗi hex của khóa
+    """
+    parts = [f"v{RENDER_CACHE_VERSION}", ctx.symbol, downsample_signature()]
+    parts.extend(f"{name}={input_digest(ctx, name)}" for name in inputs)
+    parts.extend(extra)
+    return _hash_bytes("|".join(parts).encode("utf-8"))
+
+
+def render_stale(ctx, entry: str, key: str, draw: Callable[[], Any],
+                 outputs: Callable[[str], List[Path]]) -> None:
+    """
+    Vẽ một biểu đồ (hoặc nhóm biểu đồ) cho các profile của ctx có khóa đã thay đổi
+
+    Args:
+        ctx: ChartContext (ctx.profiles là các profile cần có)
+        entry: Tên mục trong cache (vd. "key_charts/price_trend.png")
+        key: Khóa từ chart_key
+        draw: Hàm vẽ và lưu ảnh bằng save_figure/save_chart
+        outputs: Hàm trả về các file ảnh của một profile sau khi vẽ
+    """
+    cache = ctx.render_cache
+    stale = []
+    for profile in ctx.profiles:
+        profile_entry = f"{profile}:{entry}"
+        if cache.is_fresh(profile_entry, _profile_key(key, profile)):
+            ctx.skipped.extend(str(path) for path in cache.outputs(profile_entry))
+        else:
+            stale.append(profile)
+
+    if not stale:
+        return
+
+    with use_profiles(stale):
+        draw()
+
+    for profile in stale:
+        paths = [path for path in outputs(profile) if path.exists()]
+        if paths:
+            cache.record(f"{profile}:{entry}", _profile_key(key, profile), paths)
+
+
+def _profile_key(key: str, profile: str) -> str:
+    return _hash_bytes(f"{key}|{profile_signature(profile)}".encode("utf-8"))
+
+
+def cached_chart(subdir: str, filename: str, inputs: Iterable[str] = ("ticks",),
+                 frame: bool = False, sources: Iterable[Callable] = ()) -> Callable:
+    """
+    Decorator bỏ qua hàm vẽ biểu đồ nếu đầu vào không đổi so với lần vẽ trước
+
+    Hàm được bọc nhận ctx làm tham số đầu tiên và lưu ảnh bằng
+    save_chart(ctx, subdir, filename) (hoặc tự thêm các file đã ghi vào ctx.rendered).
+
+    Args:
+        subdir: Thư mục con trong charts/
+        filename: Tên file ảnh
+        inputs: Các phần dữ liệu (CHART_INPUTS) mà biểu đồ sử dụng
+        frame: Truyền bản sao DataFrame tick (ctx.frame()) làm tham số thứ hai,
+            chỉ tạo khi thực sự phải vẽ
+        sources: Các hàm/module khác mà biểu đồ phụ thuộc (mã nguồn được đưa vào khóa)
+
+    Returns:
+        Decorator
+    """
+    inputs = tuple(inputs)
+    entry = f"{subdir}/{filename}"
+
+    def decorator(func: Callable) -> Callable:
+        source_files = [inspect.getsourcefile(func)] + [inspect.getsourcefile(src) for src in sources]
+
+        @functools.wraps(func)
+        def wrapper(ctx, *args, **kwargs):
+            key = chart_key(ctx, inputs, func.__qualname__,
+                            *(source_digest(path) for path in source_files))
+            before = len(ctx.rendered)
+
+            def draw():
+                draw_args = ((ctx.frame(),) + args) if frame else args
+                func(ctx, *draw_args, **kwargs)
+
+            def outputs(profile):
+                path = profile_path(ctx.charts_dir / subdir / filename, profile)
+                return [path] if str(path) in ctx.rendered[before:] else []
+
+            render_stale(ctx, entry, key, draw, outputs)
+
+        return wrapper
+
+    return decorator
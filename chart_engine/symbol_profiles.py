@@ -0,0 +1,141 @@
+"""
+Thông tin riêng của từng mã dùng trong biểu đồ (tên hiển thị, yếu tố rủi ro,
+thang điểm thanh khoản). Đây là phần duy nhất khác nhau giữa các bản sao
+create_*_charts.py trước đây.
+"""
+
+from typing import Any, Dict
+
+DEFAULT_SYMBOL_INFO = {
+    "company_name": None,
+    "risk_factors": [
+        "Market volatility",
+        "Interest rate sensitivity",
+        "Regulatory changes",
+        "Market liquidity risk",
+    ],
+    # Tổng khối lượng trong phiên ứng với Liquidity Score = 100
+    "liquidity_scale": 10000000,
+}
+
+SYMBOL_INFO = {
+    "CTG": {
+        "company_name": "VIETINBANK",
+        "risk_factors": [
+            "Interest rate sensitivity",
+            "Credit risk exposure",
+            "Market liquidity risk",
+            "Regulatory compliance risk",
+        ],
+        "liquidity_scale": 5000000,
+    },
+    "DIG": {
+        "company_name": "DIC CORPORATION",
+        "risk_factors": [
+            "Construction project delays",
+            "Commodity price volatility",
+            "Economic cycle sensitivity",
+            "Regulatory compliance risk",
+        ],
+        "liquidity_scale": 5000000,
+    },
+    "GEX": {
+        "company_name": "GELEX GROUP",
+        "risk_factors": [
+            "Industrial demand volatility",
+            "Commodity price volatility",
+            "Economic cycle sensitivity",
+            "Regulatory compliance risk",
+        ],
+        "liquidity_scale": 5000000,
+    },
+    "MBS": {
+        "company_name": "MB SECURITIES",
+        "risk_factors": [
+            "Securities market volatility",
+            "Interest rate sensitivity",
+            "Regulatory changes",
+            "Market liquidity risk",
+        ],
+    },
+    "SHS": {
+        "company_name": "SAIGON - HANOI SECURITIES",
+        "risk_factors": [
+            "Securities market volatility",
+            "Interest rate sensitivity",
+            "Regulatory changes",
+            "Market liquidity risk",
+        ],
+    },
+    "VHM": {
+        "company_name": "VINHOMES",
+        "risk_factors": [
+            "Real estate market volatility",
+            "Interest rate sensitivity",
+            "Regulatory changes",
+            "Market liquidity risk",
+        ],
+    },
+    "VIC": {
+        "company_name": "VINGROUP",
+        "risk_factors": [
+            "Conglomerate market volatility",
+            "Interest rate sensitivity",
+            "Regulatory changes",
+            "Market liquidity risk",
+        ],
+    },
+    "VIX": {
+        "company_name": "VIX SECURITIES",
+        "risk_factors": [
+            "Securities market volatility",
+            "Interest rate sensitivity",
+            "Regulatory changes",
+            "Market liquidity risk",
+        ],
+    },
+    "VJC": {
+        "company_name": "VIETJET AIR",
+        "risk_factors": [
+            "Fuel price volatility",
+            "Exchange rate sensitivity",
+            "Regulatory changes",
+            "Market liquidity risk",
+        ],
+    },
+    "VND": {
+        "company_name": "VNDIRECT SECURITIES",
+        "risk_factors": [
+            "Securities market volatility",
+            "Interest rate sensitivity",
+            "Regulatory changes",
+            "Market liquidity risk",
+        ],
+    },
+    "VRE": {
+        "company_name": "VINCOM RETAIL",
+        "risk_factors": [
+            "Retail real estate volatility",
+            "Interest rate sensitivity",
+            "Regulatory changes",
+            "Market liquidity risk",
+        ],
+    },
+}
+
+
+def get_symbol_info(symbol: str) -> Dict[str, Any]:
+    """
+    Lấy thông tin hiển thị của một mã (mã chưa khai báo dùng giá trị mặc định)
+
+    Args:
+        symbol: Mã cổ phiếu
+
+    Returns:
+        Dict gồm company_name, risk_factors, liquidity_scale
+    """
+    symbol = symbol.upper()
+    info = dict(DEFAULT_SYMBOL_INFO)
+    info.update(SYMBOL_INFO.get(symbol, {}))
+    info["company_name"] = info["company_name"] or symbol
+    return info
@@ -0,0 +1,391 @@
+"""
+Nhóm "technical": phân tích kỹ thuật nâng cao (giá, khối lượng, chỉ số,
+tâm lý thị trường, tổng quan tài chính, tóm tắt giao dịch)
+"""
+
+from datetime import datetime
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+from downsample import axes_points, downsample_frame
+from indicators import rolling_buy_sell_ratio
+
+from .context import run_charts
+from .output import save_chart
+from .render_cache import cached_chart
+
+
+@cached_chart("technical_analysis", "comprehensive_price_analysis.png", frame=True)
+def create_comprehensive_price_analysis(ctx, df):
+    """Tạo biểu đồ phân tích giá toàn diện"""
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+
+    first_price = df['price'].iloc[0]
+    df['price_change_pct'] = ((df['price'] - first_price) / first_price) * 100
+    points = axes_points(ax1)
+    plot_df = downsample_frame(df, points)
+    rsi_df = downsample_frame(df, points, y='RSI')
+    df = plot_df
+
+    # 1. Price with Moving Averages
+    ax1.plot(df['time'], df['price'], label=f'Giá {ctx.symbol}', linewidth=2, color='blue')
+    ax1.plot(df['time'], df['MA5'], label='MA5', alpha=0.7, color='orange')
+    ax1.plot(df['time'], df['MA10'], label='MA10', alpha=0.7, color='green')
+    ax1.plot(df['time'], df['MA20'], label='MA20', alpha=0.7, color='red')
+    ax1.set_title(f'{ctx.symbol} - Giá và Đường trung bình động', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Giá (VND)')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+    ax1.tick_params(axis='x', rotation=45)
+
+    # 2. Bollinger Bands
+    ax2.plot(df['time'], df['price'], label=f'Giá {ctx.symbol}', linewidth=2, color='blue')
+    ax2.fill_between(df['time'], df['BB_upper'], df['BB_lower'], alpha=0.2, color='gray', label='Bollinger Bands')
+    ax2.plot(df['time'], df['BB_upper'], '--', color='red', alpha=0.7, label='BB Upper')
+    ax2.plot(df['time'], df['BB_middle'], '--', color='orange', alpha=0.7, label='BB Middle')
+    ax2.plot(df['time'], df['BB_lower'], '--', color='green', alpha=0.7, label='BB Lower')
+    ax2.set_title(f'{ctx.symbol} - Bollinger Bands', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('Giá (VND)')
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+    ax2.tick_params(axis='x', rotation=45)
+
+    # 3. RSI
+    ax3.plot(rsi_df['time'], rsi_df['RSI'], color='purple', linewidth=2)
+    ax3.axhline(y=70, color='r', linestyle='--', alpha=0.7, label='Quá mua (70)')
+    ax3.axhline(y=30, color='g', linestyle='--', alpha=0.7, label='Quá bán (30)')
+    ax3.axhline(y=50, color='gray', linestyle='-', alpha=0.5)
+    ax3.fill_between(rsi_df['time'], 30, 70, alpha=0.1, color='gray')
+    ax3.set_title(f'{ctx.symbol} - Chỉ số RSI', fontsize=14, fontweight='bold')
+    ax3.set_ylabel('RSI')
+    ax3.set_ylim(0, 100)
+    ax3.legend()
+    ax3.grid(True, alpha=0.3)
+    ax3.tick_params(axis='x', rotation=45)
+
+    # 4. Price Performance
+    ax4.fill_between(df['time'], 0, df['price_change_pct'],
+                     where=(df['price_change_pct'] >= 0), alpha=0.6, color='green')
+    ax4.fill_between(df['time'], 0, df['price_change_pct'],
+                     where=(df['price_change_pct'] < 0), alpha=0.6, color='red')
+    ax4.plot(df['time'], df['price_change_pct'], color='darkblue', linewidth=2)
+    ax4.axhline(y=0, color='black', linestyle='-', alpha=0.8)
+    ax4.set_title(f'{ctx.symbol} - Biến động giá so với mở cửa (%)', fontsize=14, fontweight='bold')
+    ax4.set_ylabel('Thay đổi (%)')
+    ax4.grid(True, alpha=0.3)
+    ax4.tick_params(axis='x', rotation=45)
+
+    plt.tight_layout()
+    save_chart(ctx, "technical_analysis", "comprehensive_price_analysis.png")
+
+
+@cached_chart("technical_analysis", "volume_analysis.png", frame=True)
+def create_volume_analysis(ctx, df):
+    """Phân tích khối lượng giao dịch"""
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+
+    hourly = ctx.bars("1h")
+    hours = hourly['time'].dt.hour
+
+    # 1. Volume over time (giữ các tick khối lượng lớn nhất/nhỏ nhất mỗi bucket)
+    volume_df = downsample_frame(df, axes_points(ax1), y='volume', method='minmax')
+    ax1.bar(volume_df['time'], volume_df['volume'], alpha=0.7, color='steelblue', width=0.0001)
+    ax1.set_title(f'{ctx.symbol} - Khối lượng giao dịch theo thời gian', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Khối lượng')
+    ax1.tick_params(axis='x', rotation=45)
+    ax1.grid(True, alpha=0.3)
+
+    # 2. Volume by hour
+    bars = ax2.bar(hours, hourly['volume'], alpha=0.8, color='lightcoral')
+    ax2.set_title(f'{ctx.symbol} - Khối lượng giao dịch theo giờ', fontsize=14, fontweight='bold')
+    ax2.set_xlabel('Giờ')
+    ax2.set_ylabel('Tổng khối lượng')
+    ax2.grid(True, alpha=0.3)
+
+    # Add value labels on bars
+    for bar in bars:
+        height = bar.get_height()
+        ax2.text(bar.get_x() + bar.get_width()/2., height,
+                f'{int(height/1000)}K', ha='center', va='bottom')
+
+    # 3. Volume vs Price correlation (giữ các tick khối lượng lớn nhất/nhỏ nhất mỗi bucket)
+    scatter_df = downsample_frame(df, axes_points(ax3), y='volume', method='minmax')
+    ax3.scatter(scatter_df['volume'], scatter_df['price'], alpha=0.6, color='green', s=20)
+    ax3.set_title(f'{ctx.symbol} - Tương quan Khối lượng vs Giá', fontsize=14, fontweight='bold')
+    ax3.set_xlabel('Khối lượng')
+    ax3.set_ylabel('Giá (VND)')
+    ax3.grid(True, alpha=0.3)
+
+    # Add correlation coefficient
+    correlation = df['volume'].corr(df['price'])
+    ax3.text(0.05, 0.95, f'Correlation: {correlation:.3f}', 
+             transform=ax3.transAxes, bbox=dict(boxstyle="round", facecolor='wheat', alpha=0.5))
+
+    # 4. Buy vs Sell volume
+    width = 0.35
+    ax4.bar(hours - width/2, hourly['buy_volume'], width, label='Mua', alpha=0.8, color='green')
+    ax4.bar(hours + width/2, hourly['sell_volume'], width, label='Bán', alpha=0.8, color='red')
+    ax4.set_title(f'{ctx.symbol} - Khối lượng Mua vs Bán theo giờ', fontsize=14, fontweight='bold')
+    ax4.set_xlabel('Giờ')
+    ax4.set_ylabel('Khối lượng')
+    ax4.legend()
+    ax4.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    save_chart(ctx, "technical_analysis", "volume_analysis.png")
+
+
+@cached_chart("technical_analysis", "technical_indicators.png", frame=True)
+def create_technical_indicators(ctx, df):
+    """Tạo biểu đồ các chỉ số kỹ thuật"""
+    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(14, 12))
+
+    points = axes_points(ax1)
+    rsi_df = downsample_frame(df, points, y='RSI')
+    df = downsample_frame(df, points)
+
+    # Price with Bollinger Bands
+    ax1.plot(df['time'], df['price'], label=f'Giá {ctx.symbol}', linewidth=2, color='blue')
+    ax1.fill_between(df['time'], df['BB_upper'], df['BB_lower'], alpha=0.2, color='gray')
+    ax1.plot(df['time'], df['BB_upper'], '--', color='red', alpha=0.7, label='BB Upper')
+    ax1.plot(df['time'], df['BB_middle'], '--', color='orange', alpha=0.7, label='BB Middle')
+    ax1.plot(df['time'], df['BB_lower'], '--', color='green', alpha=0.7, label='BB Lower')
+    ax1.set_title(f'{ctx.symbol} - Giá với Bollinger Bands', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Giá (VND)')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    # RSI
+    ax2.plot(rsi_df['time'], rsi_df['RSI'], color='purple', linewidth=2)
+    ax2.axhline(y=70, color='r', linestyle='--', alpha=0.7, label='Quá mua (70)')
+    ax2.axhline(y=30, color='g', linestyle='--', alpha=0.7, label='Quá bán (30)')
+    ax2.axhline(y=50, color='gray', linestyle='-', alpha=0.5)
+    ax2.fill_between(rsi_df['time'], 30, 70, alpha=0.1, color='gray')
+    ax2.set_title(f'{ctx.symbol} - RSI (Relative Strength Index)', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('RSI')
+    ax2.set_ylim(0, 100)
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+
+    # Moving Averages
+    ax3.plot(df['time'], df['price'], label=f'Giá {ctx.symbol}', linewidth=2, color='blue')
+    ax3.plot(df['time'], df['MA5'], label='MA5', alpha=0.7, color='orange')
+    ax3.plot(df['time'], df['MA10'], label='MA10', alpha=0.7, color='green')
+    ax3.plot(df['time'], df['MA20'], label='MA20', alpha=0.7, color='red')
+    ax3.set_title(f'{ctx.symbol} - Đường trung bình động', fontsize=14, fontweight='bold')
+    ax3.set_xlabel('Thời gian')
+    ax3.set_ylabel('Giá (VND)')
+    ax3.legend()
+    ax3.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    save_chart(ctx, "technical_analysis", "technical_indicators.png")
+
+
+@cached_chart("technical_analysis", "market_sentiment.png", frame=True)
+def create_market_sentiment_analysis(ctx, df):
+    """Phân tích tâm lý thị trường"""
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 10))
+
+    # 1. Buy/Sell pressure over time
+    points = axes_points(ax1)
+    df['cumulative_volume'] = df['volume'].cumsum()
+    buy_df = df[df['match_type'] == 'Buy'].copy()
+    sell_df = df[df['match_type'] == 'Sell'].copy()
+
+    if not buy_df.empty:
+        buy_df['cumulative_buy'] = buy_df['volume'].cumsum()
+        buy_df = downsample_frame(buy_df, points, y='cumulative_buy')
+        ax1.plot(buy_df['time'], buy_df['cumulative_buy'], color='green', label='Tích lũy mua', linewidth=2)
+
+    if not sell_df.empty:
+        sell_df['cumulative_sell'] = sell_df['volume'].cumsum()
+        sell_df = downsample_frame(sell_df, points, y='cumulative_sell')
+        ax1.plot(sell_df['time'], sell_df['cumulative_sell'], color='red', label='Tích lũy bán', linewidth=2)
+
+    # Tỷ lệ mua/bán trong 50 tick gần nhất
+    df['buy_sell_ratio'] = rolling_buy_sell_ratio(df['volume'].to_numpy(), df['match_type'].to_numpy(), window=50)
+    ratio_df = downsample_frame(df, points, y='buy_sell_ratio')
+    ax1_ratio = ax1.twinx()
+    ax1_ratio.plot(ratio_df['time'], ratio_df['buy_sell_ratio'], color='purple', alpha=0.5, linewidth=1,
+                   label='Tỷ lệ Mua/Bán (50 tick)')
+    ax1_ratio.axhline(y=1.0, color='gray', linestyle=':', alpha=0.7)
+    ax1_ratio.set_ylabel('Tỷ lệ Mua/Bán')
+
+    ax1.set_title(f'{ctx.symbol} - Áp lực Mua/Bán tích lũy', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Khối lượng tích lũy')
+    lines, labels = ax1.get_legend_handles_labels()
+    ratio_lines, ratio_labels = ax1_ratio.get_legend_handles_labels()
+    ax1.legend(lines + ratio_lines, labels + ratio_labels)
+    ax1.grid(True, alpha=0.3)
+    ax1.tick_params(axis='x', rotation=45)
+
+    # 2. Price momentum
+    df['price_change'] = df['price'].diff()
+    df['momentum'] = df['price_change'].rolling(window=min(10, len(df))).mean()
+
+    momentum = downsample_frame(df[df['momentum'].notna()], axes_points(ax2), y='momentum', method='minmax')
+    colors = np.where(momentum['momentum'] >= 0, 'green', 'red')
+    ax2.bar(momentum['time'], momentum['momentum'], color=colors, alpha=0.7, width=0.0001)
+
+    ax2.axhline(y=0, color='black', linestyle='-', alpha=0.8)
+    ax2.set_title(f'{ctx.symbol} - Momentum giá (10-period)', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('Momentum')
+    ax2.grid(True, alpha=0.3)
+    ax2.tick_params(axis='x', rotation=45)
+
+    # 3. Volume distribution
+    ax3.hist(df['volume'], bins=20, alpha=0.7, color='steelblue', edgecolor='black')
+    ax3.axvline(df['volume'].mean(), color='red', linestyle='--', linewidth=2, label=f'TB: {df["volume"].mean():.0f}')
+    ax3.axvline(df['volume'].median(), color='orange', linestyle='--', linewidth=2, label=f'Median: {df["volume"].median():.0f}')
+    ax3.set_title(f'{ctx.symbol} - Phân phối khối lượng giao dịch', fontsize=14, fontweight='bold')
+    ax3.set_xlabel('Khối lượng')
+    ax3.set_ylabel('Tần suất')
+    ax3.legend()
+    ax3.grid(True, alpha=0.3)
+
+    # 4. Trading intensity heatmap (nến 15 phút)
+    quarters = ctx.bars("15m")
+    intensity_matrix = quarters.pivot_table(
+        index=quarters['time'].dt.hour.rename('hour'),
+        columns=quarters['time'].dt.minute.rename('minute_group'),
+        values='volume', aggfunc='sum', fill_value=0,
+    )
+
+    sns.heatmap(intensity_matrix, ax=ax4, cmap='YlOrRd', 
+                annot=True, fmt='.0f', cbar_kws={'label': 'Khối lượng'})
+    ax4.set_title(f'{ctx.symbol} - Bản đồ nhiệt giao dịch', fontsize=14, fontweight='bold')
+    ax4.set_xlabel('Phút')
+    ax4.set_ylabel('Giờ')
+
+    plt.tight_layout()
+    save_chart(ctx, "technical_analysis", "market_sentiment.png")
+
+
+@cached_chart("detailed_charts", "financial_overview.png", inputs=("financial_data",))
+def create_financial_overview(ctx):
+    """Tạo tổng quan tài chính"""
+    if not ctx.financial_data:
+        # Create a placeholder chart
+        fig, ax = plt.subplots(figsize=(12, 8))
+        ax.text(0.5, 0.5, f'{ctx.symbol} - Dữ liệu tài chính\nĐang xử lý...', 
+                ha='center', va='center', fontsize=16,
+                bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.7))
+        ax.set_title(f'{ctx.symbol} - Tổng quan Tài chính', fontsize=16, fontweight='bold')
+        ax.axis('off')
+        save_chart(ctx, "detailed_charts", "financial_overview.png")
+        return
+
+    # Process financial data if available
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+
+    # Placeholder financial analysis
+    ax1.text(0.5, 0.5, 'P/E Ratio\nAnalysis', ha='center', va='center', fontsize=14,
+             bbox=dict(boxstyle="round", facecolor='lightgreen', alpha=0.7))
+    ax1.set_title('P/E Ratio', fontsize=14, fontweight='bold')
+    ax1.axis('off')
+
+    ax2.text(0.5, 0.5, 'P/B Ratio\nAnalysis', ha='center', va='center', fontsize=14,
+             bbox=dict(boxstyle="round", facecolor='lightcoral', alpha=0.7))
+    ax2.set_title('P/B Ratio', fontsize=14, fontweight='bold')
+    ax2.axis('off')
+
+    ax3.text(0.5, 0.5, 'ROE\nAnalysis', ha='center', va='center', fontsize=14,
+             bbox=dict(boxstyle="round", facecolor='lightyellow', alpha=0.7))
+    ax3.set_title('ROE', fontsize=14, fontweight='bold')
+    ax3.axis('off')
+
+    ax4.text(0.5, 0.5, 'Revenue\nAnalysis', ha='center', va='center', fontsize=14,
+             bbox=dict(boxstyle="round", facecolor='lightsteelblue', alpha=0.7))
+    ax4.set_title('Revenue', fontsize=14, fontweight='bold')
+    ax4.axis('off')
+
+    plt.tight_layout()
+    save_chart(ctx, "detailed_charts", "financial_overview.png")
+
+
+@cached_chart("technical_analysis", "trading_summary.png", inputs=("ticks", "meta"), frame=True)
+def create_trading_summary(ctx, df):
+    """Tạo tóm tắt giao dịch"""
+    fig, ax = plt.subplots(figsize=(12, 8))
+    ax.axis('off')
+
+    # Calculate summary statistics
+    total_volume = df['volume'].sum()
+    avg_price = df['price'].mean()
+    high_price = df['price'].max()
+    low_price = df['price'].min()
+    price_change = df['price'].iloc[-1] - df['price'].iloc[0]
+    price_change_pct = (price_change / df['price'].iloc[0]) * 100
+
+    buy_volume = df[df['match_type'] == 'Buy']['volume'].sum()
+    sell_volume = df[df['match_type'] == 'Sell']['volume'].sum()
+    buy_sell_ratio = buy_volume / sell_volume if sell_volume > 0 else 0
+
+    volatility = df['price'].std()
+    timestamp = ctx.intraday_meta.get('timestamp', 'N/A')
+    # Ngày giao dịch (nằm trong khóa cache qua meta), không phải ngày vẽ
+    day = ctx.intraday_meta.get('day')
+    trading_day = (datetime.strptime(day, '%Y-%m-%d') if day else df['time'].iloc[-1]).strftime('%d/%m/%Y')
+
+    # Create summary text
+    summary_text = f"""
+{ctx.symbol} - TỔNG KẾT GIAO DỊCH INTRADAY
+{trading_day}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+📊 THÔNG TIN GIAO DỊCH:
+   • Tổng khối lượng: {total_volume:,.0f} cổ phiếu
+   • Số điểm dữ liệu: {len(df):,}
+   • Thời gian: {df['time'].min().strftime('%H:%M')} - {df['time'].max().strftime('%H:%M')}
+
+💰 THÔNG TIN GIÁ:
+   • Giá cao nhất: {high_price:.2f} VND
+   • Giá thấp nhất: {low_price:.2f} VND  
+   • Giá trung bình: {avg_price:.2f} VND
+   • Thay đổi: {price_change:+.2f} VND ({price_change_pct:+.2f}%)
+
+📈 PHÂN TÍCH GIAO DỊCH:
+   • Khối lượng mua: {buy_volume:,.0f} ({buy_volume/total_volume*100:.1f}%)
+   • Khối lượng bán: {sell_volume:,.0f} ({sell_volume/total_volume*100:.1f}%)
+   • Tỷ lệ mua/bán: {buy_sell_ratio:.2f}
+
+📊 CHỈ SỐ KỸ THUẬT:
+   • Độ biến động (σ): {volatility:.2f}
+   • Biên độ dao động: {high_price - low_price:.2f} VND
+   • Tính thanh khoản: {'Cao' if total_volume > 1000000 else 'Trung bình' if total_volume > 500000 else 'Thấp'}
+
+🎯 NHẬN ĐỊNH:
+   • Xu hướng: {'TĂNG' if price_change > 0 else 'GIẢM' if price_change < 0 else 'ĐỨNG YÊN'}
+   • Áp lực: {'MUA' if buy_sell_ratio > 1.1 else 'BÁN' if buy_sell_ratio < 0.9 else 'CÂN BẰNG'}
+   • Biến động: {'CAO' if volatility > avg_price * 0.02 else 'THẤP'}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+⏰ Cập nhật: {timestamp}
+📊 Nguồn: {ctx.intraday_meta.get('data_source', 'VCI')}
+    """
+
+    ax.text(0.5, 0.5, summary_text, ha='center', va='center', fontsize=11,
+            bbox=dict(boxstyle="round,pad=0.5", facecolor="lightblue", alpha=0.8),
+            fontfamily='monospace')
+
+    save_chart(ctx, "technical_analysis", "trading_summary.png")
+
+
+CHARTS = {
+    "comprehensive_price_analysis": (create_comprehensive_price_analysis, "ticks"),
+    "volume_analysis": (create_volume_analysis, "ticks"),
+    "technical_indicators": (create_technical_indicators, "ticks"),
+    "market_sentiment": (create_market_sentiment_analysis, "ticks"),
+    "financial_overview": (create_financial_overview, None),
+    "trading_summary": (create_trading_summary, "ticks"),
+}
+
+
+def render(ctx, charts=None):
+    """Vẽ nhóm biểu đồ phân tích kỹ thuật"""
+    run_charts(ctx, CHARTS, charts)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Dashboard Snapshot - Bản tóm tắt theo mã cho /api/stocks, giữ trong bộ nhớ
+
+Mỗi mã có một bản ghi nhỏ (giá hiện tại, cao/thấp, khối lượng, tỷ lệ mua/bán)
+được tính lại chỉ khi meta.json của ngày giao dịch mới nhất (hoặc file JSON
+cũ) thay đổi mtime/kích thước. Các request chỉ cần một lần stat file cho mỗi
+mã nên thời gian phản hồi không phụ thuộc vào kích thước dữ liệu intraday.
+
+Sử dụng:
+    from dashboard_snapshot import SnapshotCache
+    snapshots = SnapshotCache(TickStore())
+    record = snapshots.get("VIX")
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from tick_store import TickStore
+
+# Số tick gần nhất dùng để tính các chỉ số trên dashboard
+SNAPSHOT_WINDOW = 100
+
+
+def build_snapshot(symbol: str, df: pd.DataFrame, meta: Dict[str, Any],
+                   window: int = SNAPSHOT_WINDOW) -> Optional[Dict[str, Any]]:
+    """
+    Tính bản tóm tắt của một mã từ DataFrame tick
+
+    Args:
+        symbol: Mã cổ phiếu
+        df: DataFrame tick sắp xếp theo thời gian tăng dần
+        meta: meta.json của ngày giao dịch (có thể rỗng)
+        window: Số tick gần nhất được dùng
+
+    Returns:
+        Dict tóm tắt, None nếu không có tick
+    """
+    if df.empty:
+        return None
+
+    latest = df.tail(window)
+    prices = latest['price']
+    buy_volumes = int(latest.loc[latest['match_type'] == 'Buy', 'volume'].sum())
+    sell_volumes = int(latest.loc[latest['match_type'] == 'Sell', 'volume'].sum())
+    total_volume = buy_volumes + sell_volumes
+
+    return {
+        'symbol': symbol,
+        'current_price': float(prices.iloc[-1]),
+        'high_price': float(prices.max()),
+        'low_price': float(prices.min()),
+        'total_volume': total_volume,
+        'buy_ratio': (buy_volumes / total_volume * 100) if total_volume > 0 else 0,
+        'sell_ratio': (sell_volumes / total_volume * 100) if total_volume > 0 else 0,
+        'data_points': meta.get('data_points', len(df)),
+        'last_updated': meta.get('timestamp', 'N/A'),
+        'version': meta.get('version'),
+    }
+
+
+class SnapshotCache:
+    """
+    Cache trong bộ nhớ các bản tóm tắt dashboard, vô hiệu theo mtime/version dữ liệu
+    """
+
+    def __init__(self, store: Optional[TickStore] = None, window: int = SNAPSHOT_WINDOW):
+        """
+        Khởi tạo cache
+
+        Args:
+            store: Tick store để đọc dữ liệu (mặc định stock_analysis/)
+            window: Số tick gần nhất dùng cho bản tóm tắt
+        """
+        self.store = store or TickStore()
+        self.window = window
+        self._records: Dict[str, Tuple[Tuple, Optional[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def _data_key(self, symbol: str) -> Optional[Tuple]:
+        """Khóa phiên bản dữ liệu: (ngày, mtime, kích thước) của meta.json hoặc file JSON cũ"""
+        day = self.store.latest_day(symbol)
+        path = self.store.day_dir(symbol, day) / "meta.json" if day else self.store.legacy_json_path(symbol)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (day, stat.st_mtime_ns, stat.st_size)
+
+    def _build(self, symbol: str) -> Optional[Dict[str, Any]]:
+        df = self.store.load_ticks(symbol)
+        meta = self.store.load_meta(symbol)
+        return build_snapshot(symbol, df, meta, self.window)
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Lấy bản tóm tắt của một mã, chỉ tính lại khi dữ liệu đã thay đổi
+
+        Args:
+            symbol: Mã cổ phiếu
+
+        Returns:
+            Dict tóm tắt, None nếu mã chưa có dữ liệu
+        """
+        symbol = symbol.upper()
+        key = self._data_key(symbol)
+        if key is None:
+            return None
+
+        cached = self._records.get(symbol)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        with self._lock:
+            cached = self._records.get(symbol)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            record = self._build(symbol)
+            self._records[symbol] = (key, record)
+            return record
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Xóa bản tóm tắt của một mã (hoặc tất cả)"""
+        with self._lock:
+            if symbol is None:
+                self._records.clear()
+            else:
+                self._records.pop(symbol.upper(), None)
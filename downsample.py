@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Downsample - Rút gọn chuỗi tick trước khi vẽ
+
+Một biểu đồ rộng W inch chỉ hiển thị được khoảng W * dpi điểm theo chiều
+ngang, nên vẽ hàng chục nghìn tick không làm ảnh đẹp hơn mà chỉ làm chậm.
+Hai thuật toán được dùng:
+    lttb    Largest-Triangle-Three-Buckets: giữ hình dạng đường giá (đường line)
+    minmax  Giữ điểm thấp nhất và cao nhất mỗi bucket: không mất đỉnh/đáy
+            (cột khối lượng, momentum)
+
+Số điểm mục tiêu tính theo chiều rộng vùng vẽ: POINTS_PER_INCH điểm mỗi inch,
+thay đổi được qua biến môi trường CHART_POINTS_PER_INCH.
+
+Sử dụng:
+    from downsample import downsample_frame, axes_points
+    plot_df = downsample_frame(df, axes_points(ax))
+    ax.plot(plot_df['time'], plot_df['price'])
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Tăng khi thuật toán thay đổi để vẽ lại các biểu đồ đã cache
+DOWNSAMPLE_VERSION = 1
+
+# Số điểm mục tiêu trên mỗi inch chiều rộng vùng vẽ
+POINTS_PER_INCH = int(os.environ.get("CHART_POINTS_PER_INCH", 200))
+
+# Số điểm tối thiểu cho một vùng vẽ nhỏ
+MIN_POINTS = 100
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def downsample_signature() -> str:
+    """Tham số rút gọn hiện tại, là một phần khóa của render cache"""
+    return f"ds{DOWNSAMPLE_VERSION};ppi={POINTS_PER_INCH}"
+
+
+def points_for_width(width_inches: float, points_per_inch: Optional[int] = None) -> int:
+    """
+    Số điểm mục tiêu cho một vùng vẽ
+
+    Args:
+        width_inches: Chiều rộng vùng vẽ (inch)
+        points_per_inch: Số điểm mỗi inch (mặc định POINTS_PER_INCH)
+
+    Returns:
+        Số điểm tối đa nên vẽ
+    """
+    return max(MIN_POINTS, int(width_inches * (points_per_inch or POINTS_PER_INCH)))
+
+
+def axes_points(ax, points_per_inch: Optional[int] = None) -> int:
+    """Số điểm mục tiêu cho một matplotlib Axes, theo chiều rộng thực của Axes trong figure"""
+    width = ax.get_position().width * ax.figure.get_figwidth()
+    return points_for_width(width, points_per_inch)
+
+
+def _as_float(values) -> np.ndarray:
+    values = np.asarray(values)
+    if values.dtype.kind == "M":
+        values = values.astype("datetime64[ns]").astype(np.int64)
+    return values.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Chọn các điểm theo Largest-Triangle-Three-Buckets
+
+    Điểm đầu và cuối luôn được giữ; mỗi bucket ở giữa giữ điểm tạo tam giác
+    lớn nhất với điểm đã chọn ở bucket trước và trung bình của bucket sau.
+
+    Args:
+        x: Trục hoành (số hoặc datetime64), tăng dần
+        y: Giá trị
+        n_out: Số điểm cần giữ
+
+    Returns:
+        Mảng chỉ số tăng dần của các điểm được giữ
+    """
+    n = len(y)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])
+
+    x = _as_float(x)
+    y = _as_float(y)
+    missing = np.isnan(y)
+    if missing.any():
+        y = np.where(missing, 0.0 if missing.all() else np.nanmean(y), y)
+
+    # n_out - 2 bucket giữa phủ các điểm 1..n-2
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 1 < n_out - 2:
+            cx, cy = mean_x[i + 1], mean_y[i + 1]
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def minmax_indices(y, n_out: int) -> np.ndarray:
+    """
+    Chọn điểm thấp nhất và cao nhất trong mỗi bucket (n_out // 2 bucket)
+
+    Args:
+        y: Giá trị
+        n_out: Số điểm tối đa cần giữ
+
+    Returns:
+        Mảng chỉ số tăng dần, không trùng lặp, luôn gồm điểm đầu và cuối
+    """
+    n = len(y)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+
+    buckets = max(1, n_out // 2)
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    bucket_ids = np.repeat(np.arange(buckets), np.diff(edges))
+    # Sắp xếp theo (bucket, giá trị): phần tử đầu/cuối mỗi bucket là min/max
+    order = np.lexsort((_as_float(y), bucket_ids))
+    lows = order[edges[:-1]]
+    highs = order[edges[1:] - 1]
+    return np.unique(np.concatenate(([0, n - 1], lows, highs)))
+
+
+def downsample_indices(x, y, n_out: int, method: str = "lttb") -> np.ndarray:
+    """Chỉ số các điểm được giữ theo phương pháp method ('lttb' hoặc 'minmax')"""
+    if method == "lttb":
+        return lttb_indices(x, y, n_out)
+    if method == "minmax":
+        return minmax_indices(y, n_out)
+    raise ValueError(f"Unknown downsample method: {method}")
+
+
+def downsample_frame(df: pd.DataFrame, n_out: int, x: str = "time", y: str = "price",
+                     method: str = "lttb") -> pd.DataFrame:
+    """
+    Rút gọn DataFrame về tối đa n_out dòng, chọn dòng theo cột y
+
+    Các cột khác (đường trung bình, Bollinger, ...) được lấy tại cùng các dòng,
+    nên cần tính mọi cột phụ thuộc cửa sổ trượt/tích lũy trên dữ liệu đầy đủ
+    trước khi rút gọn.
+
+    Args:
+        df: DataFrame sắp xếp theo x
+        n_out: Số dòng tối đa
+        x: Cột trục hoành
+        y: Cột dùng để chọn điểm
+        method: 'lttb' hoặc 'minmax'
+
+    Returns:
+        DataFrame đã rút gọn (giữ nguyên index), hoặc df nếu không cần rút gọn
+    """
+    if len(df) <= n_out:
+        return df
+    indices = downsample_indices(df[x].to_numpy(), df[y].to_numpy(), n_out, method)
+    return df.iloc[indices]
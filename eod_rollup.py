@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+EOD Rollup - Gộp tick trong ngày thành nến ngày và đưa vào giá lịch sử
+
+Sau khi đóng phiên, tick của mỗi ngày được gộp thành một nến ngày gồm OHLCV,
+vwap, buy_volume, sell_volume, trades và value rồi ghi vào history store. Nhờ
+đó chuỗi giá lịch sử được nối dài từ chính dữ liệu đã tải trong ngày thay vì
+tải lại từ nguồn.
+
+Ngày đã có trong lịch sử (từ nguồn dữ liệu) giữ nguyên OHLCV của nguồn, rollup
+chỉ bổ sung các cột vwap/buy_volume/sell_volume/trades/value.
+
+Segment archive của mỗi ngày đã gộp được hợp thành một segment
+(TickStore.close_day). Các ngày đã gộp cũ hơn KEEP_DAYS ngày gần nhất chỉ còn
+được giữ trong archive nén (TickStore.archive_day), sau đó archive được áp dụng chính sách lưu giữ
+(tick_archive.TickArchive.prune) để thư mục tick không phình ra theo thời gian.
+
+Sử dụng:
+    from eod_rollup import rollup
+    results = rollup(["VIX", "VHM"])
+
+    python eod_rollup.py VIX VHM [--day 2025-07-25] [--keep-days 5] [--no-compact]
+"""
+
+import argparse
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from bars import BarStore
+from history_store import HISTORY_COLUMNS, HistoryStore
+from tick_store import TickStore
+
+# Số ngày tick gần nhất được giữ dạng cột (chưa nén)
+KEEP_DAYS = int(os.environ.get("TICK_KEEP_DAYS", 5))
+
+# Phiên khớp lệnh đóng cửa (ATC kết thúc 14:45), ngày hiện tại chỉ được gộp sau giờ này
+SESSION_CLOSE = "15:00"
+
+
+def daily_bar(bars: pd.DataFrame, day: str) -> Dict[str, Any]:
+    """
+    Gộp các nến trong ngày thành một nến ngày
+
+    Args:
+        bars: DataFrame nến (bars.bars_frame) của một ngày giao dịch
+        day: Ngày giao dịch YYYY-MM-DD
+
+    Returns:
+        Dict time, open, high, low, close, volume, vwap, buy_volume, sell_volume, trades, value
+    """
+    volume = int(bars["volume"].sum())
+    value = float(bars["value"].sum())
+    close = float(bars["close"].iloc[-1])
+    return {
+        "time": day,
+        "open": float(bars["open"].iloc[0]),
+        "high": float(bars["high"].max()),
+        "low": float(bars["low"].min()),
+        "close": close,
+        "volume": volume,
+        "vwap": value / volume if volume > 0 else close,
+        "buy_volume": int(bars["buy_volume"].sum()),
+        "sell_volume": int(bars["sell_volume"].sum()),
+        "trades": int(bars["trades"].sum()),
+        "value": value,
+    }
+
+
+def session_closed(day: str, now: Optional[datetime] = None) -> bool:
+    """Ngày giao dịch đã đóng phiên chưa (ngày trước hôm nay, hoặc hôm nay sau SESSION_CLOSE)"""
+    now = now or datetime.now()
+    today = now.strftime("%Y-%m-%d")
+    return day < today or (day == today and now.strftime("%H:%M") >= SESSION_CLOSE)
+
+
+def rollup_day(symbol: str, day: str, store: Optional[TickStore] = None,
+               history: Optional[HistoryStore] = None) -> Dict[str, Any]:
+    """
+    Gộp tick của một ngày thành nến ngày và ghi vào history store
+
+    Args:
+        symbol: Mã cổ phiếu
+        day: Ngày giao dịch YYYY-MM-DD
+        store: Tick store (mặc định stock_analysis/)
+        history: History store (mặc định theo thư mục của tick store)
+
+    Returns:
+        Nến ngày đã ghi (xem daily_bar)
+
+    Raises:
+        FileNotFoundError: nếu mã/ngày chưa có dữ liệu tick
+    """
+    symbol = symbol.upper()
+    store = store or TickStore()
+    history = history or HistoryStore(store.base_dir)
+
+    bars = BarStore(store.base_dir, store).load(symbol, "1h", day)
+    if bars.empty:
+        raise FileNotFoundError(f"Không có dữ liệu tick cho {symbol} ngày {day}")
+    row = daily_bar(bars, day)
+
+    existing = history.load(symbol, start=day, end=day)
+    if not existing.empty:
+        # Nguồn dữ liệu là chuẩn cho OHLCV; tick có thể thiếu các lệnh thỏa thuận
+        for column in HISTORY_COLUMNS[1:]:
+            row[column] = float(existing[column].iloc[0])
+
+    history.save(symbol, [row], {"last_rollup": day})
+    return row
+
+
+def compact(symbol: str, store: Optional[TickStore] = None, history: Optional[HistoryStore] = None,
+            keep_days: int = KEEP_DAYS) -> List[Dict[str, Any]]:
+    """
+    Nén các ngày tick đã có trong lịch sử, trừ keep_days ngày gần nhất
+
+    Args:
+        symbol: Mã cổ phiếu
+        store: Tick store (mặc định stock_analysis/)
+        history: History store (mặc định theo thư mục của tick store)
+        keep_days: Số ngày gần nhất giữ dạng cột (luôn giữ ít nhất một ngày)
+
+    Returns:
+        Danh sách kết quả TickStore.archive_day của các ngày đã nén
+    """
+    store = store or TickStore()
+    history = history or HistoryStore(store.base_dir)
+
+    days = store.list_days(symbol)[:-max(1, keep_days)]
+    if not days:
+        return []
+    rolled_up = set(history.load(symbol)["time"].dt.strftime("%Y-%m-%d"))
+    return [store.archive_day(symbol, day) for day in days if day in rolled_up]
+
+
+def rollup_symbol(symbol: str, day: Optional[str] = None, compact_ticks: bool = True,
+                  keep_days: int = KEEP_DAYS, store: Optional[TickStore] = None,
+                  history: Optional[HistoryStore] = None) -> Dict[str, Any]:
+    """
+    Gộp các ngày đã đóng phiên của một mã vào lịch sử rồi nén tick cũ
+
+    Args:
+        symbol: Mã cổ phiếu
+        day: Chỉ gộp một ngày (mặc định mọi ngày còn dạng cột đã đóng phiên)
+        compact_ticks: Nén các ngày cũ sau khi gộp
+        keep_days: Số ngày gần nhất giữ dạng cột
+        store: Tick store (mặc định stock_analysis/)
+        history: History store (mặc định theo thư mục của tick store)
+
+    Returns:
+        Dict gồm symbol, status, days (các ngày đã gộp), archived, saved_bytes,
+        pruned (kết quả TickArchive.prune), error nếu có lỗi
+    """
+    symbol = symbol.upper()
+    store = store or TickStore()
+    history = history or HistoryStore(store.base_dir)
+    result = {"symbol": symbol, "status": "success", "days": [], "archived": [], "saved_bytes": 0}
+
+    try:
+        days = [day] if day else [d for d in store.list_days(symbol) if session_closed(d)]
+        for rollup_date in days:
+            rollup_day(symbol, rollup_date, store, history)
+            # Ngày đã đóng phiên không cần khôi phục theo thời điểm: gộp các segment archive
+            store.close_day(symbol, rollup_date)
+            result["days"].append(rollup_date)
+
+        if compact_ticks:
+            for archived in compact(symbol, store, history, keep_days):
+                if "error" in archived:
+                    continue
+                result["archived"].append(archived["day"])
+                result["saved_bytes"] += archived["store_bytes"]
+            result["pruned"] = store.archive.prune(symbol)
+            result["saved_bytes"] += result["pruned"]["freed_bytes"]
+
+    except Exception as e:
+        result.update(status="error", error=str(e))
+
+    return result
+
+
+def rollup(symbols: Iterable[str], day: Optional[str] = None, compact_ticks: bool = True,
+           keep_days: int = KEEP_DAYS) -> List[Dict[str, Any]]:
+    """Gộp cuối ngày cho nhiều mã (xem rollup_symbol)"""
+    store = TickStore()
+    history = HistoryStore(store.base_dir)
+    return [rollup_symbol(symbol, day, compact_ticks, keep_days, store, history)
+            for symbol in dict.fromkeys(s.upper() for s in symbols)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EOD Rollup - gộp tick trong ngày vào giá lịch sử")
+    parser.add_argument("symbols", nargs="*", help="Mã cổ phiếu (mặc định tất cả mã có tick)")
+    parser.add_argument("--day", help="Chỉ gộp một ngày YYYY-MM-DD")
+    parser.add_argument("--keep-days", type=int, default=KEEP_DAYS,
+                        help="Số ngày tick gần nhất giữ dạng cột")
+    parser.add_argument("--no-compact", action="store_true", help="Không nén tick các ngày cũ")
+
+    args = parser.parse_args()
+    store = TickStore()
+    symbols = args.symbols or sorted(
+        item.name for item in store.base_dir.iterdir() if item.is_dir() and store.list_days(item.name)
+    )
+
+    for result in rollup(symbols, args.day, not args.no_compact, args.keep_days):
+        if result["status"] == "success":
+            archived = (f", archived {len(result['archived'])} days "
+                        f"(-{result['saved_bytes'] / 1024:.0f} KB)" if result["archived"] else "")
+            print(f"Success {result['symbol']}: {', '.join(result['days']) or 'no closed days'}{archived}")
+        else:
+            print(f"Error {result['symbol']}: {result['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ import sys
 import time
 from pathlib import Path
 from stock_data_collector import StockDataCollector
+from history_store import update_history
+from tick_store import TickStore
 
 def get_data_and_save(symbol: str):
     """
@@ -21,7 +23,7 @@ def get_data_and_save(symbol: str):
         "balance_sheet": lambda s: collector.get_financial_statements(s, "balance_sheet"),
         "income_statement": lambda s: collector.get_financial_statements(s, "income_statement"),
         "financial_ratios": collector.get_financial_ratios,
-        "historical_prices": lambda s: collector.get_historical_prices(s, "2024-01-01", "2025-03-19", "1D"),
+        "historical_prices": lambda s: update_history(s, collector=collector),
     }
     
     for data_name, fetch_func in data_to_fetch.items():
@@ -33,6 +35,15 @@ def get_data_and_save(symbol: str):
             print(f"    ERROR: {data['error']}")
             continue
         
+        if data_name == "historical_prices":
+            print(f"    -> History store: +{data['added']} days ({data['first_date']} .. {data['last_date']})")
+            continue
+        
+        if data_name == "intraday_data":
+            days = TickStore().save_intraday_payload(symbol, data)
+            print(f"    -> Saved to tick store: {', '.join(days)}")
+            continue
+        
         file_path = output_dir / f"{symbol.upper()}_{data_name}.json"
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=4)
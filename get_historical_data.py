@@ -1,46 +1,24 @@
-import json
 import sys
-import time
-from pathlib import Path
-from datetime import datetime, timedelta
-from stock_data_collector import StockDataCollector
+from history_store import HistoryStore
 
 def get_historical_data(symbol: str, years: int = 3):
     """
-    Lấy dữ liệu lịch sử giá của một mã cổ phiếu trong N năm gần nhất.
+    Cập nhật dữ liệu lịch sử giá của một mã cổ phiếu trong N năm gần nhất.
+
+    Chỉ tải phần còn thiếu (ngày mới, phần đầu chưa có, khoảng trống giữa chuỗi)
+    vào history store thay vì tải lại toàn bộ N năm.
     """
     print(f"Starting historical data collection for: {symbol.upper()} for the last {years} years.")
-    collector = StockDataCollector()
-    
-    # Tạo cấu trúc thư mục
-    output_dir = Path(f"stock_analysis/{symbol.upper()}/data")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Tính toán ngày bắt đầu và ngày kết thúc
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=years * 365)
-    
-    end_date_str = end_date.strftime('%Y-%m-%d')
-    start_date_str = start_date.strftime('%Y-%m-%d')
+    store = HistoryStore()
 
-    print(f"Fetching historical prices from {start_date_str} to {end_date_str}...")
-    
-    data = collector.get_historical_prices(symbol, start_date_str, end_date_str, "1D")
-    
-    if "error" in data:
-        print(f"    ERROR: {data['error']}")
+    result = store.update(symbol, years=years)
+
+    if result["status"] != "success":
+        print(f"    ERROR: {result['error']}")
         return
-        
-    file_path = output_dir / f"{symbol.upper()}_historical_{years}years.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        # Convert Timestamp objects to strings
-        if 'data' in data and isinstance(data['data'], list):
-            for row in data['data']:
-                if 'time' in row and hasattr(row['time'], 'isoformat'):
-                    row['time'] = row['time'].isoformat()
 
-        json.dump(data, f, ensure_ascii=False, indent=4)
-    print(f"    -> Saved to: {file_path}")
+    print(f"    -> {result['added']} days added, {result['repaired']} days repaired")
+    print(f"    -> Saved to: {store.data_path(symbol)} ({result['first_date']} .. {result['last_date']})")
         
     print(f"Historical data collection completed for {symbol.upper()}!")
 
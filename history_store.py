@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+History Store - Lưu giá lịch sử theo ngày (nến 1D) và chỉ tải phần còn thiếu
+
+Mỗi mã có một bộ cột nến ngày cùng meta.json:
+
+    stock_analysis/<SYMBOL>/data/history/daily.npz   (time, open, high, low, close, volume, ...)
+    stock_analysis/<SYMBOL>/data/history/meta.json   (first_date, last_date, holidays, ...)
+
+Lần cập nhật chỉ tải từ ngày cuối đã lưu đến hôm nay (ngày cuối được tải lại vì
+có thể chưa chốt phiên). Các ngày làm việc bị thiếu ở giữa chuỗi được phát hiện
+và tải lại; ngày nào nguồn dữ liệu vẫn không có (nghỉ lễ) được ghi vào
+holidays để không hỏi lại.
+
+Sử dụng:
+    from history_store import load_history
+    df = load_history("VIC")                          # Toàn bộ lịch sử đã lưu
+    df = load_history("VIC", start="2024-01-01", end="2024-12-31")
+
+    python history_store.py VIC VHM [--years 3] [--no-repair]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from tick_store import STOCK_ANALYSIS_DIR
+
+# Các cột bắt buộc; các cột bổ sung (vd. vwap) được giữ nguyên nếu có
+HISTORY_COLUMNS = ("time", "open", "high", "low", "close", "volume")
+
+DEFAULT_YEARS = 3
+
+# Khóa đọc-gộp-ghi của từng mã (nhiều thread trong cùng tiến trình cập nhật cùng một mã)
+_symbol_locks: Dict[str, threading.Lock] = {}
+_symbol_locks_guard = threading.Lock()
+
+# Các file JSON cũ được nhập một lần khi store còn trống
+LEGACY_FILES = ("{symbol}_historical_3years.json", "{symbol}_historical_prices.json")
+
+
+def _normalize(records: Union[pd.DataFrame, List[Dict[str, Any]]]) -> pd.DataFrame:
+    """Chuẩn hóa dữ liệu nến ngày (tên cột viết thường, time là ngày, không trùng ngày)"""
+    df = records.copy() if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+    if df.empty:
+        return pd.DataFrame(columns=list(HISTORY_COLUMNS))
+
+    df = df.rename(columns={column: str(column).lower() for column in df.columns})
+    df = df.drop(columns=[column for column in ("index",) if column in df.columns])
+    if "time" not in df.columns:
+        raise ValueError("Historical data has no 'time' column")
+
+    df["time"] = pd.to_datetime(df["time"]).dt.normalize()
+    for column in HISTORY_COLUMNS[1:]:
+        if column not in df.columns:
+            df[column] = df["close"] if column != "volume" else 0
+    for column in df.columns:
+        if column != "time":
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    df = df.dropna(subset=["close"])
+    return df.drop_duplicates(subset="time", keep="last").sort_values("time").reset_index(drop=True)
+
+
+def business_days(start: pd.Timestamp, end: pd.Timestamp) -> pd.DatetimeIndex:
+    """Các ngày thứ Hai - thứ Sáu trong khoảng [start, end]"""
+    return pd.bdate_range(start, end)
+
+
+def _ranges(days: pd.DatetimeIndex) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Gộp danh sách ngày làm việc thành các khoảng liên tiếp"""
+    ranges = []
+    for day in days:
+        if ranges and len(business_days(ranges[-1][1], day)) == 2:
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+class HistoryStore:
+    """
+    Kho giá lịch sử theo ngày của từng mã, cập nhật dần phần còn thiếu
+    """
+
+    def __init__(self, base_dir: Union[str, Path] = STOCK_ANALYSIS_DIR, collector=None):
+        """
+        Khởi tạo history store
+
+        Args:
+            base_dir: Thư mục gốc stock_analysis/
+            collector: StockDataCollector dùng để tải dữ liệu (tạo khi cần)
+        """
+        self.base_dir = Path(base_dir)
+        self._collector = collector
+
+    @property
+    def collector(self):
+        if self._collector is None:
+            from stock_data_collector import StockDataCollector
+            self._collector = StockDataCollector()
+        return self._collector
+
+    # ------------------------------------------------------------------
+    # Đường dẫn
+    # ------------------------------------------------------------------
+    def history_dir(self, symbol: str) -> Path:
+        """Thư mục giá lịch sử của một mã"""
+        return self.base_dir / symbol.upper() / "data" / "history"
+
+    def data_path(self, symbol: str) -> Path:
+        return self.history_dir(symbol) / "daily.npz"
+
+    def meta_path(self, symbol: str) -> Path:
+        return self.history_dir(symbol) / "meta.json"
+
+    # ------------------------------------------------------------------
+    # Đọc/ghi
+    # ------------------------------------------------------------------
+    def load_meta(self, symbol: str) -> Dict[str, Any]:
+        """Đọc meta.json, rỗng nếu chưa có dữ liệu"""
+        path = self.meta_path(symbol)
+        if not path.exists():
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _read(self, symbol: str) -> pd.DataFrame:
+        path = self.data_path(symbol)
+        if not path.exists():
+            return pd.DataFrame(columns=list(HISTORY_COLUMNS))
+        with np.load(path, allow_pickle=False) as data:
+            df = pd.DataFrame({name: data[name] for name in data.files})
+        df["time"] = df["time"].astype("datetime64[ns]")
+        return df
+
+    def load(self, symbol: str, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """
+        Đọc nến ngày trong khoảng [start, end]
+
+        Args:
+            symbol: Mã cổ phiếu
+            start: Ngày bắt đầu YYYY-MM-DD (mặc định từ đầu)
+            end: Ngày kết thúc YYYY-MM-DD (mặc định đến cuối)
+
+        Returns:
+            DataFrame các cột time, open, high, low, close, volume (+ cột bổ sung),
+            rỗng nếu chưa có dữ liệu
+        """
+        if not self.data_path(symbol).exists():
+            # Chưa có store: dùng các file JSON cũ nếu có
+            self.import_legacy(symbol)
+        df = self._read(symbol)
+
+        times = df["time"].to_numpy()
+        lo = np.searchsorted(times, np.datetime64(start, "ns")) if start else 0
+        hi = np.searchsorted(times, np.datetime64(end, "ns"), side="right") if end else len(df)
+        return df.iloc[lo:hi].reset_index(drop=True)
+
+    def save(self, symbol: str, records: Union[pd.DataFrame, List[Dict[str, Any]]],
+             meta: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Ghi đè/ghép các nến ngày vào store (ngày trùng lấy giá trị mới)
+
+        Args:
+            symbol: Mã cổ phiếu
+            records: DataFrame hoặc danh sách dict có cột time và OHLCV
+            meta: Các trường meta cần cập nhật (data_source, holidays, ...)
+
+        Returns:
+            Số ngày mới được thêm
+        """
+        symbol = symbol.upper()
+        key = str(self.history_dir(symbol).resolve())
+        with _symbol_locks_guard:
+            lock = _symbol_locks.setdefault(key, threading.Lock())
+        with lock:
+            return self._save(symbol, records, meta)
+
+    def _save(self, symbol: str, records: Union[pd.DataFrame, List[Dict[str, Any]]],
+              meta: Optional[Dict[str, Any]]) -> int:
+        """save khi đã giữ khóa của mã"""
+        new = _normalize(records)
+        existing = self._read(symbol)
+        previous = self.load_meta(symbol)
+
+        added = int((~new["time"].isin(existing["time"])).sum()) if not new.empty else 0
+        if existing.empty:
+            df = new
+        elif new.empty:
+            df = existing
+        else:
+            # Giá trị mới được ưu tiên; cột mà nguồn mới không có (vd. vwap) giữ giá trị cũ
+            df = new.set_index("time").combine_first(existing.set_index("time"))
+            df = df.sort_index().reset_index()
+
+        history_dir = self.history_dir(symbol)
+        history_dir.mkdir(parents=True, exist_ok=True)
+
+        if not df.empty:
+            columns = {"time": df["time"].to_numpy().astype("datetime64[D]")}
+            for column in df.columns:
+                if column != "time":
+                    columns[column] = df[column].to_numpy(dtype=np.float64)
+            fd, tmp_path = tempfile.mkstemp(dir=history_dir, prefix=".daily.tmp-", suffix=".npz")
+            os.close(fd)
+            try:
+                np.savez(tmp_path, **columns)
+                os.replace(tmp_path, self.data_path(symbol))
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        day_meta = dict(previous, **(meta or {}))
+        day_meta.update({
+            "symbol": symbol,
+            "interval": "1D",
+            "data_points": int(len(df)),
+            "first_date": df["time"].iloc[0].strftime("%Y-%m-%d") if not df.empty else None,
+            "last_date": df["time"].iloc[-1].strftime("%Y-%m-%d") if not df.empty else None,
+            "timestamp": datetime.now().isoformat(),
+            "version": int(previous.get("version", 0)) + 1,
+        })
+        fd, tmp_meta = tempfile.mkstemp(dir=history_dir, prefix=".meta.tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(day_meta, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_meta, self.meta_path(symbol))
+        except Exception:
+            if os.path.exists(tmp_meta):
+                os.remove(tmp_meta)
+            raise
+        return added
+
+    def import_legacy(self, symbol: str) -> int:
+        """
+        Nhập các file <SYMBOL>_historical_*.json cũ vào store
+
+        Returns:
+            Số ngày đã nhập
+        """
+        symbol = symbol.upper()
+        data_dir = self.base_dir / symbol / "data"
+        imported = 0
+        for pattern in LEGACY_FILES:
+            path = data_dir / pattern.format(symbol=symbol)
+            if not path.exists():
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("data"):
+                imported += self.save(symbol, payload["data"], {"data_source": payload.get("data_source")})
+        return imported
+
+    # ------------------------------------------------------------------
+    # Phát hiện và sửa khoảng trống
+    # ------------------------------------------------------------------
+    def find_gaps(self, symbol: str, df: Optional[pd.DataFrame] = None) -> List[Tuple[str, str]]:
+        """
+        Các khoảng ngày làm việc bị thiếu giữa ngày đầu và ngày cuối đã lưu
+
+        Args:
+            symbol: Mã cổ phiếu
+            df: Dữ liệu đã đọc (mặc định đọc từ store)
+
+        Returns:
+            Danh sách (ngày bắt đầu, ngày kết thúc) dạng YYYY-MM-DD
+        """
+        df = self.load(symbol) if df is None else df
+        if len(df) < 2:
+            return []
+        holidays = pd.DatetimeIndex(pd.to_datetime(self.load_meta(symbol).get("holidays", [])))
+        expected = business_days(df["time"].iloc[0], df["time"].iloc[-1])
+        missing = expected.difference(pd.DatetimeIndex(df["time"])).difference(holidays)
+        return [(lo.strftime("%Y-%m-%d"), hi.strftime("%Y-%m-%d")) for lo, hi in _ranges(missing)]
+
+    def _fetch(self, symbol: str, start: str, end: str) -> Optional[pd.DataFrame]:
+        """Tải nến ngày trong [start, end]; DataFrame rỗng nếu nguồn không có dữ liệu, None nếu lỗi"""
+        data = self.collector.get_historical_prices(symbol, start, end, "1D")
+        if "error" in data:
+            if data["error"].startswith("Không có dữ liệu"):
+                return _normalize([])
+            print(f"    {symbol} {start}..{end}: {data['error']}")
+            return None
+        return _normalize(data.get("data") or [])
+
+    def _source_meta(self) -> Dict[str, Any]:
+        return {"data_source": getattr(self.collector, "data_source", None)}
+
+    def update(self, symbol: str, years: int = DEFAULT_YEARS, repair: bool = True,
+               end_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Cập nhật giá lịch sử: nhập file cũ, tải phần đầu/cuối còn thiếu và sửa khoảng trống
+
+        Args:
+            symbol: Mã cổ phiếu
+            years: Số năm lịch sử cần có
+            repair: Tải lại các ngày làm việc bị thiếu ở giữa chuỗi
+            end_date: Ngày cuối YYYY-MM-DD (mặc định hôm nay)
+
+        Returns:
+            Dict gồm symbol, status, added, repaired, first_date, last_date, error nếu có lỗi
+        """
+        symbol = symbol.upper()
+        end = pd.Timestamp(end_date or datetime.now().strftime("%Y-%m-%d"))
+        start = end - timedelta(days=years * 365)
+        result = {"symbol": symbol, "status": "success", "added": 0, "repaired": 0}
+
+        try:
+            if not self.data_path(symbol).exists():
+                result["added"] += self.import_legacy(symbol)
+
+            meta = self.load_meta(symbol)
+            if not meta.get("last_date"):
+                windows = [(start, end)]
+            else:
+                first = pd.Timestamp(meta["first_date"])
+                last = pd.Timestamp(meta["last_date"])
+                # Ngày cuối được tải lại vì có thể đã lưu khi phiên chưa đóng
+                windows = [(last, end)] if last <= end else []
+                known_start = meta.get("history_start")
+                if first > start and not (known_start and pd.Timestamp(known_start) <= start):
+                    windows.insert(0, (start, first - timedelta(days=1)))
+
+            for lo, hi in windows:
+                records = self._fetch(symbol, lo.strftime("%Y-%m-%d"), hi.strftime("%Y-%m-%d"))
+                if records is None:
+                    continue
+                if not records.empty:
+                    result["added"] += self.save(symbol, records, self._source_meta())
+                elif meta.get("first_date") and lo < pd.Timestamp(meta["first_date"]):
+                    # Nguồn không có dữ liệu sớm hơn (vd. mã mới niêm yết): không hỏi lại phần đầu
+                    self.save(symbol, [], {"history_start": lo.strftime("%Y-%m-%d")})
+
+            if repair:
+                result["repaired"] = self.repair(symbol)
+
+        except Exception as e:
+            result.update(status="error", error=str(e))
+
+        meta = self.load_meta(symbol)
+        result.update(first_date=meta.get("first_date"), last_date=meta.get("last_date"))
+        return result
+
+    def repair(self, symbol: str) -> int:
+        """
+        Tải lại các khoảng ngày bị thiếu; ngày vẫn không có dữ liệu được ghi là ngày nghỉ
+
+        Returns:
+            Số ngày đã bổ sung
+        """
+        repaired = 0
+        holidays = []
+        for lo, hi in self.find_gaps(symbol):
+            records = self._fetch(symbol, lo, hi)
+            if records is None:
+                continue
+            if not records.empty:
+                repaired += self.save(symbol, records, self._source_meta())
+            holidays.extend(day.strftime("%Y-%m-%d")
+                            for day in business_days(lo, hi).difference(pd.DatetimeIndex(records["time"])))
+        if holidays:
+            known = self.load_meta(symbol).get("holidays", [])
+            self.save(symbol, [], {"holidays": sorted(set(known) | set(holidays))})
+        return repaired
+
+
+_default_store = None
+
+
+def _get_store() -> HistoryStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = HistoryStore()
+    return _default_store
+
+
+def load_history(symbol: str, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """Đọc nến ngày từ stock_analysis/ (xem HistoryStore.load)"""
+    return _get_store().load(symbol, start, end)
+
+
+def update_history(symbol: str, years: int = DEFAULT_YEARS, repair: bool = True,
+                   collector=None) -> Dict[str, Any]:
+    """Cập nhật giá lịch sử của một mã (xem HistoryStore.update)"""
+    store = HistoryStore(collector=collector) if collector is not None else _get_store()
+    return store.update(symbol, years=years, repair=repair)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="History Store - cập nhật giá lịch sử theo ngày")
+    parser.add_argument("symbols", nargs="+", help="Mã cổ phiếu")
+    parser.add_argument("--years", type=int, default=DEFAULT_YEARS, help="Số năm lịch sử cần có")
+    parser.add_argument("--no-repair", action="store_true", help="Không tải lại các ngày bị thiếu")
+
+    args = parser.parse_args()
+    store = HistoryStore()
+    for symbol in args.symbols:
+        result = store.update(symbol, years=args.years, repair=not args.no_repair)
+        if result["status"] == "success":
+            print(f"Success {result['symbol']}: +{result['added']} days, {result['repaired']} repaired "
+                  f"({result['first_date']} .. {result['last_date']})")
+        else:
+            print(f"Error {result['symbol']}: {result['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Indicators - Thư viện chỉ số kỹ thuật dùng chung, tính bằng NumPy trên mảng tick
+
+Tất cả chỉ số (MA, Bollinger Bands, RSI, MACD, Stochastic, VWAP bands) được tính
+trong một lượt trên các mảng price/volume của tick store. Kết quả được lưu trên
+đĩa theo (mã, ngày, version dữ liệu tick) nên biểu đồ, báo cáo, dashboard và
+analyzer chỉ đọc lại các cột đã tính sẵn:
+
+    stock_analysis/<SYMBOL>/data/indicators/<YYYY-MM-DD>/v<tick version>-i<INDICATOR_VERSION>.npz
+
+Sử dụng:
+    from indicators import load_indicators
+    df = load_indicators("VIX")              # Tick + cột chỉ số, ngày gần nhất
+    df = load_indicators("VIX", "2025-07-25")
+
+    python indicators.py VIX VHM             # Tính trước và ghi cache
+"""
+
+import argparse
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from tick_store import STOCK_ANALYSIS_DIR, TickStore
+
+# Tăng khi công thức hoặc tham số thay đổi để bỏ qua cache cũ
+INDICATOR_VERSION = 1
+
+INDICATOR_COLUMNS = (
+    "MA5", "MA10", "MA20", "MA50",
+    "BB_middle", "BB_std", "BB_upper", "BB_lower",
+    "RSI",
+    "MACD", "MACD_signal", "MACD_histogram",
+    "%K", "%D",
+    "VWAP", "VWAP_std", "VWAP_upper", "VWAP_lower", "VWAP_upper2", "VWAP_lower2",
+)
+
+
+# ----------------------------------------------------------------------
+# Các hàm tính trên mảng NumPy
+# ----------------------------------------------------------------------
+def _windows(values: np.ndarray, window: int) -> Optional[np.ndarray]:
+    values = np.asarray(values, dtype="float64")
+    if window < 1 or window > len(values):
+        return None
+    return sliding_window_view(values, window)
+
+
+def _pad(result: np.ndarray, length: int) -> np.ndarray:
+    """Thêm NaN ở đầu để kết quả cùng độ dài với dữ liệu (giống pandas.rolling)"""
+    out = np.full(length, np.nan)
+    if len(result):
+        out[length - len(result):] = result
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trung bình trượt, NaN cho window-1 phần tử đầu"""
+    windows = _windows(values, window)
+    if windows is None:
+        return np.full(len(values), np.nan)
+    return _pad(windows.mean(axis=1), len(values))
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Độ lệch chuẩn trượt (ddof=1 như pandas)"""
+    windows = _windows(values, window)
+    if windows is None or window <= ddof:
+        return np.full(len(values), np.nan)
+    return _pad(windows.std(axis=1, ddof=ddof), len(values))
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    windows = _windows(values, window)
+    if windows is None:
+        return np.full(len(values), np.nan)
+    return _pad(windows.min(axis=1), len(values))
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    windows = _windows(values, window)
+    if windows is None:
+        return np.full(len(values), np.nan)
+    return _pad(windows.max(axis=1), len(values))
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Trung bình động hàm mũ, tương đương pandas ewm(span=span).mean()
+
+    EMA là phép đệ quy nên dùng bộ lọc đã biên dịch của pandas thay vì vòng lặp Python.
+    """
+    return pd.Series(np.asarray(values, dtype="float64")).ewm(span=span).mean().to_numpy()
+
+
+def rsi(values: np.ndarray, window: int = 14) -> np.ndarray:
+    """RSI theo trung bình đơn giản của lãi/lỗ (cùng công thức các script cũ)"""
+    values = np.asarray(values, dtype="float64")
+    delta = np.diff(values, prepend=values[:1]) if len(values) else values
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), window)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+
+def macd(values: np.ndarray, fast: int = 12, slow: int = 26,
+         signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD
+
+    Returns:
+        (macd, signal_line, histogram)
+    """
+    macd_line = ema(values, fast) - ema(values, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bollinger_bands(values: np.ndarray, window: int = 20,
+                    num_std: float = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands
+
+    Returns:
+        (upper, middle, lower)
+    """
+    middle = rolling_mean(values, window)
+    std = rolling_std(values, window)
+    return middle + std * num_std, middle, middle - std * num_std
+
+
+def stochastic(values: np.ndarray, window: int = 14,
+               smooth: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stochastic oscillator trên giá khớp lệnh
+
+    Returns:
+        (%K, %D)
+    """
+    low = rolling_min(values, window)
+    high = rolling_max(values, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = 100 * (np.asarray(values, dtype="float64") - low) / (high - low)
+    return k, rolling_mean(k, smooth)
+
+
+def vwap_bands(price: np.ndarray, volume: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    VWAP tích lũy trong phiên và độ lệch chuẩn có trọng số khối lượng
+
+    Returns:
+        (vwap, vwap_std)
+    """
+    price = np.asarray(price, dtype="float64")
+    volume = np.asarray(volume, dtype="float64")
+    cumulative_volume = np.cumsum(volume)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = np.cumsum(price * volume) / cumulative_volume
+        deviation = np.cumsum((price - vwap) ** 2 * volume)
+        return vwap, np.sqrt(deviation / cumulative_volume)
+
+
+def rolling_buy_sell_ratio(volume: np.ndarray, match_type: np.ndarray, window: int = 50,
+                           neutral: float = 1.0) -> np.ndarray:
+    """
+    Tỷ lệ khối lượng mua/bán trong `window` tick liền trước mỗi tick
+
+    Dùng tổng tích lũy của khối lượng có dấu (+mua, -bán) nên chi phí O(n) và
+    không phụ thuộc vào độ dài cửa sổ. Tick i dùng các tick [i-window, i),
+    giống vòng lặp df.iloc[i-window:i] trước đây.
+
+    Args:
+        volume: Mảng khối lượng
+        match_type: Mảng loại lệnh ('Buy'/'Sell'; giá trị khác không được tính)
+        window: Số tick trong cửa sổ
+        neutral: Giá trị khi chưa đủ cửa sổ hoặc không có khối lượng bán
+
+    Returns:
+        Mảng float64 cùng độ dài với volume
+    """
+    volume = np.asarray(volume, dtype="int64")
+    match_type = np.asarray(match_type, dtype=object)
+    n = len(volume)
+    ratio = np.full(n, neutral, dtype="float64")
+    if n <= window:
+        return ratio
+
+    is_buy = match_type == "Buy"
+    is_sell = match_type == "Sell"
+    signed = np.where(is_buy, volume, np.where(is_sell, -volume, 0))
+    traded = np.where(is_buy | is_sell, volume, 0)
+
+    # Tổng tích lũy có phần tử 0 ở đầu: tổng của [i-window, i) = c[i] - c[i-window]
+    signed_sum = np.concatenate(([0], np.cumsum(signed)))
+    traded_sum = np.concatenate(([0], np.cumsum(traded)))
+    window_signed = signed_sum[window:n] - signed_sum[:n - window]
+    window_traded = traded_sum[window:n] - traded_sum[:n - window]
+
+    buy_volume = (window_traded + window_signed) // 2
+    sell_volume = (window_traded - window_signed) // 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio[window:] = np.where(sell_volume > 0, buy_volume / np.maximum(sell_volume, 1), neutral)
+    return ratio
+
+
+def compute_indicators(price: np.ndarray, volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Tính tất cả chỉ số trong INDICATOR_COLUMNS
+
+    Cửa sổ được giới hạn bởi số tick (min(window, n)) để phiên ngắn vẫn có giá trị.
+
+    Args:
+        price: Mảng giá khớp lệnh theo thời gian
+        volume: Mảng khối lượng tương ứng
+
+    Returns:
+        Dict tên cột -> mảng float64 cùng độ dài với price
+    """
+    price = np.asarray(price, dtype="float64")
+    n = len(price)
+    if n == 0:
+        return {name: np.empty(0) for name in INDICATOR_COLUMNS}
+
+    def w(window):
+        return min(window, n)
+
+    columns = {
+        "MA5": rolling_mean(price, w(5)),
+        "MA10": rolling_mean(price, w(10)),
+        "MA20": rolling_mean(price, w(20)),
+        "MA50": rolling_mean(price, w(50)),
+    }
+
+    bb_upper, bb_middle, bb_lower = bollinger_bands(price, w(20))
+    columns.update(
+        BB_middle=bb_middle,
+        BB_std=rolling_std(price, w(20)),
+        BB_upper=bb_upper,
+        BB_lower=bb_lower,
+        RSI=rsi(price, w(14)),
+    )
+
+    macd_line, signal_line, histogram = macd(price)
+    columns.update(MACD=macd_line, MACD_signal=signal_line, MACD_histogram=histogram)
+
+    k, d = stochastic(price, w(14), w(3))
+    columns.update({"%K": k, "%D": d})
+
+    vwap, vwap_std = vwap_bands(price, volume)
+    columns.update(
+        VWAP=vwap,
+        VWAP_std=vwap_std,
+        VWAP_upper=vwap + vwap_std,
+        VWAP_lower=vwap - vwap_std,
+        VWAP_upper2=vwap + 2 * vwap_std,
+        VWAP_lower2=vwap - 2 * vwap_std,
+    )
+    return columns
+
+
+# ----------------------------------------------------------------------
+# Cache trên đĩa theo (mã, ngày, version)
+# ----------------------------------------------------------------------
+class IndicatorCache:
+    """
+    Cache các cột chỉ số theo ngày giao dịch, gắn với version dữ liệu tick
+    """
+
+    def __init__(self, base_dir: Union[str, Path] = STOCK_ANALYSIS_DIR,
+                 store: Optional[TickStore] = None):
+        """
+        Khởi tạo cache
+
+        Args:
+            base_dir: Thư mục gốc stock_analysis/
+            store: Tick store để đọc dữ liệu (mặc định theo base_dir)
+        """
+        self.base_dir = Path(base_dir)
+        self.store = store or TickStore(self.base_dir)
+
+    def cache_dir(self, symbol: str, day: str) -> Path:
+        """Thư mục cache chỉ số của một ngày giao dịch"""
+        return self.base_dir / symbol.upper() / "data" / "indicators" / day
+
+    def cache_path(self, symbol: str, day: str, version: int) -> Path:
+        """File cache ứng với version dữ liệu tick và INDICATOR_VERSION hiện tại"""
+        return self.cache_dir(symbol, day) / f"v{version}-i{INDICATOR_VERSION}.npz"
+
+    def _read(self, path: Path, length: int) -> Optional[Dict[str, np.ndarray]]:
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                columns = {name: data[name] for name in INDICATOR_COLUMNS}
+        except (OSError, KeyError, ValueError):
+            return None
+        if any(len(values) != length for values in columns.values()):
+            return None
+        return columns
+
+    def _write(self, path: Path, columns: Dict[str, np.ndarray]) -> None:
+        """Ghi file tạm rồi thay thế, xóa cache của các version cũ"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.parent / f".{path.stem}.tmp-{os.getpid()}.npz"
+        np.savez(tmp_path, **columns)
+        os.replace(tmp_path, path)
+
+        for old in path.parent.glob("v*.npz"):
+            if old != path:
+                old.unlink(missing_ok=True)
+
+    def get_columns(self, symbol: str, ticks: pd.DataFrame,
+                    day: Optional[str] = None, version: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Lấy các cột chỉ số cho DataFrame tick, đọc từ cache nếu có
+
+        Args:
+            symbol: Mã cổ phiếu
+            ticks: DataFrame tick (time, price, volume, ...)
+            day: Ngày giao dịch của ticks (None: không dùng cache)
+            version: Version dữ liệu tick trong meta.json
+
+        Returns:
+            Dict tên cột -> mảng cùng độ dài với ticks
+        """
+        if day is None or version is None:
+            return compute_indicators(ticks["price"].to_numpy(), ticks["volume"].to_numpy())
+
+        path = self.cache_path(symbol, day, version)
+        columns = self._read(path, len(ticks)) if path.exists() else None
+        if columns is None:
+            columns = compute_indicators(ticks["price"].to_numpy(), ticks["volume"].to_numpy())
+            try:
+                self._write(path, columns)
+            except OSError as e:
+                print(f"Không ghi được cache chỉ số {path}: {e}")
+        return columns
+
+    def load(self, symbol: str, day: Optional[str] = None) -> pd.DataFrame:
+        """
+        Đọc tick của một ngày kèm các cột chỉ số kỹ thuật
+
+        Args:
+            symbol: Mã cổ phiếu
+            day: Ngày giao dịch YYYY-MM-DD (mặc định ngày gần nhất)
+
+        Returns:
+            DataFrame tick (sắp xếp theo thời gian) với các cột INDICATOR_COLUMNS
+
+        Raises:
+            FileNotFoundError: nếu mã/ngày chưa có dữ liệu
+        """
+        symbol = symbol.upper()
+        day = day or self.store.latest_day(symbol)
+        meta = self.store.load_meta(symbol, day) if day else {}
+
+        ticks = self.store.load_ticks(symbol, day)
+        ticks = ticks.sort_values("time", kind="stable").reset_index(drop=True)
+
+        columns = self.get_columns(symbol, ticks, day if meta else None, meta.get("version"))
+        return pd.concat([ticks, pd.DataFrame(columns, index=ticks.index)], axis=1)
+
+
+_default_cache = None
+
+
+def _get_cache() -> IndicatorCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = IndicatorCache()
+    return _default_cache
+
+
+def load_indicators(symbol: str, day: Optional[str] = None) -> pd.DataFrame:
+    """Đọc tick kèm chỉ số kỹ thuật từ stock_analysis/ (xem IndicatorCache.load)"""
+    return _get_cache().load(symbol, day)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indicators - tính trước chỉ số kỹ thuật")
+    parser.add_argument("symbols", nargs="+", help="Mã cổ phiếu")
+    parser.add_argument("--day", help="Ngày giao dịch YYYY-MM-DD (mặc định ngày gần nhất)")
+
+    args = parser.parse_args()
+    for symbol in args.symbols:
+        try:
+            df = load_indicators(symbol, args.day)
+            print(f"Success {symbol.upper()}: {len(df)} ticks, {len(INDICATOR_COLUMNS)} indicators")
+        except FileNotFoundError as e:
+            print(f"Error {symbol.upper()}: {e}")
+
+
+if __name__ == "__main__":
+    main()
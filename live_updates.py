@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Live Updates - Đẩy thay đổi dữ liệu theo từng mã tới client qua Socket.IO
+
+Thay vì phát toàn bộ bản tóm tắt tới mọi client sau mỗi lần cập nhật, mỗi mã
+có một room riêng; client chỉ nhận các tick mới và các trường tóm tắt đã thay
+đổi của những mã đã đăng ký. Các cập nhật dồn dập của cùng một mã được gộp lại
+và phát tối đa một lần trong mỗi khoảng min_interval.
+
+Sử dụng:
+    from live_updates import DeltaPublisher
+    publisher = DeltaPublisher(lambda event, payload, room: socketio.emit(event, payload, to=room),
+                               snapshots)
+    update(symbols, mode="quick", on_result=publisher.publish)
+
+Client:
+    socket.emit('subscribe', {symbols: ['VIX', 'VHM']})
+    socket.on('stock_snapshot', ...)   // bản tóm tắt đầy đủ khi vừa đăng ký
+    socket.on('stock_delta', ...)      // {symbol, version, ticks, changes, reload}
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from dashboard_snapshot import SnapshotCache
+
+# Khoảng thời gian tối thiểu giữa hai lần phát của cùng một mã (giây)
+MIN_EMIT_INTERVAL = 1.0
+
+# Số tick mới tối đa trong một gói delta; nếu vượt quá client nên tải lại
+MAX_DELTA_TICKS = 500
+
+# Các trường tóm tắt được so sánh để phát phần thay đổi
+SUMMARY_FIELDS = (
+    'current_price', 'high_price', 'low_price', 'total_volume',
+    'buy_ratio', 'sell_ratio', 'data_points', 'last_updated',
+)
+
+
+class DeltaPublisher:
+    """
+    Gộp và phát các thay đổi dữ liệu theo từng mã tới room Socket.IO của mã đó
+    """
+
+    def __init__(self, emit: Callable[[str, Dict[str, Any], str], None],
+                 snapshots: SnapshotCache, min_interval: float = MIN_EMIT_INTERVAL,
+                 max_ticks: int = MAX_DELTA_TICKS):
+        """
+        Khởi tạo publisher
+
+        Args:
+            emit: Hàm phát sự kiện emit(event, payload, room)
+            snapshots: Cache bản tóm tắt dashboard
+            min_interval: Khoảng thời gian tối thiểu giữa hai lần phát của một mã (giây)
+            max_ticks: Số tick tối đa trong một gói delta
+        """
+        self.emit = emit
+        self.snapshots = snapshots
+        self.min_interval = min_interval
+        self.max_ticks = max_ticks
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._sent: Dict[str, Dict[str, Any]] = {}
+        self._last_emit: Dict[str, float] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, result: Dict[str, Any]) -> None:
+        """
+        Ghi nhận kết quả cập nhật của một mã (dùng làm on_result của update_pipeline)
+
+        Args:
+            result: Dict kết quả của update_pipeline.update_symbol
+        """
+        if result.get('status') != 'success':
+            return
+
+        symbol = result['symbol']
+        new_ticks = result.get('new_ticks')
+        if not new_ticks and new_ticks is not None:
+            return  # Không có tick mới
+
+        with self._lock:
+            pending = self._pending.setdefault(symbol, {'ticks': [], 'reload': False})
+            if new_ticks is None:
+                # Chế độ full ghi đè dữ liệu của ngày: client cần tải lại thay vì nối thêm
+                pending['reload'] = True
+            else:
+                pending['ticks'].extend(new_ticks)
+
+            if symbol in self._timers:
+                return
+            delay = self._last_emit.get(symbol, 0.0) + self.min_interval - time.monotonic()
+            if delay > 0:
+                timer = threading.Timer(delay, self.flush, args=(symbol,))
+                timer.daemon = True
+                self._timers[symbol] = timer
+                timer.start()
+                return
+
+        self.flush(symbol)
+
+    def flush(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Phát ngay các thay đổi đang chờ của một mã
+
+        Args:
+            symbol: Mã cổ phiếu
+
+        Returns:
+            Gói delta đã phát, None nếu không có gì để phát
+        """
+        with self._lock:
+            self._timers.pop(symbol, None)
+            pending = self._pending.pop(symbol, None)
+            if pending is None:
+                return None
+            self._last_emit[symbol] = time.monotonic()
+
+        snapshot = self.snapshots.get(symbol) or {}
+        changes = self._diff(symbol, snapshot)
+        ticks: List[Dict[str, Any]] = pending['ticks']
+        reload = pending['reload'] or len(ticks) > self.max_ticks
+
+        payload = {
+            'symbol': symbol,
+            'version': snapshot.get('version'),
+            'ticks': [] if reload else ticks,
+            'changes': changes,
+            'reload': reload,
+        }
+        self.emit('stock_delta', payload, symbol)
+        return payload
+
+    def _diff(self, symbol: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Các trường tóm tắt khác với lần phát trước và ghi nhớ giá trị mới"""
+        previous = self._sent.get(symbol, {})
+        changes = {
+            field: snapshot[field] for field in SUMMARY_FIELDS
+            if field in snapshot and previous.get(field) != snapshot[field]
+        }
+        self._sent[symbol] = {field: snapshot.get(field) for field in SUMMARY_FIELDS}
+        return changes
+
+    def snapshot(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Bản tóm tắt đầy đủ gửi cho client khi vừa đăng ký một mã"""
+        return self.snapshots.get(symbol)
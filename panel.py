@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Panel - Dữ liệu nhiều mã trong một bảng (thời gian x mã) cho phân tích danh mục
+
+Giá đóng cửa và khối lượng của mọi mã được nạp một lần vào hai DataFrame cùng
+trục thời gian, tỷ số tài chính mới nhất của từng mã vào một bảng (mã x chỉ
+tiêu). Các phép tính liên mã (tương quan, sức mạnh tương đối, beta, so sánh
+đồng nghiệp) chạy vector hóa trên cả bảng thay vì đọc file và lặp theo từng mã.
+
+Nguồn giá:
+    daily     Nến ngày từ history store (mặc định)
+    intraday  Nến trong ngày từ bar store (interval 1m/5m/15m/1h, ngày gần nhất)
+
+Sử dụng:
+    from panel import Panel
+    panel = Panel.load(["VIX", "VHM", "VIC"])
+    panel.correlation()
+    panel.relative_strength()
+    panel.peer_comparison("VIX")
+
+    python panel.py [VIX VHM ...] [--source intraday --interval 5m] [--start 2024-01-01]
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from tick_store import BASE_DIR, STOCK_ANALYSIS_DIR
+
+CONFIG_FILE = BASE_DIR / "automation" / "config" / "stocks_config.json"
+
+PANEL_SOURCES = ("daily", "intraday")
+
+# Tên chỉ tiêu -> hậu tố cột trong <SYMBOL>_financial_ratios.json
+# (tiền tố nhóm khác nhau giữa các ngành, vd. "Chỉ tiêu khả năng sinh lợi_ROE (%)"
+# và "Chỉ tiêu hiệu quả_ROE (%)")
+PANEL_RATIOS = {
+    "roe": "ROE (%)",
+    "roa": "ROA (%)",
+    "net_margin": "Biên lợi nhuận ròng (%)",
+    "pe": "P/E",
+    "pb": "P/B",
+    "eps": "EPS (VND)",
+    "debt_to_equity": "Nợ/VCSH",
+    # Tên cột ghi "Tỷ đồng" nhưng giá trị thực tế tính bằng đồng (VIX ~2.7e13)
+    "market_cap": "Vốn hóa (Tỷ đồng)",
+}
+
+# Các chỉ tiêu nguồn lưu dạng tỷ lệ (0.05) được đổi sang phần trăm (5.0)
+PERCENT_RATIOS = ("roe", "roa", "net_margin")
+
+# Chỉ tiêu càng thấp càng tốt khi xếp hạng đồng nghiệp
+LOWER_IS_BETTER = ("pe", "pb", "debt_to_equity")
+
+TRADING_DAYS = 252
+
+
+def active_symbols(config_file: Union[str, Path] = CONFIG_FILE) -> List[str]:
+    """Các mã đang theo dõi (active_stocks trong stocks_config.json)"""
+    config_file = Path(config_file)
+    if not config_file.exists():
+        return []
+    with open(config_file, "r", encoding="utf-8") as f:
+        return [symbol.upper() for symbol in json.load(f).get("active_stocks", [])]
+
+
+def latest_ratios(payload: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Các chỉ tiêu PANEL_RATIOS của kỳ mới nhất trong một file financial_ratios
+
+    Args:
+        payload: Nội dung <SYMBOL>_financial_ratios.json
+
+    Returns:
+        Dict tên chỉ tiêu -> giá trị (NaN nếu không có)
+    """
+    df = pd.DataFrame(payload.get("data") or [])
+    result = {name: np.nan for name in PANEL_RATIOS}
+    if df.empty:
+        return result
+
+    order = [column for column in ("Meta_Năm", "Meta_Kỳ") if column in df.columns]
+    latest = df.sort_values(order).iloc[-1] if order else df.iloc[0]
+    for name, suffix in PANEL_RATIOS.items():
+        columns = [column for column in df.columns
+                   if column == suffix or str(column).endswith("_" + suffix)]
+        if columns:
+            value = pd.to_numeric(latest[columns[0]], errors="coerce")
+            result[name] = value * 100 if name in PERCENT_RATIOS else value
+    return result
+
+
+class Panel:
+    """
+    Giá, khối lượng (thời gian x mã) và tỷ số tài chính (mã x chỉ tiêu) của nhiều mã
+    """
+
+    def __init__(self, prices: pd.DataFrame, volume: pd.DataFrame, ratios: pd.DataFrame,
+                 source: str = "daily"):
+        """
+        Khởi tạo panel
+
+        Args:
+            prices: Giá đóng cửa, index thời gian, mỗi cột một mã
+            volume: Khối lượng, cùng index/cột với prices
+            ratios: Tỷ số tài chính, index mã, cột PANEL_RATIOS
+            source: Nguồn giá (daily, intraday), dùng để quy đổi biến động theo năm
+        """
+        self.prices = prices
+        self.volume = volume
+        self.ratios = ratios
+        self.source = source
+
+    @classmethod
+    def load(cls, symbols: Optional[Iterable[str]] = None, source: str = "daily",
+             interval: str = "5m", start: Optional[str] = None,
+             base_dir: Union[str, Path] = STOCK_ANALYSIS_DIR) -> "Panel":
+        """
+        Nạp panel cho danh sách mã trong một lượt
+
+        Args:
+            symbols: Danh sách mã (mặc định các mã active)
+            source: 'daily' (history store) hoặc 'intraday' (bar store)
+            interval: Khung nến khi source='intraday'
+            start: Ngày bắt đầu YYYY-MM-DD khi source='daily'
+            base_dir: Thư mục gốc stock_analysis/
+
+        Returns:
+            Panel; mã không có dữ liệu giá vẫn có dòng tỷ số tài chính
+        """
+        if source not in PANEL_SOURCES:
+            raise ValueError(f"Unknown panel source: {source}")
+        base_dir = Path(base_dir)
+        symbols = list(dict.fromkeys(s.upper() for s in (symbols or active_symbols())))
+
+        frames = []
+        if source == "daily":
+            from history_store import HistoryStore
+            store = HistoryStore(base_dir)
+            load = lambda symbol: store.load(symbol, start=start)
+        else:
+            from bars import BarStore
+            store = BarStore(base_dir)
+            load = lambda symbol: store.load(symbol, interval)
+
+        for symbol in symbols:
+            try:
+                df = load(symbol)
+            except FileNotFoundError:
+                continue
+            if not df.empty:
+                frames.append(df[["time", "close", "volume"]].assign(symbol=symbol))
+
+        if frames:
+            long = pd.concat(frames, ignore_index=True)
+            prices = long.pivot_table(index="time", columns="symbol", values="close", aggfunc="last")
+            volume = long.pivot_table(index="time", columns="symbol", values="volume", aggfunc="sum")
+        else:
+            prices = volume = pd.DataFrame(index=pd.DatetimeIndex([], name="time"))
+        prices = prices.reindex(columns=symbols).sort_index()
+        volume = volume.reindex(index=prices.index, columns=symbols)
+
+        ratios = {}
+        for symbol in symbols:
+            path = base_dir / symbol / "data" / f"{symbol}_financial_ratios.json"
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    ratios[symbol] = latest_ratios(json.load(f))
+        ratios = pd.DataFrame.from_dict(ratios, orient="index", columns=list(PANEL_RATIOS))
+
+        return cls(prices, volume, ratios.reindex(symbols), source)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.prices.columns)
+
+    # ------------------------------------------------------------------
+    # Phân tích giá
+    # ------------------------------------------------------------------
+    def returns(self) -> pd.DataFrame:
+        """Lợi suất từng kỳ (thời gian x mã); kỳ thiếu giá không được lấp"""
+        return self.prices.pct_change(fill_method=None)
+
+    def benchmark(self) -> pd.Series:
+        """Lợi suất rổ đồng tỷ trọng của các mã trong panel"""
+        return self.returns().mean(axis=1, skipna=True)
+
+    def correlation(self, min_periods: int = 20) -> pd.DataFrame:
+        """Ma trận tương quan lợi suất giữa các mã"""
+        return self.returns().corr(min_periods=min_periods)
+
+    def relative_strength(self) -> pd.DataFrame:
+        """
+        Sức mạnh tương đối: giá chuẩn hóa của từng mã chia cho chỉ số rổ đồng tỷ trọng
+
+        Returns:
+            DataFrame (thời gian x mã); > 1 là mạnh hơn rổ kể từ đầu panel
+        """
+        normalized = self.prices.ffill() / self.prices.bfill().iloc[0]
+        basket = (1 + self.benchmark().fillna(0)).cumprod()
+        return normalized.div(basket, axis=0)
+
+    def beta(self) -> pd.Series:
+        """Beta của từng mã so với rổ đồng tỷ trọng (chỉ trên các kỳ mã có giá)"""
+        r = self.returns().to_numpy(dtype=np.float64)
+        b = self.benchmark().to_numpy(dtype=np.float64)[:, None]
+        valid = ~np.isnan(r) & ~np.isnan(b)
+        count = valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_r = np.where(valid, r, 0).sum(axis=0) / count
+            mean_b = np.where(valid, b, 0).sum(axis=0) / count
+            covariance = np.where(valid, (r - mean_r) * (b - mean_b), 0).sum(axis=0)
+            variance = np.where(valid, (b - mean_b) ** 2, 0).sum(axis=0)
+            beta = covariance / variance
+        return pd.Series(beta, index=self.prices.columns)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Chỉ số tổng hợp của từng mã, tính trên toàn bộ panel cùng lúc
+
+        Returns:
+            DataFrame index mã, cột last_price, change_pct, volatility_pct,
+            max_drawdown_pct, relative_strength, beta, avg_volume
+        """
+        columns = ["last_price", "change_pct", "volatility_pct", "max_drawdown_pct",
+                   "relative_strength", "beta", "avg_volume"]
+        if self.prices.empty:
+            return pd.DataFrame(index=self.prices.columns, columns=columns, dtype=np.float64)
+
+        prices = self.prices.ffill()
+        returns = self.returns()
+        # Biến động quy đổi theo năm với nến ngày, theo cả phiên với nến trong ngày
+        periods = TRADING_DAYS if self.source == "daily" else len(returns)
+        first = self.prices.bfill().iloc[0]
+        last = prices.iloc[-1]
+        drawdown = prices / prices.cummax() - 1
+
+        return pd.DataFrame({
+            "last_price": last,
+            "change_pct": (last / first - 1) * 100,
+            "volatility_pct": returns.std() * np.sqrt(periods) * 100,
+            "max_drawdown_pct": drawdown.min() * 100,
+            "relative_strength": self.relative_strength().iloc[-1],
+            "beta": self.beta(),
+            "avg_volume": self.volume.mean(),
+        }, columns=columns)
+
+    # ------------------------------------------------------------------
+    # So sánh đồng nghiệp
+    # ------------------------------------------------------------------
+    def peer_ranks(self) -> pd.DataFrame:
+        """Xếp hạng phần trăm (0-100, cao là tốt) của từng mã theo từng chỉ tiêu"""
+        ranks = self.ratios.rank(pct=True) * 100
+        for name in LOWER_IS_BETTER:
+            # P/E âm (lỗ) không được coi là rẻ
+            values = self.ratios[name].where(self.ratios[name] > 0)
+            ranks[name] = (1 - values.rank(pct=True)) * 100 + 100 / max(1, values.count())
+        return ranks
+
+    def peer_comparison(self, symbol: str) -> pd.DataFrame:
+        """
+        Bảng so sánh tỷ số tài chính của một mã với các mã khác trong panel
+
+        Args:
+            symbol: Mã cần so sánh
+
+        Returns:
+            DataFrame index gồm symbol, các mã khác và 'Trung vị', cột PANEL_RATIOS
+        """
+        symbol = symbol.upper()
+        peers = [s for s in self.ratios.index if s != symbol]
+        table = self.ratios.reindex([symbol] + peers)
+        table.loc["Trung vị"] = self.ratios.loc[peers].median() if peers else np.nan
+        return table
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Kết quả phân tích dạng có thể serialize JSON"""
+        clean = lambda df: json.loads(df.to_json(orient="index"))
+        return {
+            "symbols": self.symbols,
+            "source": self.source,
+            "start": self.prices.index[0].isoformat() if len(self.prices) else None,
+            "end": self.prices.index[-1].isoformat() if len(self.prices) else None,
+            "summary": clean(self.summary()),
+            "correlation": clean(self.correlation()),
+            "ratios": clean(self.ratios),
+            "peer_ranks": clean(self.peer_ranks()),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Panel - phân tích nhiều mã cùng lúc")
+    parser.add_argument("symbols", nargs="*", help="Mã cổ phiếu (mặc định các mã active)")
+    parser.add_argument("--source", choices=PANEL_SOURCES, default="daily", help="Nguồn giá")
+    parser.add_argument("--interval", default="5m", help="Khung nến khi --source intraday")
+    parser.add_argument("--start", help="Ngày bắt đầu YYYY-MM-DD (nguồn daily)")
+
+    args = parser.parse_args()
+    panel = Panel.load(args.symbols or None, source=args.source, interval=args.interval, start=args.start)
+    if not panel.symbols:
+        print("No symbols")
+        return
+
+    with pd.option_context("display.width", 160, "display.max_columns", 20):
+        print("=== Tổng hợp ===")
+        print(panel.summary().round(2))
+        print("\n=== Tương quan lợi suất ===")
+        print(panel.correlation().round(2))
+        print("\n=== Tỷ số tài chính ===")
+        print(panel.ratios.round(2))
+
+
+if __name__ == "__main__":
+    main()
@@ -30,7 +30,8 @@ def main():
     
     # Check if data exists
     data_path = Path(f"stock_analysis/{symbol}/data/{symbol}_intraday_data.json")
-    if not data_path.exists():
+    ticks_path = Path(f"stock_analysis/{symbol}/data/ticks")
+    if not ticks_path.exists() and not data_path.exists():
         print(f"WARNING: Chua co du lieu cho {symbol}")
         print(f"LOADING: Dang tai du lieu...")
         
@@ -6,49 +6,26 @@ Ví dụ: python quick_update.py VIX HSG
 """
 
 import sys
-import json
 from pathlib import Path
-from stock_data_collector import StockDataCollector
-from datetime import datetime
+from update_pipeline import update_symbol
 
 def quick_update_intraday(symbols):
     """
     Cập nhật nhanh dữ liệu intraday
     """
-    collector = StockDataCollector()
-    
     for symbol in symbols:
         symbol = symbol.upper()
-        data_dir = Path(f"stock_analysis/{symbol}/data")
+        print(f"Updating {symbol}...")
         
-        if not data_dir.exists():
-            print(f"Directory not found: {data_dir}")
-            continue
+        # Chỉ lấy các giao dịch mới sau tick cuối đã lưu
+        result = update_symbol(symbol, mode="quick")
         
-        print(f"Updating {symbol}...")
+        if result["status"] != "success":
+            print(f"Error: {result['error']}")
+            continue
         
-        try:
-            # Lấy dữ liệu mới
-            data = collector.get_intraday_data(symbol)
-            
-            if "error" in data:
-                print(f"Error: {data['error']}")
-                continue
-            
-            # Lưu file
-            file_path = data_dir / f"{symbol}_intraday_data.json"
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-            
-            # Hiển thị thông tin
-            data_points = data.get('data_points', 0)
-            timestamp = data.get('timestamp', datetime.now().isoformat())
-            
-            print(f"Success {symbol}: {data_points} data points")
-            print(f"   Updated: {timestamp}")
-            
-        except Exception as e:
-            print(f"Error updating {symbol}: {str(e)}")
+        print(f"Success {symbol}: +{result['appended']} new data points")
+        print(f"   Updated: {result['timestamp']}")
 
 def main():
     if len(sys.argv) < 2:
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Report Assets - Ảnh biểu đồ trong báo cáo HTML dạng file tham chiếu có hash nội dung
+
+Thay vì nhúng base64 mọi ảnh PNG vào HTML (tăng ~33% kích thước, trình duyệt
+phải tải hết ngay từ đầu và không cache được), mỗi biểu đồ được sao chép một
+lần thành stock_analysis/<SYMBOL>/charts/assets/<nhóm>/<tên>.<hash>.png. Tên
+file đổi khi nội dung đổi nên có thể phục vụ với Cache-Control immutable;
+báo cáo dùng <img loading="lazy"> trỏ tới file đó.
+
+Chế độ inline (nhúng base64) vẫn có cho việc xuất một file HTML duy nhất:
+    ChartAssets("VHM", mode="inline") hoặc biến môi trường REPORT_ASSET_MODE=inline
+
+Sử dụng:
+    from report_assets import ChartAssets
+    assets = ChartAssets("VHM")
+    html = assets.img_tag(Path("stock_analysis/VHM/charts/key_charts/price_trend.png"), "Price Trend")
+    assets.save()
+"""
+
+import base64
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from tick_store import STOCK_ANALYSIS_DIR
+
+# reference: <img> trỏ tới file có hash; inline: nhúng base64 (xuất một file)
+ASSET_MODES = ("reference", "inline")
+
+DEFAULT_ASSET_MODE = os.environ.get("REPORT_ASSET_MODE", "reference")
+
+ASSETS_DIRNAME = "assets"
+
+MANIFEST_NAME = "manifest.json"
+
+HASH_LENGTH = 12
+
+# Header cho file có hash trong tên: nội dung không bao giờ đổi dưới cùng một URL
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{%d}\.[A-Za-z0-9]+$" % HASH_LENGTH)
+
+
+def is_hashed_asset(path: Union[str, Path]) -> bool:
+    """File nằm trong charts/assets/ và có hash nội dung trong tên"""
+    posix = Path(path).as_posix()
+    return f"/charts/{ASSETS_DIRNAME}/" in f"/{posix}" and bool(_HASHED_NAME.search(posix))
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+class ChartAssets:
+    """
+    Ảnh biểu đồ của một mã dùng trong báo cáo (tham chiếu có hash hoặc nhúng base64)
+    """
+
+    def __init__(self, symbol: str, base_dir: Union[str, Path] = STOCK_ANALYSIS_DIR,
+                 mode: Optional[str] = None):
+        """
+        Khởi tạo
+
+        Args:
+            symbol: Mã cổ phiếu
+            base_dir: Thư mục gốc stock_analysis/
+            mode: 'reference' hoặc 'inline' (mặc định DEFAULT_ASSET_MODE)
+        """
+        self.symbol = symbol.upper()
+        self.base_dir = Path(base_dir).resolve()
+        self.mode = mode or DEFAULT_ASSET_MODE
+        if self.mode not in ASSET_MODES:
+            raise ValueError(f"Unknown report asset mode: {self.mode}")
+
+        self.charts_dir = self.base_dir / self.symbol / "charts"
+        self.assets_dir = self.charts_dir / ASSETS_DIRNAME
+        self.report_dir = self.base_dir / self.symbol / "reports"
+        self.manifest_path = self.assets_dir / MANIFEST_NAME
+        self._entries = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            return {}
+
+    def save(self) -> None:
+        """Ghi manifest nếu có ảnh mới được xuất bản (ghi tạm rồi đổi tên)"""
+        if not self._dirty:
+            return
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.assets_dir, prefix=MANIFEST_NAME, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"entries": self._entries}, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._dirty = False
+
+    def publish(self, chart: Union[str, Path]) -> Path:
+        """
+        Bản sao có hash nội dung của một ảnh biểu đồ (chỉ hash/sao chép lại khi file đổi)
+
+        Phiên bản trước của cùng biểu đồ được giữ lại một vòng để các trang
+        báo cáo đang mở vẫn tải được ảnh; các phiên bản cũ hơn bị xóa.
+
+        Args:
+            chart: Đường dẫn ảnh trong charts/
+
+        Returns:
+            Đường dẫn file trong charts/assets/
+        """
+        chart = Path(chart).resolve()
+        key = chart.relative_to(self.charts_dir).as_posix()
+        stat = chart.stat()
+        entry = self._entries.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            asset = self.assets_dir / entry["asset"]
+            if asset.exists():
+                return asset
+
+        relative = Path(key)
+        name = f"{relative.stem}.{_file_digest(chart)}{relative.suffix}"
+        asset_key = (relative.parent / name).as_posix()
+        asset = self.assets_dir / asset_key
+        if not asset.exists():
+            asset.parent.mkdir(parents=True, exist_ok=True)
+            # Ảnh gốc bị ghi đè tại chỗ khi vẽ lại nên phải sao chép, không dùng hard link
+            tmp_path = asset.with_name(asset.name + ".tmp")
+            shutil.copyfile(chart, tmp_path)
+            os.replace(tmp_path, asset)
+
+        previous = entry.get("asset") if entry else None
+        if previous and previous != asset_key:
+            stale = entry.get("previous")
+            if stale and stale not in (asset_key, previous):
+                (self.assets_dir / stale).unlink(missing_ok=True)
+        else:
+            previous = entry.get("previous") if entry else None
+
+        self._entries[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                              "asset": asset_key, "previous": previous}
+        self._dirty = True
+        return asset
+
+    def src(self, chart: Union[str, Path], report_dir: Optional[Union[str, Path]] = None) -> str:
+        """
+        Giá trị thuộc tính src của ảnh trong báo cáo
+
+        Args:
+            chart: Đường dẫn ảnh trong charts/
+            report_dir: Thư mục chứa file báo cáo (mặc định stock_analysis/<SYMBOL>/reports)
+
+        Returns:
+            URL tương đối tới file có hash, hoặc data URI ở chế độ inline
+        """
+        chart = Path(chart)
+        if self.mode == "inline":
+            mime = mimetypes.guess_type(chart.name)[0] or "application/octet-stream"
+            return f"data:{mime};base64,{base64.b64encode(chart.read_bytes()).decode()}"
+
+        asset = self.publish(chart)
+        return Path(os.path.relpath(asset, Path(report_dir or self.report_dir).resolve())).as_posix()
+
+    def img_attrs(self) -> str:
+        """Thuộc tính thêm cho <img>: tải lười khi ảnh là file tham chiếu"""
+        return ' loading="lazy" decoding="async"' if self.mode == "reference" else ""
+
+    def img_tag(self, chart: Union[str, Path], alt: str, style: str = "",
+                report_dir: Optional[Union[str, Path]] = None) -> str:
+        """Thẻ <img> của một biểu đồ (xem src)"""
+        style_attr = f' style="{style}"' if style else ""
+        return f'<img src="{self.src(chart, report_dir)}" alt="{alt}"{style_attr}{self.img_attrs()}>'
@@ -88,6 +88,17 @@ def check_stock_data():
     
     # Check if at least one has recent data
     for stock_dir in stock_dirs:
+        # Tick store: each trading day has a meta.json with the tick count
+        for meta_file in sorted((stock_dir / 'data' / 'ticks').glob('*/meta.json'), reverse=True):
+            try:
+                with open(meta_file, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if meta.get('data_points', 0) > 0:
+                    print(f"✅ Found data for {stock_dir.name} ({meta.get('data_points', 0)} points)")
+                    return True
+            except:
+                continue
+        
         data_file = stock_dir / 'data' / f'{stock_dir.name}_intraday_data.json'
         if data_file.exists():
             try:
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Series API - Dữ liệu chuỗi thời gian gọn nhẹ cho biểu đồ tương tác phía trình duyệt
+
+Tick của một ngày (kèm các cột chỉ số đã cache) được rút gọn (LTTB hoặc
+min/max, xem downsample.py) về tối đa max_points điểm và mã hóa theo cột:
+    json: {"t0", "columns": {"t": [giây tính từ t0], "price": [...], ...}}
+          (t0 là epoch giây của giờ địa phương TIMEZONE, không quy đổi UTC)
+    bin:  b"VNS1" + uint32 độ dài header + header JSON + các mảng little-endian
+          (t: int32, side: int8, còn lại float32), mỗi mảng căn theo 4 byte
+
+Kết quả đã mã hóa được giữ trong bộ nhớ theo (mã, ngày, version dữ liệu, tham số)
+nên các request lặp lại không phải đọc và gộp lại tick.
+
+Sử dụng:
+    from series_api import SeriesService
+    service = SeriesService(TickStore())
+    body, meta = service.get("VIX", fields=["price", "volume", "MA20"], max_points=1500, fmt="json")
+"""
+
+import json
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from downsample import DOWNSAMPLE_METHODS, downsample_indices
+from indicators import INDICATOR_COLUMNS, IndicatorCache
+from tick_store import TIMEZONE, TickStore
+
+# Cột có thể yêu cầu: price, volume, side (+1 mua ròng, -1 bán ròng) và các cột chỉ số
+SERIES_FIELDS = ("price", "volume", "side") + tuple(INDICATOR_COLUMNS)
+DEFAULT_FIELDS = ("price", "volume", "side", "MA20", "BB_upper", "BB_lower", "VWAP")
+
+DEFAULT_MAX_POINTS = 2000
+MAX_POINTS_LIMIT = 20000
+
+SERIES_FORMATS = ("json", "bin")
+BINARY_MAGIC = b"VNS1"
+
+# Số kết quả đã mã hóa được giữ trong bộ nhớ
+CACHE_SIZE = 128
+
+
+def build_series(df: pd.DataFrame, fields: Iterable[str] = DEFAULT_FIELDS,
+                 max_points: int = DEFAULT_MAX_POINTS, method: str = "lttb") -> Dict[str, np.ndarray]:
+    """
+    Rút gọn DataFrame tick thành các cột để vẽ
+
+    Các điểm được chọn theo giá bằng downsample (LTTB hoặc min/max); giá và
+    chỉ số lấy tại điểm được chọn, khối lượng và chiều mua/bán ròng được cộng
+    dồn từ sau điểm được chọn trước đến điểm hiện tại nên tổng khối lượng không đổi.
+
+    Args:
+        df: DataFrame tick sắp xếp theo thời gian, kèm các cột chỉ số
+        fields: Các cột cần lấy (trong SERIES_FIELDS)
+        max_points: Số điểm tối đa
+        method: Phương pháp rút gọn ('lttb' hoặc 'minmax')
+
+    Returns:
+        Dict tên cột -> mảng numpy, luôn có cột 't' (datetime64[s])
+    """
+    n = len(df)
+    times = df["time"].to_numpy(dtype="datetime64[s]")
+    kept = downsample_indices(times, df["price"].to_numpy(), max_points, method)
+    starts = np.concatenate(([0], kept[:-1] + 1)) if n else kept
+
+    columns = {"t": times[kept]}
+    for field in fields:
+        if field == "volume":
+            volume = df["volume"].to_numpy(dtype=np.int64)
+            columns["volume"] = np.add.reduceat(volume, starts) if n else volume
+        elif field == "side":
+            match_type = df["match_type"].astype(str).to_numpy()
+            signed = np.where(match_type == "Buy", 1, np.where(match_type == "Sell", -1, 0))
+            signed = signed * df["volume"].to_numpy(dtype=np.int64)
+            columns["side"] = np.sign(np.add.reduceat(signed, starts)).astype(np.int8) if n else signed
+        else:
+            columns[field] = df[field].to_numpy(dtype=np.float64)[kept]
+    return columns
+
+
+def encode_json(columns: Dict[str, np.ndarray], meta: Dict[str, Any]) -> bytes:
+    """Mã hóa các cột thành JSON theo cột (thời gian tính bằng giây từ t0, NaN -> null)"""
+    times = columns["t"].astype(np.int64)
+    t0 = int(times[0]) if len(times) else 0
+
+    encoded = {"t": (times - t0).tolist()}
+    for name, values in columns.items():
+        if name == "t":
+            continue
+        if values.dtype.kind == "f":
+            rounded = np.round(values, 4)
+            encoded[name] = [None if v != v else v for v in rounded.tolist()]
+        else:
+            encoded[name] = values.tolist()
+
+    payload = dict(meta, t0=t0, columns=encoded)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def encode_binary(columns: Dict[str, np.ndarray], meta: Dict[str, Any]) -> bytes:
+    """Mã hóa các cột thành khối nhị phân (header JSON + mảng typed little-endian)"""
+    times = columns["t"].astype(np.int64)
+    t0 = int(times[0]) if len(times) else 0
+
+    arrays: List[Tuple[str, np.ndarray]] = [("t", (times - t0).astype("<i4"))]
+    for name, values in columns.items():
+        if name == "t":
+            continue
+        dtype = "<i1" if name == "side" else "<f4"
+        arrays.append((name, values.astype(dtype)))
+
+    header = dict(meta, t0=t0, columns=[
+        {"name": name, "dtype": array.dtype.str.lstrip("<|"), "length": len(array)}
+        for name, array in arrays
+    ])
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    header_bytes += b" " * (-len(header_bytes) % 4)
+
+    parts = [BINARY_MAGIC, struct.pack("<I", len(header_bytes)), header_bytes]
+    for _, array in arrays:
+        data = array.tobytes()
+        parts.append(data + b"\0" * (-len(data) % 4))
+    return b"".join(parts)
+
+
+class SeriesService:
+    """
+    Phục vụ chuỗi dữ liệu đã rút gọn và mã hóa, cache theo version dữ liệu
+    """
+
+    def __init__(self, store: Optional[TickStore] = None, cache_size: int = CACHE_SIZE):
+        """
+        Khởi tạo service
+
+        Args:
+            store: Tick store để đọc dữ liệu (mặc định stock_analysis/)
+            cache_size: Số kết quả đã mã hóa được giữ trong bộ nhớ
+        """
+        self.store = store or TickStore()
+        self.indicators = IndicatorCache(self.store.base_dir, self.store)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, Tuple[bytes, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, fields: Optional[Iterable[str]] = None,
+            max_points: int = DEFAULT_MAX_POINTS, fmt: str = "json",
+            day: Optional[str] = None, method: str = "lttb") -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Lấy chuỗi dữ liệu đã mã hóa của một mã
+
+        Args:
+            symbol: Mã cổ phiếu
+            fields: Các cột cần lấy (mặc định DEFAULT_FIELDS)
+            max_points: Số điểm tối đa (giới hạn bởi MAX_POINTS_LIMIT)
+            fmt: Định dạng mã hóa ('json' hoặc 'bin')
+            day: Ngày giao dịch YYYY-MM-DD (mặc định ngày gần nhất)
+            method: Phương pháp rút gọn ('lttb' hoặc 'minmax')
+
+        Returns:
+            (nội dung đã mã hóa, meta gồm symbol, day, version, points, total_points, fields)
+
+        Raises:
+            ValueError: nếu cột, định dạng hoặc phương pháp rút gọn không hợp lệ
+            FileNotFoundError: nếu mã/ngày chưa có dữ liệu
+        """
+        symbol = symbol.upper()
+        fields = tuple(dict.fromkeys(fields or DEFAULT_FIELDS))
+        unknown = [field for field in fields if field not in SERIES_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown series fields: {', '.join(unknown)}")
+        if fmt not in SERIES_FORMATS:
+            raise ValueError(f"Unknown series format: {fmt}")
+        if method not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"Unknown downsample method: {method}")
+        max_points = max(1, min(int(max_points), MAX_POINTS_LIMIT))
+
+        day = day or self.store.latest_day(symbol)
+        meta = self.store.load_meta(symbol, day) if day else {}
+        # Dữ liệu JSON cũ (chưa migrate) không có version nên không được cache
+        key = None
+        if meta.get("version") is not None:
+            key = (symbol, day, meta["version"], meta.get("data_points"), fields, max_points, fmt, method)
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    return cached
+
+        df = self.indicators.load(symbol, day)
+        columns = build_series(df, fields, max_points, method)
+        series_meta = {
+            "symbol": symbol,
+            "day": day,
+            "version": meta.get("version"),
+            "points": len(columns["t"]),
+            "total_points": len(df),
+            "fields": list(fields),
+            "method": method,
+            "timezone": TIMEZONE,
+        }
+        body = encode_binary(columns, series_meta) if fmt == "bin" else encode_json(columns, series_meta)
+
+        if key is not None:
+            with self._lock:
+                self._cache[key] = (body, series_meta)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return body, series_meta
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Static Assets - Phục vụ báo cáo và biểu đồ trong stock_analysis/ với cache HTTP
+
+- ETag mạnh từ hash nội dung file (hash được nhớ theo size/mtime, không tính lại mỗi request)
+- Cache-Control: file có hash trong tên (report_assets) là immutable một năm,
+  các file khác luôn được kiểm tra lại (trả 304 khi không đổi)
+- Bản nén sẵn .br/.gz nằm cạnh file gốc, được tạo lúc dựng báo cáo bằng
+  precompress(); bản nén cũ hơn file gốc không được dùng
+- Phần phục vụ HTTP (Range, If-None-Match) do app.py thực hiện với send_file
+
+Sử dụng:
+    from static_assets import StaticAssets, precompress
+    precompress("stock_analysis/VIC/reports/VIC_comprehensive_report.html")
+    asset = StaticAssets("stock_analysis").resolve("VIC/reports/VIC_comprehensive_report.html", "gzip, br")
+
+    python static_assets.py [--root stock_analysis]    # nén sẵn báo cáo và biểu đồ dạng văn bản
+"""
+
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from report_assets import IMMUTABLE_CACHE_CONTROL, MANIFEST_NAME as ASSETS_MANIFEST, is_hashed_asset
+from tick_store import STOCK_ANALYSIS_DIR
+
+try:
+    import brotli
+except ImportError:  # brotli là tùy chọn, khi thiếu chỉ tạo bản .gz
+    brotli = None
+
+# Phần mở rộng file văn bản được nén sẵn (ảnh PNG/WebP đã nén sẵn trong định dạng)
+COMPRESSIBLE_SUFFIXES = (".html", ".htm", ".json", ".svg", ".css", ".js", ".csv", ".txt")
+
+# File nhỏ hơn ngưỡng này không đáng nén
+MIN_COMPRESS_SIZE = 1024
+
+# Bản nén theo thứ tự ưu tiên: Content-Encoding -> phần mở rộng
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Thư mục con của mỗi mã được phục vụ qua /stock_analysis/<path> và được nén sẵn
+SERVED_SUBDIRS = ("reports", "charts")
+
+# File không có hash trong tên có thể đổi nội dung dưới cùng URL: luôn kiểm tra lại bằng ETag
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+
+def _accepted_encodings(accept_encoding: Optional[str]) -> List[str]:
+    """Các encoding trong header Accept-Encoding (bỏ các mục q=0)"""
+    accepted = []
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        params = params.replace(" ", "")
+        if name and params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.append(name.lower())
+    return accepted
+
+
+def precompress(path: Union[str, Path], force: bool = False) -> List[Path]:
+    """
+    Tạo bản nén .br (nếu có thư viện brotli) và .gz cạnh một file văn bản
+
+    Bản nén có cùng mtime với file gốc; bản đã có và còn mới được giữ nguyên.
+
+    Args:
+        path: File cần nén
+        force: Nén lại kể cả khi bản nén còn mới
+
+    Returns:
+        Danh sách bản nén đã ghi
+    """
+    path = Path(path)
+    if path.suffix.lower() not in COMPRESSIBLE_SUFFIXES or not path.is_file():
+        return []
+    stat = path.stat()
+    if stat.st_size < MIN_COMPRESS_SIZE:
+        return []
+
+    written = []
+    data = None
+    for encoding, suffix in ENCODINGS:
+        if encoding == "br" and brotli is None:
+            continue
+        target = path.with_name(path.name + suffix)
+        if not force and target.exists() and target.stat().st_mtime_ns == stat.st_mtime_ns:
+            continue
+        if data is None:
+            data = path.read_bytes()
+        compressed = (brotli.compress(data, quality=11) if encoding == "br"
+                      else gzip.compress(data, compresslevel=9, mtime=0))
+        if len(compressed) >= len(data):
+            continue
+
+        tmp_path = target.with_name(target.name + ".tmp")
+        tmp_path.write_bytes(compressed)
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_path, target)
+        written.append(target)
+    return written
+
+
+def precompress_tree(root: Union[str, Path] = STOCK_ANALYSIS_DIR, force: bool = False,
+                     subdirs: Iterable[str] = SERVED_SUBDIRS) -> List[Path]:
+    """
+    Nén sẵn các file văn bản được phục vụ: <root>/<SYMBOL>/<subdir>/ (xem precompress)
+
+    Dữ liệu JSON, file tài chính trong data/, analysis/ và các manifest cache
+    không được phục vụ nên không được nén.
+
+    Args:
+        root: Thư mục gốc stock_analysis/
+        force: Nén lại kể cả khi bản nén còn mới
+        subdirs: Thư mục con của mỗi mã cần nén
+
+    Returns:
+        Danh sách bản nén đã ghi
+    """
+    root = Path(root)
+    written = []
+    if not root.exists():
+        return written
+    for symbol_dir in sorted(item for item in root.iterdir() if item.is_dir()):
+        for subdir in subdirs:
+            for dirpath, _, filenames in os.walk(symbol_dir / subdir):
+                for filename in filenames:
+                    # Manifest cache (.render_cache.json, assets/manifest.json) không được phục vụ
+                    if filename.startswith(".") or filename == ASSETS_MANIFEST:
+                        continue
+                    if filename.lower().endswith(COMPRESSIBLE_SUFFIXES):
+                        written.extend(precompress(Path(dirpath) / filename, force))
+    return written
+
+
+class StaticAsset:
+    """
+    Một file cần gửi cho request: đường dẫn (có thể là bản nén), header cache
+    """
+
+    def __init__(self, path: Path, mimetype: str, etag: str, cache_control: str,
+                 encoding: Optional[str] = None):
+        self.path = path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.cache_control = cache_control
+        self.encoding = encoding
+
+
+class StaticAssets:
+    """
+    Phân giải đường dẫn trong một thư mục gốc thành file cần gửi kèm ETag và Cache-Control
+    """
+
+    def __init__(self, root: Union[str, Path] = STOCK_ANALYSIS_DIR):
+        """
+        Khởi tạo
+
+        Args:
+            root: Thư mục gốc được phục vụ (stock_analysis/)
+        """
+        self.root = Path(root).resolve()
+        # Đường dẫn -> (size, mtime_ns, hash) để không hash lại file không đổi
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def _digest(self, path: Path, stat: os.stat_result) -> str:
+        key = str(path)
+        with self._lock:
+            cached = self._digests.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        value = digest.hexdigest()
+        with self._lock:
+            self._digests[key] = (stat.st_size, stat.st_mtime_ns, value)
+        return value
+
+    def resolve(self, filename: str, accept_encoding: Optional[str] = None) -> Optional[StaticAsset]:
+        """
+        File cần gửi cho một đường dẫn
+
+        Args:
+            filename: Đường dẫn tương đối trong thư mục gốc
+            accept_encoding: Header Accept-Encoding của request
+
+        Returns:
+            StaticAsset, hoặc None nếu file không tồn tại hoặc nằm ngoài thư mục gốc
+        """
+        path = (self.root / filename).resolve()
+        if self.root not in path.parents or not path.is_file():
+            return None
+
+        stat = path.stat()
+        mimetype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        cache_control = IMMUTABLE_CACHE_CONTROL if is_hashed_asset(filename) else REVALIDATE_CACHE_CONTROL
+        etag = self._digest(path, stat)
+
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            variant = path.with_name(path.name + suffix)
+            try:
+                variant_stat = variant.stat()
+            except OSError:
+                continue
+            if variant_stat.st_mtime_ns != stat.st_mtime_ns:
+                continue  # Bản nén cũ hơn file gốc
+            return StaticAsset(variant, mimetype, f"{etag}-{encoding}", cache_control, encoding)
+
+        return StaticAsset(path, mimetype, etag, cache_control)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Static Assets - nén sẵn báo cáo và biểu đồ dạng văn bản")
+    parser.add_argument("--root", default=str(STOCK_ANALYSIS_DIR), help="Thư mục cần nén sẵn")
+    parser.add_argument("--force", action="store_true", help="Nén lại kể cả bản nén còn mới")
+
+    args = parser.parse_args()
+    written = precompress_tree(args.root, args.force)
+    total = sum(path.stat().st_size for path in written)
+    print(f"Precompressed {len(written)} files ({total / 1024:.0f} KB)"
+          f"{'' if brotli is not None else ', brotli not installed: gzip only'}")
+
+
+if __name__ == "__main__":
+    main()
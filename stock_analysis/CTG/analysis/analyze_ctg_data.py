@@ -4,6 +4,10 @@ import sys
 import codecs
 from datetime import datetime
 import numpy as np
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from tick_store import load_intraday_payload
 
 sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer)
 
@@ -17,8 +21,7 @@ def analyze_ctg_data():
         balance_sheet_data = None
     
     try:
-        with open("stock_analysis/CTG/data/CTG_intraday_data.json", "r", encoding="utf-8") as f:
-            intraday_data = json.load(f)
+        intraday_data = load_intraday_payload("CTG")
     except FileNotFoundError:
         intraday_data = None
 
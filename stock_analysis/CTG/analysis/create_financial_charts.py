@@ -11,6 +11,11 @@ import seaborn as sns
 import numpy as np
 from pathlib import Path
 from datetime import datetime
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from chart_engine.output import save_figure
 
 # Set font for better compatibility
 plt.rcParams['font.family'] = ['DejaVu Sans', 'sans-serif']
@@ -101,7 +106,7 @@ def create_profitability_analysis(income_data, ratios_data):
     ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/CTG/charts/financial_analysis/profitability_analysis.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/CTG/charts/financial_analysis/profitability_analysis.png")
     plt.close()
 
 def create_financial_health_dashboard(balance_sheet_data, ratios_data):
@@ -200,7 +205,7 @@ ASSESSMENT:
                 f'{value:.1f}%', ha='center', va='bottom')
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/CTG/charts/financial_analysis/financial_health_dashboard.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/CTG/charts/financial_analysis/financial_health_dashboard.png")
     plt.close()
 
 def create_gauge_chart(ax, value, title, min_val, max_val, labels):
@@ -295,7 +300,7 @@ def create_banking_specific_metrics(balance_sheet_data, income_data):
     ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/CTG/charts/financial_analysis/real_estate_specific_metrics.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/CTG/charts/financial_analysis/real_estate_specific_metrics.png")
     plt.close()
 
 def create_peer_comparison_template(ratios_data):
@@ -372,7 +377,7 @@ def create_peer_comparison_template(ratios_data):
         ax4.text(6-rank + 0.1, i, f'#{rank}', va='center', fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/CTG/charts/financial_analysis/peer_comparison.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/CTG/charts/financial_analysis/peer_comparison.png")
     plt.close()
 
 def create_financial_trends_analysis(income_data, balance_sheet_data, ratios_data):
@@ -436,7 +441,7 @@ def create_financial_trends_analysis(income_data, balance_sheet_data, ratios_dat
     ax4.legend(lines, labels, loc='upper right')
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/CTG/charts/financial_analysis/financial_trends.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/CTG/charts/financial_analysis/financial_trends.png")
     plt.close()
 
 if __name__ == "__main__":
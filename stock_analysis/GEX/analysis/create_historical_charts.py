@@ -1,4 +1,3 @@
-import json
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -6,8 +5,15 @@ import numpy as np
 from pathlib import Path
 from datetime import datetime, timedelta
 import warnings
+import sys
+import os
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from chart_engine.output import save_figure
+from history_store import load_history
+import indicators
+
 # Set Vietnamese font
 plt.rcParams['font.family'] = ['Arial Unicode MS', 'DejaVu Sans', 'sans-serif']
 plt.rcParams['axes.unicode_minus'] = False
@@ -18,26 +24,13 @@ def create_historical_charts():
     # Create directories
     Path("stock_analysis/GEX/charts/historical_analysis").mkdir(parents=True, exist_ok=True)
 
-    # Load historical data
-    try:
-        with open("stock_analysis/GEX/data/GEX_historical_prices.json", "r", encoding="utf-8") as f:
-            historical_data = json.load(f)
-    except FileNotFoundError:
+    # Load daily history (history store, imported from the old JSON files on first use)
+    df = load_history("GEX")
+    if df.empty:
         print("Không tìm thấy dữ liệu lịch sử GEX")
         return
 
-    if not historical_data or 'data' not in historical_data:
-        print("Dữ liệu lịch sử không hợp lệ")
-        return
-
-    # Convert to DataFrame
-    df = pd.DataFrame(historical_data['data'])
-    
-    # Parse datetime column (find 'time' column)
-    if 'time' in df.columns:
-        df['time'] = pd.to_datetime(df['time'])
-        df = df.set_index('time')
-        df = df.sort_index()
+    df = df.set_index('time')
     
     # Standardize column names to match expected format
     column_mapping = {
@@ -117,7 +110,7 @@ def create_price_trend_analysis(df):
     ax4.tick_params(axis='x', rotation=45)
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/GEX/charts/historical_analysis/price_trend_analysis.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/GEX/charts/historical_analysis/price_trend_analysis.png")
     plt.close()
 
 def create_volume_trend_analysis(df):
@@ -179,7 +172,7 @@ def create_volume_trend_analysis(df):
     ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/GEX/charts/historical_analysis/volume_trend_analysis.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/GEX/charts/historical_analysis/volume_trend_analysis.png")
     plt.close()
 
 def create_technical_analysis_historical(df):
@@ -245,7 +238,7 @@ def create_technical_analysis_historical(df):
     ax4.tick_params(axis='x', rotation=45)
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/GEX/charts/historical_analysis/technical_analysis_historical.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/GEX/charts/historical_analysis/technical_analysis_historical.png")
     plt.close()
 
 def create_performance_analysis(df):
@@ -313,7 +306,7 @@ def create_performance_analysis(df):
     ax4.tick_params(axis='x', rotation=45)
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/GEX/charts/historical_analysis/performance_analysis.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/GEX/charts/historical_analysis/performance_analysis.png")
     plt.close()
 
 def create_volatility_analysis(df):
@@ -389,34 +382,25 @@ def create_volatility_analysis(df):
     ax4.tick_params(axis='x', rotation=45)
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/GEX/charts/historical_analysis/volatility_analysis.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/GEX/charts/historical_analysis/volatility_analysis.png")
     plt.close()
 
-# Technical indicator calculation functions
+# Technical indicator calculation functions (dùng thư viện chỉ số chung)
 def calculate_rsi(prices, window=14):
     """Calculate RSI"""
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    return pd.Series(indicators.rsi(prices.to_numpy(), window), index=prices.index)
 
 def calculate_macd(prices, fast=12, slow=26, signal=9):
     """Calculate MACD"""
-    ema_fast = prices.ewm(span=fast).mean()
-    ema_slow = prices.ewm(span=slow).mean()
-    macd = ema_fast - ema_slow
-    signal_line = macd.ewm(span=signal).mean()
-    return macd, signal_line
+    macd, signal_line, _ = indicators.macd(prices.to_numpy(), fast, slow, signal)
+    return pd.Series(macd, index=prices.index), pd.Series(signal_line, index=prices.index)
 
 def calculate_bollinger_bands(prices, window=20, num_std=2):
     """Calculate Bollinger Bands"""
-    rolling_mean = prices.rolling(window=window).mean()
-    rolling_std = prices.rolling(window=window).std()
-    upper_band = rolling_mean + (rolling_std * num_std)
-    lower_band = rolling_mean - (rolling_std * num_std)
-    return upper_band, rolling_mean, lower_band
+    upper_band, rolling_mean, lower_band = indicators.bollinger_bands(prices.to_numpy(), window, num_std)
+    return (pd.Series(upper_band, index=prices.index),
+            pd.Series(rolling_mean, index=prices.index),
+            pd.Series(lower_band, index=prices.index))
 
 if __name__ == "__main__":
     create_historical_charts()
\ No newline at end of file
@@ -11,6 +11,11 @@ import seaborn as sns
 import numpy as np
 from pathlib import Path
 from datetime import datetime
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from chart_engine.output import save_figure
 
 # Set Vietnamese font
 plt.rcParams['font.family'] = ['Arial Unicode MS', 'DejaVu Sans', 'sans-serif']
@@ -119,8 +124,7 @@ def create_financial_health_dashboard(financial_ratios):
         ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('stock_analysis/MBS/charts/financial_analysis/financial_health_dashboard.png', 
-                dpi=300, bbox_inches='tight')
+    save_figure('stock_analysis/MBS/charts/financial_analysis/financial_health_dashboard.png')
     plt.close()
 
 def create_profitability_analysis(financial_ratios, income_statement):
@@ -174,8 +178,7 @@ def create_profitability_analysis(financial_ratios, income_statement):
             ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('stock_analysis/MBS/charts/financial_analysis/profitability_analysis.png', 
-                dpi=300, bbox_inches='tight')
+    save_figure('stock_analysis/MBS/charts/financial_analysis/profitability_analysis.png')
     plt.close()
 
 def create_banking_specific_metrics(financial_ratios):
@@ -234,8 +237,7 @@ def create_banking_specific_metrics(financial_ratios):
         ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('stock_analysis/MBS/charts/financial_analysis/real_estate_specific_metrics.png', 
-                dpi=300, bbox_inches='tight')
+    save_figure('stock_analysis/MBS/charts/financial_analysis/real_estate_specific_metrics.png')
     plt.close()
 
 def create_peer_comparison(financial_ratios):
@@ -328,8 +330,7 @@ def create_peer_comparison(financial_ratios):
     ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('stock_analysis/MBS/charts/financial_analysis/peer_comparison.png', 
-                dpi=300, bbox_inches='tight')
+    save_figure('stock_analysis/MBS/charts/financial_analysis/peer_comparison.png')
     plt.close()
 
 def create_financial_trends(financial_ratios):
@@ -428,8 +429,7 @@ def create_financial_trends(financial_ratios):
         ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('stock_analysis/MBS/charts/financial_analysis/financial_trends.png', 
-                dpi=300, bbox_inches='tight')
+    save_figure('stock_analysis/MBS/charts/financial_analysis/financial_trends.png')
     plt.close()
 
 if __name__ == "__main__":
@@ -11,6 +11,11 @@ import seaborn as sns
 import numpy as np
 from pathlib import Path
 from datetime import datetime
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from chart_engine.output import save_figure
 
 # Set font for better compatibility
 plt.rcParams['font.family'] = ['DejaVu Sans', 'sans-serif']
@@ -90,7 +95,7 @@ def create_profitability_analysis(financial_data):
     ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/VHM/charts/financial_analysis/profitability_analysis.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/VHM/charts/financial_analysis/profitability_analysis.png")
     plt.close()
 
 def create_financial_health_dashboard(financial_data):
@@ -189,7 +194,7 @@ ASSESSMENT:
                 f'{value:.1f}%', ha='center', va='bottom')
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/VHM/charts/financial_analysis/financial_health_dashboard.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/VHM/charts/financial_analysis/financial_health_dashboard.png")
     plt.close()
 
 def create_gauge_chart(ax, value, title, min_val, max_val, labels):
@@ -280,7 +285,7 @@ def create_real_estate_specific_metrics(financial_data):
     ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/VHM/charts/financial_analysis/real_estate_specific_metrics.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/VHM/charts/financial_analysis/real_estate_specific_metrics.png")
     plt.close()
 
 def create_peer_comparison_template(financial_data):
@@ -357,7 +362,7 @@ def create_peer_comparison_template(financial_data):
         ax4.text(6-rank + 0.1, i, f'#{rank}', va='center', fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/VHM/charts/financial_analysis/peer_comparison.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/VHM/charts/financial_analysis/peer_comparison.png")
     plt.close()
 
 def create_financial_trends_analysis(financial_data):
@@ -420,7 +425,7 @@ def create_financial_trends_analysis(financial_data):
     ax4.legend(lines, labels, loc='upper right')
     
     plt.tight_layout()
-    plt.savefig("stock_analysis/VHM/charts/financial_analysis/financial_trends.png", dpi=300, bbox_inches='tight')
+    save_figure("stock_analysis/VHM/charts/financial_analysis/financial_trends.png")
     plt.close()
 
 if __name__ == "__main__":
@@ -8,8 +8,14 @@ import seaborn as sns
 from datetime import datetime
 from pathlib import Path
 import warnings
+import sys
+import os
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from chart_engine.output import save_figure
+from bars import bars_from_ticks
+
 # Thiết lập matplotlib để hiển thị tiếng Việt
 plt.rcParams['font.family'] = ['DejaVu Sans', 'Arial', 'sans-serif']
 plt.rcParams['axes.unicode_minus'] = False
@@ -93,7 +99,7 @@ def create_price_chart(intraday_data, charts_dir):
     ax2.set_xlabel('Thoi gian', fontsize=10)
     
     plt.tight_layout()
-    plt.savefig(charts_dir / 'price_intraday.png', dpi=300, bbox_inches='tight')
+    save_figure(charts_dir / 'price_intraday.png')
     plt.close()
 
 def create_volume_chart(intraday_data, charts_dir):
@@ -155,7 +161,7 @@ def create_volume_chart(intraday_data, charts_dir):
     ax4.set_title('PHAN BO KHOI LUONG THEO GIO', fontsize=14, fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig(charts_dir / 'volume_analysis.png', dpi=300, bbox_inches='tight')
+    save_figure(charts_dir / 'volume_analysis.png')
     plt.close()
 
 def create_buy_sell_chart(intraday_data, charts_dir):
@@ -228,7 +234,7 @@ def create_buy_sell_chart(intraday_data, charts_dir):
     ax4.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig(charts_dir / 'buy_sell_analysis.png', dpi=300, bbox_inches='tight')
+    save_figure(charts_dir / 'buy_sell_analysis.png')
     plt.close()
 
 def create_hourly_liquidity_chart(intraday_data, charts_dir):
@@ -237,15 +243,8 @@ def create_hourly_liquidity_chart(intraday_data, charts_dir):
     df['time'] = pd.to_datetime(df['time'])
     df = df.sort_values('time')
     
-    # Phân tích thanh khoản 15 phút
-    df.set_index('time', inplace=True)
-    df_15min = df.resample('15min').agg({
-        'price': ['first', 'last', 'min', 'max', 'mean'],
-        'volume': 'sum'
-    }).dropna()
-    
-    df_15min.columns = ['open', 'close', 'low', 'high', 'avg_price', 'volume']
-    df_15min['value'] = df_15min['avg_price'] * df_15min['volume']
+    # Phân tích thanh khoản 15 phút (nến OHLCV, value = tổng giá * khối lượng)
+    df_15min = bars_from_ticks(df, '15m')
     
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
     
@@ -277,11 +276,11 @@ def create_hourly_liquidity_chart(intraday_data, charts_dir):
     ax3.grid(True, alpha=0.3)
     
     # 4. Heatmap hoạt động
-    df_reset = df.reset_index()
-    df_reset['hour'] = df_reset['time'].dt.hour
-    df_reset['minute'] = df_reset['time'].dt.minute // 15 * 15
-    
-    activity_matrix = df_reset.groupby(['hour', 'minute'])['volume'].sum().unstack(fill_value=0)
+    activity_matrix = df_15min.pivot_table(
+        index=df_15min['time'].dt.hour.rename('hour'),
+        columns=df_15min['time'].dt.minute.rename('minute'),
+        values='volume', aggfunc='sum', fill_value=0,
+    )
     
     sns.heatmap(activity_matrix, annot=True, fmt='.0f', cmap='YlOrRd', ax=ax4)
     ax4.set_title('HEAT MAP HOAT DONG GIAO DICH', fontsize=14, fontweight='bold')
@@ -289,7 +288,7 @@ def create_hourly_liquidity_chart(intraday_data, charts_dir):
     ax4.set_ylabel('Gio')
     
     plt.tight_layout()
-    plt.savefig(charts_dir / 'liquidity_analysis.png', dpi=300, bbox_inches='tight')
+    save_figure(charts_dir / 'liquidity_analysis.png')
     plt.close()
 
 def create_financial_charts(financial_data, charts_dir):
@@ -363,7 +362,7 @@ def create_financial_charts(financial_data, charts_dir):
         ax4.text(i, v, f'{v:.1f}%', ha='center', va='bottom')
     
     plt.tight_layout()
-    plt.savefig(charts_dir / 'financial_analysis.png', dpi=300, bbox_inches='tight')
+    save_figure(charts_dir / 'financial_analysis.png')
     plt.close()
 
 def create_comparison_charts(financial_data, intraday_data, charts_dir):
@@ -435,7 +434,7 @@ def create_comparison_charts(financial_data, intraday_data, charts_dir):
     ax4.set_title('DANH GIA TONG HOP (0-10)', fontsize=14, fontweight='bold', pad=20)
     
     plt.tight_layout()
-    plt.savefig(charts_dir / 'comparison_analysis.png', dpi=300, bbox_inches='tight')
+    save_figure(charts_dir / 'comparison_analysis.png')
     plt.close()
 
 def create_html_report(charts_dir):
@@ -1,122 +1,26 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-VIC Charts Creator - Updated to use real financial analysis
+VIC Charts Creator
+Biểu đồ được tạo bởi chart_engine (nhóm "key")
 """
 
-import matplotlib.pyplot as plt
-import pandas as pd
-import json
 import os
+import sys
 
-def load_data():
-    """Load VIC data from JSON files."""
-    data = {}
-    
-    # Load intraday data
-    intraday_file = "stock_analysis/VIC/data/VIC_intraday_data.json"
-    if os.path.exists(intraday_file):
-        with open(intraday_file, 'r', encoding='utf-8') as f:
-            data['intraday'] = json.load(f)
-    
-    # Load balance sheet data
-    balance_file = "stock_analysis/VIC/data/VIC_financial_data.json"
-    if os.path.exists(balance_file):
-        with open(balance_file, 'r', encoding='utf-8') as f:
-            financial_data = json.load(f)
-            data['balance_sheet'] = financial_data.get('balance_sheet', {})
-    
-    return data
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from chart_engine import render_charts
 
-def create_vic_charts():
-    """Tạo tất cả biểu đồ cho VIC."""
-    data = load_data()
-    
-    # Tạo thư mục charts nếu chưa có
-    os.makedirs("stock_analysis/VIC/charts/key_charts", exist_ok=True)
-    os.makedirs("stock_analysis/VIC/charts/detailed_charts", exist_ok=True)
-    
-    # Tạo key charts
-    if 'intraday' in data:
-        create_price_chart(data['intraday'])
-        create_volume_chart(data['intraday'])
-        create_buy_sell_chart(data['intraday'])
-    
-    # Tạo financial chart với template mới
-    if 'balance_sheet' in data:
-        create_financial_charts(data['balance_sheet'])
-    
-    print("Charts created for VIC")
-
-def create_price_chart(intraday_data):
-    """Tạo biểu đồ giá trong ngày."""
-    if not intraday_data or 'data' not in intraday_data or not intraday_data['data']:
-        return
-
-    df = pd.DataFrame(intraday_data['data'])
-    df['time'] = pd.to_datetime(df['time'])
-    df = df.sort_values('time')
-
-    plt.figure(figsize=(12, 6))
-    plt.plot(df['time'], df['price'], linewidth=2, color='blue')
-    plt.title('Xu hướng giá trong ngày - VIC')
-    plt.xlabel('Thời gian')
-    plt.ylabel('Giá (VND)')
-    plt.grid(True)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig("stock_analysis/VIC/charts/key_charts/price_trend.png")
-    plt.close()
-
-def create_volume_chart(intraday_data):
-    """Tạo biểu đồ khối lượng theo giờ."""
-    if not intraday_data or 'data' not in intraday_data or not intraday_data['data']:
-        return
-
-    df = pd.DataFrame(intraday_data['data'])
-    df['time'] = pd.to_datetime(df['time'])
-    df['hour'] = df['time'].dt.hour
 
-    volume_by_hour = df.groupby('hour')['volume'].sum()
-
-    plt.figure(figsize=(12, 6))
-    volume_by_hour.plot(kind='bar', title='Khối lượng giao dịch theo giờ - VIC')
-    plt.xlabel('Giờ')
-    plt.ylabel('Khối lượng')
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig("stock_analysis/VIC/charts/key_charts/volume_by_hour.png")
-    plt.close()
-
-def create_buy_sell_chart(intraday_data):
-    """Tạo biểu đồ mua/bán."""
-    if not intraday_data or 'data' not in intraday_data or not intraday_data['data']:
-        return
-
-    df = pd.DataFrame(intraday_data['data'])
-    buy_volume = df[df['match_type'] == 'Buy']['volume'].sum()
-    sell_volume = df[df['match_type'] == 'Sell']['volume'].sum()
-
-    plt.figure(figsize=(8, 8))
-    plt.pie([buy_volume, sell_volume], labels=['Mua', 'Bán'], autopct='%1.1f%%', startangle=90)
-    plt.title('Tỷ lệ khối lượng Mua vs. Bán - VIC')
-    plt.savefig("stock_analysis/VIC/charts/key_charts/buy_vs_sell.png")
-    plt.close()
+def create_vic_charts():
+    """Tạo các biểu đồ chính cho VIC."""
+    result = render_charts("VIC", ["key"])
+    if result["status"] != "success":
+        print(f"VIC: {result['groups'].get('key', {}).get('error', result.get('error'))}")
+    else:
+        print("Charts created for VIC")
+    return result
 
-def create_financial_charts(balance_sheet_data):
-    """Tạo biểu đồ tài chính thực sự cho VIC."""
-    # Import template function
-    import sys
-    import os
-    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'chart_templates'))
-    from financial_chart_template import create_real_financial_chart
-    
-    # Use real financial chart template
-    output_path = "stock_analysis/VIC/charts/detailed_charts/financial_analysis.png"
-    success = create_real_financial_chart(balance_sheet_data, "VIC", output_path)
-    
-    if not success:
-        print("VIC: No financial chart created - insufficient data")
 
 if __name__ == "__main__":
     create_vic_charts()
@@ -1,32 +1,246 @@
 import json
+import sys
+import threading
 import time
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
 from vnstock import Vnstock
 
 # Ignore warnings
 warnings.filterwarnings("ignore")
 
+_http_adapter = None
+_http_adapter_lock = threading.Lock()
+_thread_sessions = threading.local()
+
+
+def _shared_adapter(pool_size: int) -> HTTPAdapter:
+    """HTTPAdapter (connection pool của urllib3, an toàn giữa các thread) dùng chung cho mọi session"""
+    global _http_adapter
+    with _http_adapter_lock:
+        if _http_adapter is None:
+            _http_adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        return _http_adapter
+
+
+def get_http_session(pool_size: int = 20) -> requests.Session:
+    """
+    Lấy HTTP session của thread hiện tại (keep-alive qua connection pool dùng chung)
+
+    requests.Session không an toàn khi dùng từ nhiều thread (cookie, trạng thái
+    redirect), nên mỗi thread có session riêng; các session cùng mount một
+    HTTPAdapter để kết nối TLS vẫn được tái sử dụng giữa các thread.
+
+    Args:
+        pool_size: Số kết nối tối đa giữ lại cho mỗi host
+
+    Returns:
+        requests.Session của thread hiện tại
+    """
+    session = getattr(_thread_sessions, "session", None)
+    if session is None:
+        adapter = _shared_adapter(pool_size)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _thread_sessions.session = session
+    return session
+
+
+class _SessionRequests:
+    """
+    Thay cho module requests bên trong các module của vnstock: get/post/request
+    đi qua session của thread hiện tại, các thuộc tính khác (exceptions, ...) lấy từ requests
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(requests, name)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return get_http_session().request(method, url, **kwargs)
+
+    def get(self, url: str, params: Any = None, **kwargs) -> requests.Response:
+        return get_http_session().get(url, params=params, **kwargs)
+
+    def post(self, url: str, data: Any = None, json: Any = None, **kwargs) -> requests.Response:
+        return get_http_session().post(url, data=data, json=json, **kwargs)
+
+
+_session_requests = _SessionRequests()
+
+
+def install_vnstock_session() -> None:
+    """
+    Cho các module vnstock đã nạp gọi HTTP qua session của từng thread
+    (get_http_session) để tái sử dụng kết nối TLS giữa các request
+
+    Chỉ thay tham chiếu requests trong các module vnstock.*; module requests và
+    các thư viện khác trong tiến trình không bị ảnh hưởng. vnstock nạp module
+    nguồn dữ liệu khi tạo client nên hàm được gọi lại sau mỗi lần tạo client.
+    """
+    for name, module in list(sys.modules.items()):
+        if (name == "vnstock" or name.startswith("vnstock.")) and getattr(module, "requests", None) is requests:
+            module.requests = _session_requests
+
+
+class VnstockClientPool:
+    """
+    Cache các đối tượng Vnstock().stock(...) theo (symbol, source),
+    giới hạn số lượng (LRU) và thời gian sống (TTL)
+    """
+
+    def __init__(self, max_size: int = 64, ttl: float = 900):
+        """
+        Khởi tạo pool
+
+        Args:
+            max_size: Số client tối đa được giữ lại
+            ttl: Thời gian sống của mỗi client (giây)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clients: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._vnstock = None
+
+    def get(self, symbol: str, source: str) -> Any:
+        """
+        Lấy client cho một mã, tạo mới nếu chưa có hoặc đã hết hạn
+
+        Args:
+            symbol: Mã cổ phiếu
+            source: Nguồn dữ liệu (VCI, TCBS, DNSE)
+
+        Returns:
+            Đối tượng stock của vnstock
+        """
+        key = (symbol.upper(), source)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._clients.move_to_end(key)
+                return entry[1]
+
+            if self._vnstock is None:
+                self._vnstock = Vnstock()
+            client = self._vnstock.stock(symbol=key[0], source=source)
+            install_vnstock_session()
+
+            self._clients[key] = (now, client)
+            self._clients.move_to_end(key)
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+            return client
+
+    def invalidate(self, symbol: str, source: str) -> None:
+        """Bỏ client khỏi cache (ví dụ sau khi request bị lỗi)"""
+        with self._lock:
+            self._clients.pop((symbol.upper(), source), None)
+
+    def clear(self) -> None:
+        """Xóa toàn bộ cache"""
+        with self._lock:
+            self._clients.clear()
+
+
+_default_client_pool = VnstockClientPool()
+
+# Giới hạn tốc độ request theo nguồn dữ liệu: (số request/giây, số request tối đa trong một đợt)
+SOURCE_RATE_LIMITS = {
+    "VCI": (5.0, 10),
+    "TCBS": (3.0, 5),
+    "DNSE": (3.0, 5),
+}
+DEFAULT_RATE_LIMIT = (2.0, 4)
+
+
+class TokenBucket:
+    """
+    Bộ giới hạn tốc độ dạng token bucket, an toàn khi dùng từ nhiều thread
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Khởi tạo bucket
+
+        Args:
+            rate: Số token được nạp thêm mỗi giây
+            capacity: Số token tối đa (cho phép một đợt request liên tiếp)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1) -> None:
+        """Chờ cho tới khi đủ token rồi lấy ra"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_rate_limiters: Dict[str, TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(source: str) -> TokenBucket:
+    """
+    Lấy bộ giới hạn tốc độ dùng chung của một nguồn dữ liệu
+
+    Args:
+        source: Nguồn dữ liệu (VCI, TCBS, DNSE)
+
+    Returns:
+        TokenBucket của nguồn dữ liệu
+    """
+    with _rate_limiters_lock:
+        if source not in _rate_limiters:
+            rate, capacity = SOURCE_RATE_LIMITS.get(source, DEFAULT_RATE_LIMIT)
+            _rate_limiters[source] = TokenBucket(rate, capacity)
+        return _rate_limiters[source]
+
+
 class StockDataCollector:
     """
     Công cụ thu thập dữ liệu chứng khoán Việt Nam
     Đơn giản hóa từ StockAnalysisTool để tập trung vào việc lấy dữ liệu
     """
     
-    def __init__(self, data_source: str = "VCI"):
+    def __init__(self, data_source: str = "VCI", client_pool: Optional[VnstockClientPool] = None):
         """
         Khởi tạo collector
         
         Args:
             data_source: Nguồn dữ liệu (VCI, TCBS, DNSE)
+            client_pool: Pool client vnstock (mặc định dùng chung toàn tiến trình)
         """
         self.data_source = data_source
         self.max_retries = 3
+        self.client_pool = client_pool or _default_client_pool
+        self.rate_limiter = get_rate_limiter(data_source)
+    
+    def _get_stock(self, symbol: str) -> Any:
+        """Lấy client vnstock của mã từ pool, chờ token của nguồn dữ liệu trước mỗi request"""
+        self.rate_limiter.acquire()
+        return self.client_pool.get(symbol, self.data_source)
         
     def get_company_overview(self, symbol: str) -> Dict[str, Any]:
         """
@@ -40,7 +254,7 @@ class StockDataCollector:
         """
         for attempt in range(self.max_retries):
             try:
-                stock = Vnstock().stock(symbol=symbol, source=self.data_source)
+                stock = self._get_stock(symbol)
                 df_overview = stock.company.overview()
                 
                 if df_overview is None or df_overview.empty:
@@ -62,11 +276,49 @@ class StockDataCollector:
                 }
                 
             except Exception as e:
+                self.client_pool.invalidate(symbol, self.data_source)
                 if attempt < self.max_retries - 1:
                     time.sleep(2 ** attempt)
                 else:
                     return {"error": f"Lỗi khi lấy dữ liệu tổng quan {symbol}: {str(e)}"}
     
+    def get_stored_historical_prices(self, symbol: str, years: int = 1) -> Dict[str, Any]:
+        """
+        Cập nhật history store (chỉ tải phần còn thiếu) rồi trả về giá lịch sử đã lưu
+
+        Args:
+            symbol: Mã cổ phiếu
+            years: Số năm lịch sử cần có
+
+        Returns:
+            Dict cùng định dạng với get_historical_prices
+        """
+        from history_store import HistoryStore
+
+        store = HistoryStore(collector=self)
+        result = store.update(symbol, years=years)
+        if result["status"] != "success":
+            return {"error": f"Lỗi khi cập nhật giá lịch sử {symbol}: {result['error']}"}
+
+        start = (datetime.now().replace(year=datetime.now().year - years)).strftime('%Y-%m-%d')
+        df = store.load(symbol, start=start)
+        if df.empty:
+            return {"error": f"Không có dữ liệu giá lịch sử cho {symbol}"}
+
+        df = df.rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low',
+                                'close': 'Close', 'volume': 'Volume'})
+        df['time'] = df['time'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        df = df.replace({np.nan: None})
+        return {
+            "symbol": symbol,
+            "data_source": self.data_source,
+            "start_date": df['time'].iloc[0][:10],
+            "end_date": df['time'].iloc[-1][:10],
+            "interval": "1D",
+            "data_points": len(df),
+            "data": df.to_dict('records')
+        }
+
     def get_historical_prices(self, symbol: str, start_date: str, end_date: str, 
                             interval: str = "1D") -> Dict[str, Any]:
         """
@@ -83,7 +335,7 @@ class StockDataCollector:
         """
         for attempt in range(self.max_retries):
             try:
-                stock = Vnstock().stock(symbol=symbol, source=self.data_source)
+                stock = self._get_stock(symbol)
                 df_history = stock.quote.history(
                     start=start_date, 
                     end=end_date, 
@@ -151,6 +403,7 @@ class StockDataCollector:
                 }
                 
             except Exception as e:
+                self.client_pool.invalidate(symbol, self.data_source)
                 if attempt < self.max_retries - 1:
                     time.sleep(2 ** attempt)
                 else:
@@ -169,7 +422,7 @@ class StockDataCollector:
         """
         for attempt in range(self.max_retries):
             try:
-                stock = Vnstock().stock(symbol=symbol, source=self.data_source)
+                stock = self._get_stock(symbol)
                 df_intraday = stock.quote.intraday(page_size=page_size, show_log=False)
                 
                 if df_intraday is None or df_intraday.empty:
@@ -212,11 +465,51 @@ class StockDataCollector:
                 }
                 
             except Exception as e:
+                self.client_pool.invalidate(symbol, self.data_source)
                 if attempt < self.max_retries - 1:
                     time.sleep(2 ** attempt)
                 else:
                     return {"error": f"Lỗi khi lấy dữ liệu intraday {symbol}: {str(e)}"}
-    
+
+    def get_intraday_updates(self, symbol: str, last_time: Optional[str] = None,
+                             page_size: int = 1000, max_page_size: int = 10000) -> Dict[str, Any]:
+        """
+        Lấy các giao dịch mới phát sinh sau tick cuối cùng đã lưu
+
+        Args:
+            symbol: Mã cổ phiếu
+            last_time: Thời gian tick cuối đã lưu (YYYY-MM-DD HH:MM:SS), None để tải đầy đủ
+            page_size: Số bản ghi của trang đầu tiên khi tải tăng dần
+            max_page_size: Số bản ghi tối đa khi cần tải lại đầy đủ
+
+        Returns:
+            Dict chứa dữ liệu intraday (chỉ gồm các tick từ last_time trở đi)
+        """
+        if not last_time:
+            data = self.get_intraday_data(symbol, page_size=max_page_size)
+            if "error" not in data:
+                data["incremental"] = False
+            return data
+
+        data = self.get_intraday_data(symbol, page_size=page_size)
+        if "error" in data:
+            return data
+
+        # Trang đầu chưa chạm tới tick đã lưu -> có thể bị hụt dữ liệu, tải lại đầy đủ
+        if len(data["data"]) >= page_size and data["data"][0]["time"] > last_time:
+            data = self.get_intraday_data(symbol, page_size=max_page_size)
+            if "error" in data:
+                return data
+
+        # Giữ cả các tick cùng giây với last_time, trùng lặp được loại theo id khi lưu
+        new_records = [record for record in data["data"] if record["time"] >= last_time]
+
+        data["fetched_points"] = data["data_points"]
+        data["data"] = new_records
+        data["data_points"] = len(new_records)
+        data["incremental"] = True
+        return data
+
     def get_financial_statements(self, symbol: str, statement_type: str, 
                                period: str = "year", lang: str = "vi") -> Dict[str, Any]:
         """
@@ -233,7 +526,7 @@ class StockDataCollector:
         """
         for attempt in range(self.max_retries):
             try:
-                stock = Vnstock().stock(symbol=symbol, source=self.data_source)
+                stock = self._get_stock(symbol)
                 
                 # Lấy dữ liệu theo loại báo cáo
                 if statement_type == "balance_sheet":
@@ -285,6 +578,7 @@ class StockDataCollector:
                 }
                 
             except Exception as e:
+                self.client_pool.invalidate(symbol, self.data_source)
                 if attempt < self.max_retries - 1:
                     time.sleep(2 ** attempt)
                 else:
@@ -305,7 +599,7 @@ class StockDataCollector:
         """
         for attempt in range(self.max_retries):
             try:
-                stock = Vnstock().stock(symbol=symbol, source=self.data_source)
+                stock = self._get_stock(symbol)
                 df = stock.finance.ratio(period=period, lang=lang, dropna=False)
                 
                 if df is None or df.empty:
@@ -349,18 +643,24 @@ class StockDataCollector:
                 }
                 
             except Exception as e:
+                self.client_pool.invalidate(symbol, self.data_source)
                 if attempt < self.max_retries - 1:
                     time.sleep(2 ** attempt)
                 else:
                     return {"error": f"Lỗi khi lấy chỉ số tài chính {symbol}: {str(e)}"}
     
-    def collect_all_data(self, symbols: List[str], output_dir: str = "data_output") -> Dict[str, Any]:
+    def collect_all_data(self, symbols: List[str], output_dir: str = "data_output",
+                         max_workers: int = 8) -> Dict[str, Any]:
         """
         Thu thập toàn bộ dữ liệu cho danh sách mã cổ phiếu
         
+        Các cặp (mã, loại dữ liệu) được gửi song song qua thread pool,
+        tốc độ request được điều tiết bởi token bucket của nguồn dữ liệu
+        
         Args:
             symbols: Danh sách mã cổ phiếu
             output_dir: Thư mục lưu kết quả
+            max_workers: Số request chạy đồng thời tối đa
             
         Returns:
             Dict chứa tất cả dữ liệu
@@ -368,33 +668,40 @@ class StockDataCollector:
         results = {}
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         
-        for symbol in symbols:
-            print(f"Đang thu thập dữ liệu cho {symbol}...")
-            
-            symbol_data = {
-                "symbol": symbol,
-                "company_overview": self.get_company_overview(symbol),
-                "historical_prices": self.get_historical_prices(
-                    symbol, 
-                    (datetime.now().replace(year=datetime.now().year - 1)).strftime('%Y-%m-%d'),
-                    datetime.now().strftime('%Y-%m-%d')
-                ),
-                "intraday_data": self.get_intraday_data(symbol),
-                "balance_sheet": self.get_financial_statements(symbol, "balance_sheet"),
-                "income_statement": self.get_financial_statements(symbol, "income_statement"),
-                "cash_flow": self.get_financial_statements(symbol, "cash_flow"),
-                "financial_ratios": self.get_financial_ratios(symbol),
-                "collected_at": datetime.now().isoformat()
+        endpoints = {
+            "company_overview": lambda symbol: self.get_company_overview(symbol),
+            "historical_prices": lambda symbol: self.get_stored_historical_prices(symbol),
+            "intraday_data": lambda symbol: self.get_intraday_data(symbol),
+            "balance_sheet": lambda symbol: self.get_financial_statements(symbol, "balance_sheet"),
+            "income_statement": lambda symbol: self.get_financial_statements(symbol, "income_statement"),
+            "cash_flow": lambda symbol: self.get_financial_statements(symbol, "cash_flow"),
+            "financial_ratios": lambda symbol: self.get_financial_ratios(symbol),
+        }
+        
+        print(f"Đang thu thập dữ liệu cho {len(symbols)} mã ({max_workers} luồng)...")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                (symbol, name): executor.submit(fetch, symbol)
+                for symbol in symbols
+                for name, fetch in endpoints.items()
             }
             
-            results[symbol] = symbol_data
-            
-            # Lưu dữ liệu riêng cho từng mã
-            with open(Path(output_dir) / f"{symbol}_data.json", 'w', encoding='utf-8') as f:
-                json.dump(symbol_data, f, ensure_ascii=False, indent=2)
-            
-            # Delay giữa các request
-            time.sleep(1)
+            for symbol in symbols:
+                symbol_data = {"symbol": symbol}
+                for name in endpoints:
+                    try:
+                        symbol_data[name] = futures[(symbol, name)].result()
+                    except Exception as e:
+                        symbol_data[name] = {"error": f"Lỗi khi lấy {name} {symbol}: {str(e)}"}
+                symbol_data["collected_at"] = datetime.now().isoformat()
+                
+                results[symbol] = symbol_data
+                print(f"Đã thu thập dữ liệu cho {symbol}")
+                
+                # Lưu dữ liệu riêng cho từng mã
+                with open(Path(output_dir) / f"{symbol}_data.json", 'w', encoding='utf-8') as f:
+                    json.dump(symbol_data, f, ensure_ascii=False, indent=2)
         
         # Lưu tất cả dữ liệu
         with open(Path(output_dir) / "all_data.json", 'w', encoding='utf-8') as f:
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Tick Archive - Lưu trữ nén các lần ghi tick, khôi phục dữ liệu tại một thời điểm
+
+Mỗi lần tick store ghi một ngày giao dịch, archive lưu lần ghi đó vào một
+segment nén zstd. Segment bổ sung (delta) chỉ chứa các tick chưa có trong các
+segment trước của ngày (trùng id được loại bỏ); các lần nối liên tiếp (poll 15
+giây) được gộp vào delta cuối cùng cho đến khi delta đó mở quá
+DELTA_INTERVAL giây hoặc đủ DELTA_MAX_ROWS tick, nên một ngày chỉ có vài chục
+segment. Khi dữ liệu của ngày bị thay đổi (tải lại toàn bộ phiên với tick khác
+trước) thì segment chứa toàn bộ ngày:
+
+    stock_analysis/<SYMBOL>/data/ticks/archive/<YYYY-MM-DD>/<version>.npz.zst
+
+Dữ liệu của ngày tại thời điểm T được dựng lại từ segment đầy đủ gần nhất trước
+T cộng các segment bổ sung sau nó (độ phân giải khoảng DELTA_INTERVAL giây).
+Archive thay cho các file <SYMBOL>_intraday_backup_<timestamp>.json.
+
+Ngày đã đóng phiên được gộp thành một segment khi rollup cuối ngày
+(TickStore.close_day). Chính sách lưu giữ (prune) cho các ngày còn lại:
+    - Trong SNAPSHOT_DAYS ngày gần nhất: giữ mọi segment (khôi phục theo thời điểm)
+    - Cũ hơn: gộp thành một segment duy nhất (chỉ còn dữ liệu cuối ngày)
+    - Cũ hơn RETENTION_DAYS: xóa (nến ngày vẫn còn trong history store)
+
+Sử dụng:
+    from tick_store import load_ticks
+    df = load_ticks("VIX", as_of="2025-07-25 10:30")   # Tick như đã lưu lúc 10:30
+
+    python tick_archive.py VIX VHM --prune [--snapshot-days 7] [--retention-days 90]
+    python tick_archive.py VIX --list
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import zstandard
+
+from tick_store import DEFAULT_MATCH_TYPES, TICK_COLUMNS, TICK_DTYPES, TickStore
+
+# Mức nén zstd (1-22); các mức cao hơn chậm hơn nhiều mà không nhỏ hơn bao nhiêu
+ZSTD_LEVEL = int(os.environ.get("TICK_ARCHIVE_ZSTD_LEVEL", 9))
+
+# Số ngày gần nhất giữ mọi segment để khôi phục theo thời điểm
+SNAPSHOT_DAYS = int(os.environ.get("TICK_SNAPSHOT_DAYS", 7))
+
+# Số ngày giữ tick trong archive
+RETENTION_DAYS = int(os.environ.get("TICK_RETENTION_DAYS", 90))
+
+# Các lần nối được gộp vào delta cuối cùng trong khoảng thời gian này (giây) kể từ khi delta được mở
+DELTA_INTERVAL = int(os.environ.get("TICK_ARCHIVE_DELTA_SECONDS", 300))
+
+# Số tick tối đa của một delta được gộp
+DELTA_MAX_ROWS = int(os.environ.get("TICK_ARCHIVE_DELTA_ROWS", 5000))
+
+SEGMENT_SUFFIX = ".npz.zst"
+
+
+def _timestamp(value: Union[str, datetime, pd.Timestamp]) -> pd.Timestamp:
+    """Chuẩn hóa thời điểm về pd.Timestamp không có múi giờ"""
+    value = pd.Timestamp(value)
+    return value.tz_localize(None) if value.tz is not None else value
+
+
+class TickArchive:
+    """
+    Các segment tick nén theo ngày giao dịch của từng mã
+    """
+
+    def __init__(self, store: Optional[TickStore] = None):
+        """
+        Khởi tạo archive
+
+        Args:
+            store: Tick store chứa archive (mặc định stock_analysis/)
+        """
+        self.store = store or TickStore()
+        # (mã, ngày) -> (segment cuối, kind, opened_at, số tick): không phải giải nén segment
+        # cuối ở mỗi lần nối
+        self._last_segment: Dict[Tuple[str, str], Tuple[Path, str, str, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Đường dẫn
+    # ------------------------------------------------------------------
+    def archive_dir(self, symbol: str) -> Path:
+        """Thư mục archive của một mã"""
+        return self.store.ticks_dir(symbol) / "archive"
+
+    def day_dir(self, symbol: str, day: str) -> Path:
+        """Thư mục segment của một ngày giao dịch"""
+        return self.archive_dir(symbol) / day
+
+    def list_days(self, symbol: str) -> List[str]:
+        """Các ngày có segment trong archive, tăng dần"""
+        archive_dir = self.archive_dir(symbol)
+        if not archive_dir.exists():
+            return []
+        return sorted(item.name for item in archive_dir.iterdir()
+                      if item.is_dir() and not item.name.startswith("."))
+
+    def segments(self, symbol: str, day: str) -> List[Path]:
+        """Các segment của một ngày theo thứ tự version"""
+        day_dir = self.day_dir(symbol, day)
+        if not day_dir.exists():
+            return []
+        return sorted(day_dir.glob(f"*{SEGMENT_SUFFIX}"))
+
+    # ------------------------------------------------------------------
+    # Đọc/ghi segment
+    # ------------------------------------------------------------------
+    def _write_segment(self, symbol: str, day: str, ticks: pd.DataFrame,
+                       meta: Dict[str, Any], kind: str, saved_at: Optional[str] = None,
+                       opened_at: Optional[str] = None) -> Path:
+        """Nén và ghi một segment (ghi file tạm rồi thay thế)"""
+        match_type = ticks["match_type"].astype(str)
+        categories = list(DEFAULT_MATCH_TYPES)
+        for value in pd.unique(match_type):
+            if value not in categories:
+                categories.append(value)
+
+        saved_at = saved_at or datetime.now().isoformat()
+        segment_meta = dict(meta, segment={
+            "kind": kind,
+            "rows": int(len(ticks)),
+            "saved_at": saved_at,
+            # Thời điểm delta được mở (lần nối đầu tiên được gộp vào)
+            "opened_at": opened_at or saved_at,
+            "categories": categories,
+        })
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            meta=np.array(json.dumps(segment_meta, ensure_ascii=False)),
+            time=ticks["time"].to_numpy().astype(TICK_DTYPES["time"]),
+            price=ticks["price"].to_numpy(dtype=TICK_DTYPES["price"]),
+            volume=ticks["volume"].to_numpy(dtype=TICK_DTYPES["volume"]),
+            match_type=pd.Categorical(match_type, categories=categories).codes.astype("int8"),
+            id=ticks["id"].to_numpy(dtype=TICK_DTYPES["id"]),
+        )
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(buffer.getvalue())
+
+        day_dir = self.day_dir(symbol, day)
+        day_dir.mkdir(parents=True, exist_ok=True)
+        path = day_dir / f"{int(meta.get('version', 0)):06d}{SEGMENT_SUFFIX}"
+        fd, tmp_path = tempfile.mkstemp(dir=day_dir, prefix=f".{path.name}.tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._last_segment[(symbol, day)] = (path, kind, segment_meta["segment"]["opened_at"], len(ticks))
+        return path
+
+    def _read_segment(self, path: Path) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Đọc một segment thành (DataFrame tick, meta)"""
+        with open(path, "rb") as f:
+            raw = zstandard.ZstdDecompressor().decompress(f.read())
+        with np.load(io.BytesIO(raw), allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            columns = {name: data[name] for name in TICK_COLUMNS}
+        df = pd.DataFrame({
+            "time": columns["time"].astype("datetime64[ns]"),
+            "price": columns["price"],
+            "volume": columns["volume"],
+            "match_type": pd.Categorical.from_codes(
+                columns["match_type"], categories=meta["segment"]["categories"]).astype(str),
+            "id": columns["id"],
+        })
+        return df, meta
+
+    def _segment_meta(self, path: Path) -> Dict[str, Any]:
+        return self._read_segment(path)[1]
+
+    def write(self, symbol: str, day: str, ticks: pd.DataFrame, meta: Dict[str, Any],
+              new_ticks: Optional[pd.DataFrame] = None) -> Path:
+        """
+        Ghi segment cho một lần ghi của tick store
+
+        Args:
+            symbol: Mã cổ phiếu
+            day: Ngày giao dịch YYYY-MM-DD
+            ticks: Toàn bộ tick của ngày sau lần ghi
+            meta: meta.json của ngày sau lần ghi
+            new_ticks: Các tick vừa được nối (append); None khi cả ngày được ghi đè
+
+        Returns:
+            Đường dẫn segment đã ghi
+        """
+        symbol = symbol.upper()
+        segments = self.segments(symbol, day)
+        if not segments:
+            return self._write_segment(symbol, day, ticks, meta, "full")
+        if new_ticks is not None:
+            return self._write_delta(symbol, day, new_ticks, meta, segments[-1])
+
+        # Ghi đè cả ngày: chỉ lưu phần mới nếu dữ liệu cũ vẫn còn nguyên
+        previous, _ = self.restore(symbol, day)
+        known = np.isin(ticks["id"].to_numpy(), previous["id"].to_numpy())
+        if int(known.sum()) == len(previous) and previous["id"].is_unique:
+            # Segment có thể rỗng: vẫn ghi để archive theo kịp version của ngày
+            return self._write_delta(symbol, day, ticks[~known], meta, segments[-1])
+        return self._write_segment(symbol, day, ticks, meta, "full")
+
+    def _write_delta(self, symbol: str, day: str, ticks: pd.DataFrame, meta: Dict[str, Any],
+                     last: Path) -> Path:
+        """Ghi các tick mới: gộp vào delta cuối cùng nếu delta đó còn mở, nếu không thì mở delta mới"""
+        cached = self._last_segment.get((symbol, day))
+        if cached is None or cached[0] != last:
+            info = self._segment_meta(last)["segment"]
+            cached = (last, info["kind"], info.get("opened_at", info["saved_at"]), info["rows"])
+            self._last_segment[(symbol, day)] = cached
+        _, kind, opened_at, rows = cached
+
+        age = (datetime.now() - _timestamp(opened_at)).total_seconds()
+        if kind != "delta" or age >= DELTA_INTERVAL or rows + len(ticks) > DELTA_MAX_ROWS:
+            return self._write_segment(symbol, day, ticks, meta, "delta")
+
+        previous, _ = self._read_segment(last)
+        path = self._write_segment(symbol, day, pd.concat([previous, ticks], ignore_index=True),
+                                   meta, "delta", opened_at=opened_at)
+        if path != last:
+            last.unlink(missing_ok=True)
+        return path
+
+    def restore(self, symbol: str, day: str,
+                as_of: Optional[Union[str, datetime]] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Dựng lại tick của một ngày như đã lưu tại thời điểm as_of
+
+        Args:
+            symbol: Mã cổ phiếu
+            day: Ngày giao dịch YYYY-MM-DD
+            as_of: Thời điểm cần khôi phục (mặc định lần ghi cuối cùng)
+
+        Returns:
+            (DataFrame tick sắp xếp theo thời gian, meta của lần ghi tương ứng)
+
+        Raises:
+            FileNotFoundError: nếu archive không có dữ liệu của ngày tại thời điểm đó
+        """
+        symbol = symbol.upper()
+        limit = _timestamp(as_of) if as_of is not None else None
+
+        parts = []
+        meta = None
+        for path in reversed(self.segments(symbol, day)):
+            df, segment_meta = self._read_segment(path)
+            if limit is not None and _timestamp(segment_meta["segment"]["saved_at"]) > limit:
+                continue
+            meta = meta or segment_meta
+            parts.append(df)
+            if segment_meta["segment"]["kind"] == "full":
+                break
+
+        if meta is None:
+            when = f" lúc {as_of}" if as_of is not None else ""
+            raise FileNotFoundError(f"Không có dữ liệu tick cho {symbol} ngày {day}{when}")
+
+        df = pd.concat(reversed(parts), ignore_index=True)
+        # Tick không có id (-1) không được coi là trùng nhau
+        duplicated = df["id"].duplicated(keep="last") & (df["id"] >= 0)
+        df = df[~duplicated].sort_values("time", kind="stable")
+        meta.pop("segment", None)
+        return df.reset_index(drop=True), meta
+
+    def load_meta(self, symbol: str, day: str) -> Dict[str, Any]:
+        """meta.json của lần ghi cuối cùng trong archive, rỗng nếu không có"""
+        segments = self.segments(symbol, day)
+        if not segments:
+            return {}
+        meta = self._segment_meta(segments[-1])
+        meta.pop("segment", None)
+        return meta
+
+    # ------------------------------------------------------------------
+    # Lưu giữ
+    # ------------------------------------------------------------------
+    def consolidate(self, symbol: str, day: str) -> int:
+        """
+        Gộp mọi segment của một ngày thành một segment đầy đủ
+
+        Returns:
+            Số segment đã xóa
+        """
+        segments = self.segments(symbol, day)
+        if len(segments) <= 1:
+            return 0
+        last_meta = self._segment_meta(segments[-1])
+        df, meta = self.restore(symbol, day)
+        path = self._write_segment(symbol, day, df, meta, "full", last_meta["segment"]["saved_at"])
+        removed = 0
+        for segment in segments:
+            if segment != path:
+                segment.unlink()
+                removed += 1
+        return removed
+
+    def prune(self, symbol: str, snapshot_days: int = SNAPSHOT_DAYS,
+              retention_days: int = RETENTION_DAYS, today: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Áp dụng chính sách lưu giữ cho archive của một mã
+
+        Args:
+            symbol: Mã cổ phiếu
+            snapshot_days: Ngày cũ hơn số ngày này được gộp thành một segment
+            retention_days: Ngày cũ hơn số ngày này bị xóa khỏi archive
+            today: Ngày hiện tại YYYY-MM-DD (mặc định hôm nay)
+
+        Returns:
+            Dict gồm symbol, consolidated (số segment đã gộp), removed_days, freed_bytes
+        """
+        symbol = symbol.upper()
+        today = pd.Timestamp(today or datetime.now().strftime("%Y-%m-%d"))
+        snapshot_limit = (today - timedelta(days=snapshot_days)).strftime("%Y-%m-%d")
+        retention_limit = (today - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+
+        result = {"symbol": symbol, "consolidated": 0, "removed_days": [], "freed_bytes": 0}
+        for day in self.list_days(symbol):
+            day_dir = self.day_dir(symbol, day)
+            before = sum(path.stat().st_size for path in day_dir.iterdir())
+            if day < retention_limit:
+                shutil.rmtree(day_dir, ignore_errors=True)
+                result["removed_days"].append(day)
+                result["freed_bytes"] += before
+            elif day < snapshot_limit:
+                result["consolidated"] += self.consolidate(symbol, day)
+                result["freed_bytes"] += before - sum(path.stat().st_size for path in day_dir.iterdir())
+        return result
+
+    def stats(self, symbol: str) -> Dict[str, Dict[str, Any]]:
+        """Số segment và dung lượng archive theo ngày"""
+        result = {}
+        for day in self.list_days(symbol):
+            segments = self.segments(symbol, day)
+            result[day] = {
+                "segments": len(segments),
+                "bytes": sum(path.stat().st_size for path in segments),
+            }
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick Archive - lưu trữ nén dữ liệu tick")
+    parser.add_argument("symbols", nargs="*", help="Mã cổ phiếu (mặc định tất cả)")
+    parser.add_argument("--prune", action="store_true", help="Áp dụng chính sách lưu giữ")
+    parser.add_argument("--snapshot-days", type=int, default=SNAPSHOT_DAYS,
+                        help="Số ngày giữ mọi segment để khôi phục theo thời điểm")
+    parser.add_argument("--retention-days", type=int, default=RETENTION_DAYS,
+                        help="Số ngày giữ tick trong archive")
+    parser.add_argument("--list", action="store_true", help="Liệt kê segment theo ngày")
+
+    args = parser.parse_args()
+    archive = TickArchive()
+    symbols = [s.upper() for s in args.symbols] or sorted(
+        item.name for item in archive.store.base_dir.iterdir()
+        if item.is_dir() and archive.list_days(item.name)
+    )
+
+    if args.prune:
+        for symbol in symbols:
+            result = archive.prune(symbol, args.snapshot_days, args.retention_days)
+            print(f"Pruned {symbol}: {result['consolidated']} segments consolidated, "
+                  f"{len(result['removed_days'])} days removed ({result['freed_bytes'] / 1024:.0f} KB freed)")
+    elif args.list:
+        for symbol in symbols:
+            for day, info in archive.stats(symbol).items():
+                print(f"{symbol} {day}: {info['segments']} segments, {info['bytes'] / 1024:.0f} KB")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,698 @@
+#!/usr/bin/env python3
+"""
+Tick Store - Lưu trữ dữ liệu intraday dạng cột theo mã và ngày giao dịch
+
+Mỗi ngày giao dịch của một mã được lưu thành một thư mục gồm các file NumPy .npy
+có kiểu dữ liệu cố định (time, price, volume, match_type, id) cùng một file meta.json:
+
+    stock_analysis/<SYMBOL>/data/ticks/<YYYY-MM-DD>/time.npy
+                                                  /price.npy
+                                                  /volume.npy
+                                                  /match_type.npy
+                                                  /id.npy
+                                                  /meta.json
+
+Mỗi lần ghi cũng được lưu thành một segment nén trong ticks/archive/ (xem
+tick_archive.py). Các ngày đã được gộp vào giá lịch sử (eod_rollup.py) chỉ còn
+trong archive; load_ticks/load_meta vẫn đọc được các ngày này, và load_ticks
+khôi phục được dữ liệu như đã lưu tại một thời điểm (as_of).
+
+Sử dụng:
+    from tick_store import load_ticks
+    df = load_ticks("VIX")                 # Ngày giao dịch gần nhất
+    df = load_ticks("VIX", "2025-07-25")   # Một ngày cụ thể
+    df = load_ticks("VIX", as_of="2025-07-25 10:30")   # Như đã lưu lúc 10:30
+
+Migration một lần từ các file <SYMBOL>_intraday_data.json cũ:
+    python tick_store.py --migrate [SYMBOL1] [SYMBOL2] ... [--remove-json]
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).parent
+STOCK_ANALYSIS_DIR = BASE_DIR / "stock_analysis"
+
+TICK_COLUMNS = ("time", "price", "volume", "match_type", "id")
+TICK_DTYPES = {
+    "time": "datetime64[s]",
+    "price": "float64",
+    "volume": "int64",
+    "match_type": "int8",
+    "id": "int64",
+}
+DEFAULT_MATCH_TYPES = ["Buy", "Sell"]
+TIMEZONE = "Asia/Ho_Chi_Minh"
+
+# Khóa đọc-gộp-ghi của từng thư mục ngày: pipeline, /api/update và scheduler
+# cập nhật cùng một mã trên các thread của cùng tiến trình
+_day_locks: Dict[str, threading.Lock] = {}
+_day_locks_guard = threading.Lock()
+
+
+# Khóa nhận diện tick không có id (lần tải sau lấy lại cả các tick cùng giây với con trỏ)
+NO_ID_KEY = ["time", "price", "volume", "match_type"]
+
+
+def _known_without_id(ticks: pd.DataFrame, existing: pd.DataFrame) -> np.ndarray:
+    """
+    Đánh dấu các tick không có id đã được lưu (cùng time, price, volume, match_type)
+
+    Tick giống hệt nhau được đếm theo số lần xuất hiện: nếu đã lưu hai tick và
+    lần tải mới có ba, tick thứ ba vẫn được coi là mới.
+
+    Args:
+        ticks: Các tick mới tải
+        existing: Các tick đã lưu của ngày
+
+    Returns:
+        Mảng bool theo dòng của ticks
+    """
+    no_id = (ticks["id"] < 0).to_numpy()
+    stored = existing[existing["id"] < 0]
+    if not no_id.any() or stored.empty:
+        return np.zeros(len(ticks), dtype=bool)
+
+    def occurrences(df: pd.DataFrame) -> pd.MultiIndex:
+        keys = df[NO_ID_KEY].assign(time=df["time"].astype("datetime64[ns]"),
+                                    match_type=df["match_type"].astype(str))
+        return pd.MultiIndex.from_frame(keys.assign(n=keys.groupby(NO_ID_KEY, dropna=False).cumcount()))
+
+    known = np.zeros(len(ticks), dtype=bool)
+    known[no_id] = occurrences(ticks[no_id]).isin(occurrences(stored))
+    return known
+
+
+class TickStore:
+    """
+    Kho dữ liệu tick dạng cột cho từng mã cổ phiếu và từng ngày giao dịch
+    """
+
+    def __init__(self, base_dir: Union[str, Path] = STOCK_ANALYSIS_DIR):
+        """
+        Khởi tạo tick store
+
+        Args:
+            base_dir: Thư mục gốc chứa dữ liệu các mã (mặc định stock_analysis/)
+        """
+        self.base_dir = Path(base_dir)
+        self._archive = None
+
+    @property
+    def archive(self):
+        """Archive nén các lần ghi (tick_archive.TickArchive)"""
+        if self._archive is None:
+            from tick_archive import TickArchive
+            self._archive = TickArchive(self)
+        return self._archive
+
+    # ------------------------------------------------------------------
+    # Đường dẫn
+    # ------------------------------------------------------------------
+    def ticks_dir(self, symbol: str) -> Path:
+        """Thư mục chứa các ngày giao dịch của một mã"""
+        symbol = symbol.upper()
+        return self.base_dir / symbol / "data" / "ticks"
+
+    def day_dir(self, symbol: str, day: str) -> Path:
+        """Thư mục chứa các cột của một ngày giao dịch"""
+        return self.ticks_dir(symbol) / day
+
+    def _day_lock(self, symbol: str, day: str) -> threading.Lock:
+        """Khóa của một ngày giao dịch (dùng chung giữa các TickStore cùng thư mục)"""
+        key = str(self.day_dir(symbol, day).resolve())
+        with _day_locks_guard:
+            return _day_locks.setdefault(key, threading.Lock())
+
+    def legacy_json_path(self, symbol: str) -> Path:
+        """Đường dẫn file <SYMBOL>_intraday_data.json cũ"""
+        symbol = symbol.upper()
+        return self.base_dir / symbol / "data" / f"{symbol}_intraday_data.json"
+
+    def list_days(self, symbol: str) -> List[str]:
+        """
+        Liệt kê các ngày giao dịch đã lưu của một mã
+
+        Args:
+            symbol: Mã cổ phiếu
+
+        Returns:
+            Danh sách ngày (YYYY-MM-DD) theo thứ tự tăng dần
+        """
+        ticks_dir = self.ticks_dir(symbol)
+        if not ticks_dir.exists():
+            return []
+        return sorted(
+            item.name for item in ticks_dir.iterdir()
+            # Bỏ qua thư mục tạm (.<ngày>.tmp-*) của lần ghi đang diễn ra
+            if item.is_dir() and not item.name.startswith(".") and (item / "meta.json").exists()
+        )
+
+    def list_archived_days(self, symbol: str) -> List[str]:
+        """Liệt kê các ngày giao dịch chỉ còn trong archive (không còn thư mục cột)"""
+        live = set(self.list_days(symbol))
+        return [day for day in self.archive.list_days(symbol) if day not in live]
+
+    def latest_day(self, symbol: str) -> Optional[str]:
+        """Ngày giao dịch gần nhất đã lưu, None nếu chưa có"""
+        days = self.list_days(symbol)
+        return days[-1] if days else None
+
+    def has_ticks(self, symbol: str) -> bool:
+        """Kiểm tra mã đã có dữ liệu (trong store hoặc file JSON cũ) chưa"""
+        return bool(self.list_days(symbol)) or self.legacy_json_path(symbol).exists()
+
+    # ------------------------------------------------------------------
+    # Ghi dữ liệu
+    # ------------------------------------------------------------------
+    def save_ticks(self, symbol: str, ticks: Union[pd.DataFrame, List[Dict[str, Any]]],
+                   meta: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Lưu dữ liệu tick, mỗi ngày giao dịch được ghi đè bằng một bộ cột mới
+
+        Args:
+            symbol: Mã cổ phiếu
+            ticks: DataFrame hoặc danh sách dict có các cột time, price, volume, match_type, id
+            meta: Thông tin bổ sung (data_source, timestamp, ...)
+
+        Returns:
+            Danh sách ngày giao dịch đã ghi
+        """
+        symbol = symbol.upper()
+        df = self._normalize(ticks)
+        if df.empty:
+            return []
+
+        days = []
+        day_keys = df["time"].dt.strftime("%Y-%m-%d")
+        for day, df_day in df.groupby(day_keys, sort=True):
+            df_day = df_day.reset_index(drop=True)
+            with self._day_lock(symbol, day):
+                day_meta = self._write_day(symbol, day, df_day, meta or {})
+                self._archive_write(symbol, day, df_day, day_meta)
+            days.append(day)
+        return days
+
+    def save_intraday_payload(self, symbol: str, payload: Dict[str, Any]) -> List[str]:
+        """
+        Lưu kết quả của StockDataCollector.get_intraday_data vào store
+
+        Args:
+            symbol: Mã cổ phiếu
+            payload: Dict trả về từ collector (có key 'data')
+
+        Returns:
+            Danh sách ngày giao dịch đã ghi
+        """
+        meta = {
+            "data_source": payload.get("data_source"),
+            "timestamp": payload.get("timestamp", datetime.now().isoformat()),
+        }
+        return self.save_ticks(symbol, payload.get("data") or [], meta)
+
+    def append_ticks(self, symbol: str, ticks: Union[pd.DataFrame, List[Dict[str, Any]]],
+                     meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Nối thêm các tick mới vào store, bỏ qua các tick đã có (trùng id, hoặc trùng
+        time/price/volume/match_type với tick đã lưu khi không có id)
+
+        Args:
+            symbol: Mã cổ phiếu
+            ticks: DataFrame hoặc danh sách dict có các cột time, price, volume, match_type, id
+            meta: Thông tin bổ sung (data_source, timestamp, ...)
+
+        Returns:
+            Dict gồm days (các ngày đã ghi), appended (số tick mới) và ticks
+            (DataFrame các tick mới, sắp xếp theo thời gian)
+        """
+        symbol = symbol.upper()
+        df = self._normalize(ticks)
+        if df.empty:
+            return {"days": [], "appended": 0, "ticks": df}
+
+        days = []
+        appended = 0
+        new_ticks = []
+        day_keys = df["time"].dt.strftime("%Y-%m-%d")
+        for day, df_day in df.groupby(day_keys, sort=True):
+            with self._day_lock(symbol, day):
+                df_day = self._append_day(symbol, day, df_day, meta or {})
+            if df_day is None:
+                continue
+            days.append(day)
+            appended += len(df_day)
+            new_ticks.append(df_day)
+
+        new_ticks = (pd.concat(new_ticks, ignore_index=True).sort_values("time", kind="stable")
+                     if new_ticks else df.iloc[0:0])
+        return {"days": days, "appended": appended, "ticks": new_ticks.reset_index(drop=True)}
+
+    def _append_day(self, symbol: str, day: str, df_day: pd.DataFrame,
+                    meta: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """Gộp các tick của một ngày với dữ liệu đã lưu và ghi lại (gọi khi giữ khóa của ngày),
+        trả về các tick mới hoặc None nếu không có tick mới"""
+        # Trong cùng lần tải, tick không có id (-1) không được coi là trùng nhau (như TickArchive.restore)
+        has_id = df_day["id"] >= 0
+        df_day = df_day[~(df_day["id"].duplicated(keep="last") & has_id)]
+        if self.load_meta(symbol, day):
+            existing = self.load_ticks(symbol, day)
+            existing["match_type"] = existing["match_type"].astype(str)
+            existing_ids = existing["id"].to_numpy()
+            seen = np.isin(df_day["id"].to_numpy(), existing_ids[existing_ids >= 0])
+            seen |= _known_without_id(df_day, existing)
+            df_day = df_day[~seen]
+            if df_day.empty:
+                return None
+            merged = pd.concat([existing, df_day], ignore_index=True)
+            merged = merged.sort_values("time", kind="stable").reset_index(drop=True)
+        else:
+            merged = df_day.reset_index(drop=True)
+
+        day_meta = self._write_day(symbol, day, merged, meta)
+        self._archive_write(symbol, day, merged, day_meta, new_ticks=df_day)
+        return df_day
+
+    def append_intraday_payload(self, symbol: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Nối kết quả của StockDataCollector.get_intraday_updates vào store
+
+        Args:
+            symbol: Mã cổ phiếu
+            payload: Dict trả về từ collector (có key 'data')
+
+        Returns:
+            Dict như append_ticks (days, appended, ticks)
+        """
+        meta = {
+            "data_source": payload.get("data_source"),
+            "timestamp": payload.get("timestamp", datetime.now().isoformat()),
+        }
+        return self.append_ticks(symbol, payload.get("data") or [], meta)
+
+    def _normalize(self, ticks: Union[pd.DataFrame, List[Dict[str, Any]]]) -> pd.DataFrame:
+        """Chuẩn hóa dữ liệu đầu vào về các cột và kiểu dữ liệu của store"""
+        df = ticks.copy() if isinstance(ticks, pd.DataFrame) else pd.DataFrame(ticks)
+        if df.empty:
+            return pd.DataFrame(columns=list(TICK_COLUMNS))
+
+        times = pd.to_datetime(df["time"])
+        if times.dt.tz is not None:
+            times = times.dt.tz_convert(TIMEZONE).dt.tz_localize(None)
+
+        out = pd.DataFrame({
+            "time": times,
+            "price": pd.to_numeric(df["price"], errors="coerce").astype("float64"),
+            "volume": pd.to_numeric(df["volume"], errors="coerce").fillna(0).astype("int64"),
+            "match_type": df["match_type"].fillna("").astype(str) if "match_type" in df.columns else "",
+            "id": (pd.to_numeric(df["id"], errors="coerce").fillna(-1).astype("int64")
+                   if "id" in df.columns else np.int64(-1)),
+        })
+        return out.sort_values("time", kind="stable").reset_index(drop=True)
+
+    def _archive_write(self, symbol: str, day: str, df: pd.DataFrame, meta: Dict[str, Any],
+                       new_ticks: Optional[pd.DataFrame] = None) -> None:
+        """Lưu lần ghi vào archive; lỗi archive không làm hỏng lần ghi chính"""
+        try:
+            self.archive.write(symbol, day, df, meta, new_ticks=new_ticks)
+        except Exception as e:
+            print(f"Warning: could not archive ticks for {symbol} {day}: {e}")
+
+    def _write_day(self, symbol: str, day: str, df: pd.DataFrame, meta: Dict[str, Any]) -> Dict[str, Any]:
+        """Ghi một ngày giao dịch vào thư mục tạm rồi thay thế nguyên khối, trả về meta mới"""
+        target = self.day_dir(symbol, day)
+        # Ngày chỉ còn trong archive vẫn tiếp tục version cũ
+        previous = self.load_meta(symbol, day)
+
+        categories = list(DEFAULT_MATCH_TYPES)
+        for value in pd.unique(df["match_type"]):
+            if value not in categories:
+                categories.append(value)
+        codes = pd.Categorical(df["match_type"], categories=categories).codes.astype("int8")
+
+        columns = {
+            "time": df["time"].to_numpy().astype(TICK_DTYPES["time"]),
+            "price": df["price"].to_numpy(dtype=TICK_DTYPES["price"]),
+            "volume": df["volume"].to_numpy(dtype=TICK_DTYPES["volume"]),
+            "match_type": codes,
+            "id": df["id"].to_numpy(dtype=TICK_DTYPES["id"]),
+        }
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{day}.tmp-", dir=target.parent))
+
+        try:
+            for name in TICK_COLUMNS:
+                np.save(tmp_dir / f"{name}.npy", columns[name], allow_pickle=False)
+
+            day_meta = {
+                "symbol": symbol,
+                "day": day,
+                "data_source": meta.get("data_source") or previous.get("data_source"),
+                "timestamp": meta.get("timestamp") or datetime.now().isoformat(),
+                "data_points": int(len(df)),
+                "version": int(previous.get("version", 0)) + 1,
+                "dtypes": TICK_DTYPES,
+                "match_type_categories": categories,
+                "first_time": df["time"].iloc[0].strftime("%Y-%m-%d %H:%M:%S"),
+                "last_time": df["time"].iloc[-1].strftime("%Y-%m-%d %H:%M:%S"),
+                "last_id": int(df["id"].max()),
+            }
+            with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+                json.dump(day_meta, f, ensure_ascii=False, indent=2)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        # Thư mục cũ được chuyển vào một thư mục tạm riêng rồi mới xóa
+        old_parent = Path(tempfile.mkdtemp(prefix=f".{day}.old-", dir=target.parent))
+        if target.exists():
+            target.rename(old_parent / day)
+        tmp_dir.rename(target)
+        shutil.rmtree(old_parent, ignore_errors=True)
+        return day_meta
+
+    # ------------------------------------------------------------------
+    # Đọc dữ liệu
+    # ------------------------------------------------------------------
+    def load_meta(self, symbol: str, day: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Đọc meta.json của một ngày giao dịch
+
+        Args:
+            symbol: Mã cổ phiếu
+            day: Ngày giao dịch (mặc định ngày gần nhất)
+
+        Returns:
+            Dict meta, rỗng nếu không có dữ liệu
+        """
+        day = day or self.latest_day(symbol)
+        if not day:
+            return {}
+        meta_file = self.day_dir(symbol, day) / "meta.json"
+        if not meta_file.exists():
+            return self.archive.load_meta(symbol, day)
+        with open(meta_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def get_cursor(self, symbol: str) -> Dict[str, Any]:
+        """
+        Vị trí tick cuối cùng đã lưu, dùng cho việc tải dữ liệu tăng dần
+
+        Args:
+            symbol: Mã cổ phiếu
+
+        Returns:
+            Dict gồm day, last_time, last_id; rỗng nếu store chưa có dữ liệu
+        """
+        meta = self.load_meta(symbol)
+        if not meta:
+            return {}
+        return {
+            "day": meta.get("day"),
+            "last_time": meta.get("last_time"),
+            "last_id": meta.get("last_id"),
+        }
+
+    def load_ticks(self, symbol: str, day: Optional[str] = None,
+                   as_of: Optional[Union[str, datetime]] = None) -> pd.DataFrame:
+        """
+        Đọc dữ liệu tick của một ngày giao dịch
+
+        Args:
+            symbol: Mã cổ phiếu
+            day: Ngày giao dịch YYYY-MM-DD (mặc định ngày gần nhất, hoặc ngày của as_of)
+            as_of: Khôi phục dữ liệu như đã lưu tại thời điểm này (từ archive)
+
+        Returns:
+            DataFrame với các cột time, price, volume, match_type, id
+            (sắp xếp theo thời gian tăng dần)
+
+        Raises:
+            FileNotFoundError: nếu mã/ngày chưa có dữ liệu
+        """
+        symbol = symbol.upper()
+        if as_of is not None:
+            day = day or pd.Timestamp(as_of).strftime("%Y-%m-%d")
+            return self._load_archived(symbol, day, as_of)
+        day = day or self.latest_day(symbol)
+        if day is None:
+            # Chưa migrate: đọc trực tiếp từ file JSON cũ
+            legacy = self.legacy_json_path(symbol)
+            if not legacy.exists():
+                raise FileNotFoundError(f"Không có dữ liệu tick cho {symbol}")
+            with open(legacy, "r", encoding="utf-8") as f:
+                return self._normalize(json.load(f).get("data") or [])
+
+        day_dir = self.day_dir(symbol, day)
+        if not (day_dir / "meta.json").exists():
+            return self._load_archived(symbol, day)
+
+        meta = self.load_meta(symbol, day)
+        columns = {name: np.load(day_dir / f"{name}.npy", allow_pickle=False)
+                   for name in TICK_COLUMNS}
+        categories = meta.get("match_type_categories", DEFAULT_MATCH_TYPES)
+
+        return pd.DataFrame({
+            "time": columns["time"].astype("datetime64[ns]"),
+            "price": columns["price"],
+            "volume": columns["volume"],
+            "match_type": pd.Categorical.from_codes(columns["match_type"], categories=categories),
+            "id": columns["id"],
+        })
+
+    def _load_archived(self, symbol: str, day: str,
+                       as_of: Optional[Union[str, datetime]] = None) -> pd.DataFrame:
+        """Đọc một ngày từ archive, cùng định dạng với dữ liệu dạng cột"""
+        df, meta = self.archive.restore(symbol, day, as_of)
+        categories = list(meta.get("match_type_categories", DEFAULT_MATCH_TYPES))
+        categories += [value for value in pd.unique(df["match_type"]) if value not in categories]
+        df["match_type"] = pd.Categorical(df["match_type"], categories=categories)
+        return df
+
+    def load_intraday_payload(self, symbol: str, day: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Đọc dữ liệu theo định dạng cũ của <SYMBOL>_intraday_data.json
+        (dành cho các script còn làm việc với list các dict)
+
+        Args:
+            symbol: Mã cổ phiếu
+            day: Ngày giao dịch (mặc định ngày gần nhất)
+
+        Returns:
+            Dict gồm symbol, data_source, data_points, data, timestamp
+
+        Raises:
+            FileNotFoundError: nếu mã chưa có dữ liệu
+        """
+        symbol = symbol.upper()
+        day = day or self.latest_day(symbol)
+        if day is None:
+            legacy = self.legacy_json_path(symbol)
+            if not legacy.exists():
+                raise FileNotFoundError(f"Không có dữ liệu tick cho {symbol}")
+            with open(legacy, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        meta = self.load_meta(symbol, day)
+        df = self.load_ticks(symbol, day)
+        records = pd.DataFrame({
+            "time": df["time"].dt.strftime("%Y-%m-%d %H:%M:%S"),
+            "price": df["price"],
+            "volume": df["volume"],
+            "match_type": df["match_type"].astype(str),
+            "id": df["id"].astype(str),
+        }).to_dict(orient="records")
+
+        return {
+            "symbol": symbol,
+            "data_source": meta.get("data_source"),
+            "data_points": len(records),
+            "data": records,
+            "timestamp": meta.get("timestamp"),
+        }
+
+    # ------------------------------------------------------------------
+    # Lưu trữ các ngày đã đóng phiên
+    # ------------------------------------------------------------------
+    def archive_day(self, symbol: str, day: str) -> Dict[str, Any]:
+        """
+        Chỉ giữ một ngày trong archive: đảm bảo archive có đủ dữ liệu rồi xóa thư mục cột
+
+        Args:
+            symbol: Mã cổ phiếu
+            day: Ngày giao dịch YYYY-MM-DD
+
+        Returns:
+            Dict gồm day, store_bytes (thư mục cột đã xóa), archive_bytes hoặc {"error": ...}
+        """
+        symbol = symbol.upper()
+        with self._day_lock(symbol, day):
+            return self._archive_day(symbol, day)
+
+    def close_day(self, symbol: str, day: str) -> int:
+        """
+        Gộp các segment archive của một ngày đã đóng phiên thành một segment
+
+        Args:
+            symbol: Mã cổ phiếu
+            day: Ngày giao dịch YYYY-MM-DD
+
+        Returns:
+            Số segment đã xóa
+        """
+        symbol = symbol.upper()
+        with self._day_lock(symbol, day):
+            return self.archive.consolidate(symbol, day)
+
+    def _archive_day(self, symbol: str, day: str) -> Dict[str, Any]:
+        """archive_day khi đã giữ khóa của ngày"""
+        day_dir = self.day_dir(symbol, day)
+        if not (day_dir / "meta.json").exists():
+            return {"error": f"Không có dữ liệu tick cho {symbol} ngày {day}"}
+
+        meta = self.load_meta(symbol, day)
+        archive_meta = self.archive.load_meta(symbol, day)
+        if archive_meta.get("version") != meta.get("version"):
+            # Archive chưa có lần ghi cuối (vd. dữ liệu có trước khi có archive)
+            df = self.load_ticks(symbol, day)
+            self.archive.write(symbol, day, df, meta)
+        if self.archive.load_meta(symbol, day).get("version") != meta.get("version"):
+            return {"error": f"Không lưu được {symbol} ngày {day} vào archive"}
+
+        store_bytes = sum(item.stat().st_size for item in day_dir.iterdir())
+        shutil.rmtree(day_dir, ignore_errors=True)
+        archive_bytes = sum(path.stat().st_size for path in self.archive.segments(symbol, day))
+        return {"day": day, "store_bytes": store_bytes, "archive_bytes": archive_bytes}
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+    def migrate_json(self, symbol: str, remove_json: bool = False) -> Dict[str, Any]:
+        """
+        Chuyển file <SYMBOL>_intraday_data.json sang store dạng cột
+
+        Args:
+            symbol: Mã cổ phiếu
+            remove_json: Xóa file JSON sau khi chuyển thành công
+
+        Returns:
+            Dict thống kê (days, data_points, json_bytes, store_bytes) hoặc {"error": ...}
+        """
+        symbol = symbol.upper()
+        legacy = self.legacy_json_path(symbol)
+        if not legacy.exists():
+            return {"error": f"Không tìm thấy {legacy}"}
+
+        try:
+            with open(legacy, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            if self.list_days(symbol):
+                # Store đã có dữ liệu mới hơn: chỉ nối các tick còn thiếu
+                days = self.append_intraday_payload(symbol, payload)["days"]
+            else:
+                days = self.save_intraday_payload(symbol, payload)
+        except Exception as e:
+            return {"error": f"Lỗi khi migrate {symbol}: {str(e)}"}
+
+        json_bytes = legacy.stat().st_size
+        store_bytes = sum(
+            path.stat().st_size
+            for day in days for path in self.day_dir(symbol, day).iterdir()
+        )
+        if remove_json:
+            legacy.unlink()
+
+        return {
+            "symbol": symbol,
+            "days": days,
+            "data_points": len(payload.get("data") or []),
+            "json_bytes": json_bytes,
+            "store_bytes": store_bytes,
+        }
+
+    def find_legacy_symbols(self) -> List[str]:
+        """Tìm tất cả mã còn file <SYMBOL>_intraday_data.json"""
+        if not self.base_dir.exists():
+            return []
+        return sorted(
+            item.name for item in self.base_dir.iterdir()
+            if item.is_dir() and (item / "data" / f"{item.name}_intraday_data.json").exists()
+        )
+
+
+_default_store = TickStore()
+
+
+def load_ticks(symbol: str, day: Optional[str] = None) -> pd.DataFrame:
+    """Đọc dữ liệu tick của một mã từ store mặc định (xem TickStore.load_ticks)"""
+    return _default_store.load_ticks(symbol, day)
+
+
+def load_intraday_payload(symbol: str, day: Optional[str] = None) -> Dict[str, Any]:
+    """Đọc dữ liệu intraday theo định dạng JSON cũ từ store mặc định"""
+    return _default_store.load_intraday_payload(symbol, day)
+
+
+def save_intraday_payload(symbol: str, payload: Dict[str, Any]) -> List[str]:
+    """Lưu kết quả get_intraday_data vào store mặc định"""
+    return _default_store.save_intraday_payload(symbol, payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick Store - lưu trữ intraday dạng cột")
+    parser.add_argument("symbols", nargs="*", help="Mã cổ phiếu (mặc định tất cả)")
+    parser.add_argument("--migrate", action="store_true", help="Chuyển các file JSON cũ sang store")
+    parser.add_argument("--remove-json", action="store_true", help="Xóa file JSON sau khi migrate")
+    parser.add_argument("--list", action="store_true", help="Liệt kê các ngày đã lưu")
+
+    args = parser.parse_args()
+    store = TickStore()
+
+    if args.migrate:
+        symbols = [s.upper() for s in args.symbols] or store.find_legacy_symbols()
+        if not symbols:
+            print("No legacy intraday JSON files found")
+            return
+
+        total_json = total_store = 0
+        for symbol in symbols:
+            result = store.migrate_json(symbol, remove_json=args.remove_json)
+            if "error" in result:
+                print(f"Error: {result['error']}")
+                continue
+            total_json += result["json_bytes"]
+            total_store += result["store_bytes"]
+            print(f"Migrated {symbol}: {result['data_points']} ticks, "
+                  f"{result['json_bytes'] / 1024:.0f} KB -> {result['store_bytes'] / 1024:.0f} KB "
+                  f"({', '.join(result['days'])})")
+
+        if total_store:
+            print(f"\nTotal: {total_json / 1024:.0f} KB -> {total_store / 1024:.0f} KB "
+                  f"({total_json / total_store:.1f}x smaller)")
+    elif args.list:
+        symbols = [s.upper() for s in args.symbols] or sorted(
+            item.name for item in store.base_dir.iterdir() if item.is_dir()
+        )
+        for symbol in symbols:
+            days = store.list_days(symbol)
+            archived = store.list_archived_days(symbol)
+            if days or archived:
+                print(f"{symbol}: {', '.join(days)}"
+                      + (f" (archived: {', '.join(archived)})" if archived else ""))
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
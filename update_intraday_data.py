@@ -1,8 +1,9 @@
-import json
 import time
 from datetime import datetime
 from pathlib import Path
 from stock_data_collector import StockDataCollector
+from tick_store import TickStore
+from chart_engine import render_charts
 
 def update_intraday_data(symbols):
     """
@@ -12,6 +13,7 @@ def update_intraday_data(symbols):
         symbols: Danh sách mã cổ phiếu cần cập nhật
     """
     collector = StockDataCollector()
+    store = TickStore()
     
     print(f"Starting intraday data update at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Symbols to update: {', '.join(symbols)}")
@@ -26,32 +28,20 @@ def update_intraday_data(symbols):
                 print(f"Directory {data_dir} does not exist, skipping {symbol}")
                 continue
             
-            # Lấy dữ liệu intraday mới
+            # Lấy các giao dịch mới sau tick cuối đã lưu
             print(f"Fetching intraday data for {symbol}...")
-            intraday_data = collector.get_intraday_data(symbol)
+            cursor = store.get_cursor(symbol)
+            intraday_data = collector.get_intraday_updates(symbol, last_time=cursor.get('last_time'))
             
             if "error" in intraday_data:
                 print(f"ERROR: {intraday_data['error']}")
                 continue
             
-            # Lưu dữ liệu
-            file_path = data_dir / f"{symbol}_intraday_data.json"
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(intraday_data, f, ensure_ascii=False, indent=4)
+            # Nối dữ liệu vào tick store
+            result = store.append_intraday_payload(symbol, intraday_data)
             
-            print(f"Updated: {file_path}")
-            print(f"Data points: {intraday_data.get('data_points', 'N/A')}")
-            
-            # Tạo backup file cũ với timestamp
-            backup_path = data_dir / f"{symbol}_intraday_data_backup_{int(time.time())}.json"
-            if file_path.exists():
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        backup_data = json.load(f)
-                    with open(backup_path, 'w', encoding='utf-8') as f:
-                        json.dump(backup_data, f, ensure_ascii=False, indent=4)
-                except:
-                    pass  # Ignore backup errors
+            print(f"Updated: {store.ticks_dir(symbol)} ({', '.join(result['days']) or 'no new ticks'})")
+            print(f"New data points: {result['appended']}")
             
             # Delay giữa các request
             time.sleep(1)
@@ -74,20 +64,13 @@ def update_and_regenerate_charts(symbols):
     
     # Tạo lại biểu đồ cho từng mã
     for symbol in symbols:
-        try:
-            chart_script = f"stock_analysis/{symbol}/analysis/create_{symbol.lower()}_charts.py"
-            if Path(chart_script).exists():
-                print(f"\nRegenerating charts for {symbol}...")
-                import subprocess
-                result = subprocess.run(['python', chart_script], capture_output=True, text=True)
-                if result.returncode == 0:
-                    print(f"Charts updated successfully for {symbol}")
-                else:
-                    print(f"Error updating charts for {symbol}: {result.stderr}")
-            else:
-                print(f"Chart script not found for {symbol}: {chart_script}")
-        except Exception as e:
-            print(f"Error regenerating charts for {symbol}: {str(e)}")
+        print(f"\nRegenerating charts for {symbol}...")
+        result = render_charts(symbol, ["key"])
+        if result["status"] == "success":
+            print(f"Charts updated successfully for {symbol}")
+        else:
+            errors = [group.get("error") for group in result["groups"].values() if group["status"] == "error"]
+            print(f"Error updating charts for {symbol}: {'; '.join(errors) or result.get('error')}")
 
 def main():
     """
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Update Pipeline - Cập nhật dữ liệu intraday ngay trong tiến trình gọi
+
+Thay cho việc chạy `python quick_update.py SYMBOL` qua subprocess: các mã được
+cập nhật bằng một thread pool, dùng chung collector (pool client vnstock, HTTP
+session, rate limiter) và trả về kết quả dạng dict thay vì stdout.
+
+Sử dụng:
+    from update_pipeline import update
+    results = update(["VIX", "VHM"], mode="quick")
+
+    python update_pipeline.py VIX VHM [--mode full] [--workers 3]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from bars import BarStore
+from stock_data_collector import StockDataCollector
+from tick_store import TickStore
+
+# quick: chỉ tải các tick mới sau tick cuối đã lưu
+# full: tải lại toàn bộ phiên và ghi đè dữ liệu của ngày
+UPDATE_MODES = ("quick", "full")
+
+_default_collector = None
+
+
+def _get_collector() -> StockDataCollector:
+    """Collector dùng chung cho các lần cập nhật trong cùng tiến trình"""
+    global _default_collector
+    if _default_collector is None:
+        _default_collector = StockDataCollector()
+    return _default_collector
+
+
+def _tick_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Chuyển DataFrame tick mới thành danh sách dict có thể serialize JSON"""
+    return [
+        {
+            "time": t.strftime("%Y-%m-%d %H:%M:%S"),
+            "price": float(price),
+            "volume": int(volume),
+            "match_type": str(match_type),
+            "id": int(tick_id),
+        }
+        for t, price, volume, match_type, tick_id in zip(
+            df["time"], df["price"], df["volume"], df["match_type"], df["id"]
+        )
+    ]
+
+
+def _update_bars(symbol: str, store: TickStore, new_ticks: Optional[pd.DataFrame] = None,
+                 days: Iterable[str] = ()) -> None:
+    """Cập nhật nến OHLCV theo các tick mới (quick) hoặc tính lại các ngày đã ghi đè (full)"""
+    bar_store = BarStore(store.base_dir, store)
+    try:
+        if new_ticks is not None:
+            bar_store.update(symbol, new_ticks)
+        for day in days:
+            bar_store.build(symbol, day)
+    except Exception as e:
+        # Nến sẽ được tính lại khi đọc nếu lần cập nhật này lỗi
+        print(f"Warning: could not update bars for {symbol}: {e}")
+
+
+def update_symbol(symbol: str, mode: str = "quick",
+                  collector: Optional[StockDataCollector] = None,
+                  store: Optional[TickStore] = None,
+                  on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Cập nhật dữ liệu intraday cho một mã
+
+    Args:
+        symbol: Mã cổ phiếu
+        mode: Chế độ cập nhật (quick, full)
+        collector: Collector dùng để tải dữ liệu (mặc định dùng chung)
+        store: Tick store để lưu dữ liệu (mặc định stock_analysis/)
+        on_result: Hàm được gọi với kết quả ngay khi mã cập nhật xong
+
+    Returns:
+        Dict gồm symbol, mode, status ('success' hoặc 'error'), appended,
+        days, new_ticks (các tick mới ở chế độ quick, None ở chế độ full),
+        duration, timestamp và error nếu có lỗi
+    """
+    symbol = symbol.upper()
+    collector = collector or _get_collector()
+    store = store or TickStore()
+    start_time = time.time()
+
+    result = {
+        "symbol": symbol,
+        "mode": mode,
+        "status": "error",
+        "appended": 0,
+        "days": [],
+        "new_ticks": None,
+    }
+
+    try:
+        if mode not in UPDATE_MODES:
+            raise ValueError(f"Invalid mode: {mode}")
+
+        if not (store.base_dir / symbol / "data").exists():
+            raise FileNotFoundError(f"Directory not found: {store.base_dir / symbol / 'data'}")
+
+        if mode == "quick":
+            cursor = store.get_cursor(symbol)
+            data = collector.get_intraday_updates(symbol, last_time=cursor.get("last_time"))
+        else:
+            data = collector.get_intraday_data(symbol)
+
+        if "error" in data:
+            result["error"] = data["error"]
+        elif mode == "quick":
+            saved = store.append_intraday_payload(symbol, data)
+            result.update(status="success", appended=saved["appended"], days=saved["days"],
+                          new_ticks=_tick_records(saved["ticks"]))
+            _update_bars(symbol, store, new_ticks=saved["ticks"])
+        else:
+            days = store.save_intraday_payload(symbol, data)
+            result.update(status="success", appended=data.get("data_points", 0), days=days)
+            _update_bars(symbol, store, days=days)
+
+    except Exception as e:
+        result["error"] = str(e)
+
+    result["duration"] = time.time() - start_time
+    result["timestamp"] = datetime.now().isoformat()
+
+    if on_result is not None:
+        try:
+            on_result(result)
+        except Exception as e:
+            print(f"Warning: on_result callback failed for {symbol}: {e}")
+
+    return result
+
+
+def update(symbols: Iterable[str], mode: str = "quick", max_workers: int = 3,
+           collector: Optional[StockDataCollector] = None,
+           store: Optional[TickStore] = None,
+           on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    """
+    Cập nhật dữ liệu intraday cho nhiều mã bằng thread pool
+
+    Args:
+        symbols: Danh sách mã cổ phiếu
+        mode: Chế độ cập nhật (quick, full)
+        max_workers: Số mã được cập nhật đồng thời
+        collector: Collector dùng để tải dữ liệu (mặc định dùng chung)
+        store: Tick store để lưu dữ liệu (mặc định stock_analysis/)
+        on_result: Hàm được gọi với kết quả của từng mã ngay khi mã đó xong,
+            không chờ các mã còn lại
+
+    Returns:
+        Danh sách kết quả của update_symbol theo thứ tự các mã
+    """
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    if not symbols:
+        return []
+
+    collector = collector or _get_collector()
+    store = store or TickStore()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as executor:
+        return list(executor.map(
+            lambda symbol: update_symbol(symbol, mode, collector, store, on_result), symbols
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update Pipeline - cập nhật dữ liệu intraday")
+    parser.add_argument("symbols", nargs="+", help="Mã cổ phiếu cần cập nhật")
+    parser.add_argument("--mode", choices=UPDATE_MODES, default="quick", help="Chế độ cập nhật")
+    parser.add_argument("--workers", type=int, default=3, help="Số mã cập nhật đồng thời")
+
+    args = parser.parse_args()
+    results = update(args.symbols, mode=args.mode, max_workers=args.workers)
+
+    for result in results:
+        if result["status"] == "success":
+            print(f"Success {result['symbol']}: +{result['appended']} data points ({result['duration']:.1f}s)")
+        else:
+            print(f"Error {result['symbol']}: {result.get('error')}")
+
+
+if __name__ == "__main__":
+    main()